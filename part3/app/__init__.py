@@ -4,10 +4,13 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 from config import config
+from app.persistence.engine import engine_options, install_sqlite_pragmas
+from app.utils.hashing import PasswordHasher, PasswordHashingUnavailable
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
+password_hasher = PasswordHasher(bcrypt)
 
 def create_app(config_name='development'):
     """
@@ -31,10 +34,39 @@ def create_app(config_name='development'):
 
     # Initialize extensions
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config.get('SQLALCHEMY_DATABASE_URI'), app.config.get('SQLALCHEMY_ENGINE_OPTIONS'))
     db.init_app(app)
+    # Tune every new SQLite connection (WAL, synchronous, cache, ...)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
+    
+    # Optionally defer all repository commits to the end of each request
+    if app.config.get('UNIT_OF_WORK_PER_REQUEST'):
+        from app.persistence import unit_of_work
+
+        @app.before_request
+        def begin_unit_of_work():
+            unit_of_work.begin()
+
+        @app.after_request
+        def commit_unit_of_work(response):
+            unit_of_work.end(commit=response.status_code < 400)
+            return response
+
+        @app.teardown_request
+        def rollback_unit_of_work(error):
+            # Only reached with an open unit of work if the request raised
+            if unit_of_work.in_unit_of_work():
+                unit_of_work.end(commit=False)
     
     # JWT configuration and handlers
+    from app.services import facade as shared_facade
+    shared_facade.user_cache.configure(maxsize=app.config.get('JWT_USER_CACHE_SIZE', 1024),
+                                       ttl=app.config.get('JWT_USER_CACHE_TTL', 300))
+
     @jwt.user_identity_loader
     def user_identity_lookup(user):
         """Register a callback to return the identity of a user from a given user object"""
@@ -46,7 +78,7 @@ def create_app(config_name='development'):
         from app.services import facade
         identity = jwt_data["sub"]
         try:
-            return facade.get_user(identity)
+            return facade.get_user_cached(identity)
         except:
             return None
     
@@ -73,6 +105,11 @@ def create_app(config_name='development'):
               description='A simple AirBnB clone API',
               doc='/api/docs')
 
+    @api.errorhandler(PasswordHashingUnavailable)
+    def password_hashing_unavailable(error):
+        """Report a saturated or timed out hashing pool as a temporary failure"""
+        return {'message': str(error)}, 503
+
     # Register namespaces
     from app.api.v1.users import api as users_ns
     from app.api.v1.places import api as places_ns
@@ -1,8 +1,10 @@
 """Admin-only endpoints for user and system management"""
 
 from flask_restx import Namespace, Resource, fields
-from flask import request
+from flask import current_app, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app import db, password_hasher
+from app.persistence.engine import engine_settings
 from app.services import facade
 from app.utils.admin import admin_required
 
@@ -66,6 +68,45 @@ class AdminUserManagement(Resource):
         except ValueError as e:
             api.abort(400, str(e))
 
+user_search_result = api.inherit('UserSearchResult', user_response, {
+    'score': fields.Float(description='Relevance: 1 + similarity for substring matches, similarity otherwise')
+})
+
+user_search_page = api.model('UserSearchPage', {
+    'users': fields.List(fields.Nested(user_search_result)),
+    'total': fields.Integer(description='Number of matching users'),
+    'page': fields.Integer(description='Page number'),
+    'per_page': fields.Integer(description='Results per page')
+})
+
+@api.route('/users/search')
+class AdminUserSearch(Resource):
+    @api.doc('admin_search_users', params={
+        'q': 'Part of a first or last name (at least 3 characters, typos tolerated)',
+        'page': 'Page number (default 1)',
+        'per_page': 'Results per page (default 20, at most 100)'
+    })
+    @api.marshal_with(user_search_page)
+    @api.response(400, 'Invalid search parameters')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Search users by name, substring matches first (admin only)"""
+        try:
+            page = request.args.get('page', 1, type=int)
+            per_page = request.args.get('per_page', 20, type=int)
+            matches, total = facade.search_users_by_name(request.args.get('q', ''), page, per_page)
+            users = []
+            for user, score in matches:
+                user_dict = user.to_dict()
+                user_dict['score'] = round(score, 4)
+                users.append(user_dict)
+            return {'users': users, 'total': total, 'page': page, 'per_page': per_page}
+        except ValueError as e:
+            api.abort(400, str(e))
+
 @api.route('/users/<string:user_id>')
 @api.param('user_id', 'The user identifier')
 @api.response(404, 'User not found')
@@ -87,7 +128,7 @@ class AdminUserDetail(Resource):
             
             # Handle password update separately if provided
             if 'password' in data and data['password']:
-                user.set_password(data['password'])
+                user = facade.update_user_password(user_id, data['password'])
                 # Remove password from update_data to avoid double processing
                 update_data = {k: v for k, v in data.items() if k != 'password' and v is not None}
             else:
@@ -116,9 +157,226 @@ class AdminUserDetail(Resource):
             if user_id == current_user_id:
                 api.abort(400, 'Cannot delete your own account')
             
-            # Note: This would require implementing delete_user in facade
-            # For now, we'll return a placeholder response
-            api.abort(501, 'User deletion not yet implemented')
+            # Deletes the user's places and reviews and updates rating aggregates
+            facade.delete_user(user_id)
+            return '', 204
             
         except ValueError:
-            api.abort(404, f"User {user_id} not found")
\ No newline at end of file
+            api.abort(404, f"User {user_id} not found")
+
+@api.route('/metrics/password-hashing')
+class AdminPasswordHashingMetrics(Resource):
+    @api.doc('admin_password_hashing_metrics')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Get queue length and latency metrics of the password hashing pool (admin only)"""
+        return password_hasher.metrics()
+
+@api.route('/metrics/user-cache')
+class AdminUserCacheMetrics(Resource):
+    @api.doc('admin_user_cache_metrics')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Get hit/miss counters of the JWT user lookup cache (admin only)"""
+        return facade.user_cache.stats()
+
+price_stats = api.model('PriceStats', {
+    'count': fields.Integer(description='Places with a price'),
+    'sum': fields.Float(description='Sum of prices'),
+    'mean': fields.Float(description='Average price'),
+    'min': fields.Float(description='Lowest price'),
+    'max': fields.Float(description='Highest price'),
+    'quantiles': fields.Raw(description='Price per requested quantile, keyed p50, p90, ...')
+})
+
+rating_stats = api.model('RatingStats', {
+    'count': fields.Integer(description='Number of reviews'),
+    'average': fields.Float(description='Average rating'),
+    'histogram': fields.Raw(description='Number of reviews per star rating')
+})
+
+stats_overview = api.model('StatsOverview', {
+    'places': fields.Integer(description='Number of places'),
+    'cities': fields.Integer(description='Number of cities with places'),
+    'capacity': fields.Raw(description='Total guests, rooms and bathrooms'),
+    'price': fields.Nested(price_stats),
+    'ratings': fields.Nested(rating_stats),
+    'engine': fields.String(description="'numpy' when vectorized, 'python' otherwise")
+})
+
+city_stats = api.model('CityStats', {
+    'city_id': fields.String(description='City identifier'),
+    'places': fields.Integer(description='Number of places'),
+    'average_price': fields.Float(description='Average price per night'),
+    'total_guests': fields.Integer(description='Sum of max_guests'),
+    'total_rooms': fields.Integer(description='Sum of number_of_rooms'),
+    'review_count': fields.Integer(description='Reviews of the city\'s places'),
+    'average_rating': fields.Float(description='Average rating of those reviews')
+})
+
+@api.route('/stats')
+class AdminStats(Resource):
+    @api.doc('admin_stats')
+    @api.marshal_with(stats_overview)
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Place, capacity, price and rating statistics (admin only)"""
+        return facade.get_stats_overview()
+
+@api.route('/stats/prices')
+class AdminPriceStats(Resource):
+    @api.doc('admin_price_stats', params={
+        'quantiles': 'Comma-separated quantiles between 0 and 1 (default 0.5,0.9,0.99)',
+        'city_id': 'Restrict to one city'
+    })
+    @api.marshal_with(price_stats)
+    @api.response(400, 'Invalid quantiles')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Summary and quantiles of price_per_night (admin only)"""
+        try:
+            raw = request.args.get('quantiles', '0.5,0.9,0.99')
+            quantiles = [float(q) for q in raw.split(',') if q.strip()]
+            return facade.get_price_stats(quantiles, request.args.get('city_id'))
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/stats/cities')
+class AdminCityStats(Resource):
+    @api.doc('admin_city_stats', params={
+        'sort': 'places, average_price, total_guests, review_count or average_rating (default places)',
+        'limit': 'Number of cities (default 100)'
+    })
+    @api.marshal_list_with(city_stats)
+    @api.response(400, 'Invalid sort or limit')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Per-city counts, prices, capacity and ratings (admin only)"""
+        try:
+            return facade.get_city_stats(request.args.get('sort', 'places'),
+                                         request.args.get('limit', 100, type=int))
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/stats/ratings')
+class AdminRatingStats(Resource):
+    @api.doc('admin_rating_stats')
+    @api.marshal_with(rating_stats)
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Review count, average and star histogram (admin only)"""
+        return facade.get_rating_stats()
+
+price_sketch = api.model('PriceSketch', {
+    'city_id': fields.String(description='City identifier'),
+    'count': fields.Integer(description='Prices recorded'),
+    'quantiles': fields.Raw(description='Approximate p50, p90 and p99 prices')
+})
+
+price_sketch_report = api.model('PriceSketchReport', {
+    'overall': fields.Nested(price_sketch),
+    'cities': fields.List(fields.Nested(price_sketch))
+})
+
+reviewer_count = api.model('ReviewerCount', {
+    'host_id': fields.String(description='Host user ID'),
+    'distinct_reviewers': fields.Integer(description='Approximate number of distinct reviewers')
+})
+
+@api.route('/sketches/prices')
+class AdminPriceSketch(Resource):
+    @api.doc('admin_price_sketch', params={
+        'city_id': 'Restrict to one city',
+        'limit': 'Number of cities, most places first (default 100)'
+    })
+    @api.marshal_with(price_sketch_report)
+    @api.response(400, 'Invalid limit')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Approximate price quantiles from t-digests, without reading the tables (admin only)"""
+        try:
+            return facade.get_price_sketch(request.args.get('city_id'),
+                                           request.args.get('limit', 100, type=int))
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/sketches/reviewers')
+class AdminReviewerSketch(Resource):
+    @api.doc('admin_reviewer_sketch', params={
+        'host_id': 'Restrict to one host',
+        'limit': 'Number of hosts, most reviewers first (default 100)'
+    })
+    @api.marshal_list_with(reviewer_count)
+    @api.response(400, 'Invalid limit')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Approximate distinct reviewers per host from HyperLogLogs (admin only)"""
+        try:
+            return facade.get_reviewer_counts(request.args.get('host_id'),
+                                              request.args.get('limit', 100, type=int))
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/sketches/rebuild')
+class AdminSketchRebuild(Resource):
+    @api.doc('admin_rebuild_sketches')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def post(self):
+        """Rebuild the sketches from the tables (admin only)"""
+        return {'rows': facade.rebuild_sketches()}
+
+@api.route('/sketches/save')
+class AdminSketchSave(Resource):
+    @api.doc('admin_save_sketches')
+    @api.response(400, 'SKETCH_FILE is not configured')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def post(self):
+        """Write the sketches to SKETCH_FILE (admin only)"""
+        try:
+            return {'bytes': facade.save_sketches()}
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/engine')
+class AdminEngineSettings(Resource):
+    @api.doc('admin_engine_settings')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Administrator privileges required')
+    @jwt_required()
+    @admin_required
+    def get(self):
+        """Effective pool settings and SQLite PRAGMAs of the database engine (admin only)"""
+        settings = engine_settings(db.engine, current_app.config.get('SQLITE_PRAGMAS'))
+        settings['engine_options'] = current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+        settings['repository'] = type(facade.repo).__name__
+        return settings
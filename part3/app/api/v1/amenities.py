@@ -1,8 +1,10 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from flask import request
 from flask_jwt_extended import jwt_required
 from app.services import facade
 from app.utils.admin import admin_required
+from app.utils.pagination import page_headers, parse_page_args
+from app.utils.streaming import stream_format, streamed_response
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -23,13 +25,37 @@ amenity_response = api.model('AmenityResponse', {
     'updated_at': fields.DateTime(description='Update timestamp')
 })
 
+amenity_autocomplete_model = api.model('AmenityAutocomplete', {
+    'id': fields.String(description='Amenity ID'),
+    'name': fields.String(description='Amenity name'),
+    'place_count': fields.Integer(description='Number of places with the amenity, used for ranking')
+})
+
+def _amenities_to_dicts(amenities):
+    """Serialize a list of amenities"""
+    return [amenity.to_dict() for amenity in amenities]
+
 @api.route('/')
 class AmenityList(Resource):
-    @api.doc('list_amenities')
-    @api.marshal_list_with(amenity_response)
+    @api.doc('list_amenities', params={
+        'limit': 'Page size (default 100, at most 1000)',
+        'cursor': 'Cursor from the previous page\'s Link rel="next" header',
+        'stream': 'Set to true to stream every row as a chunked JSON array (Accept: application/x-ndjson streams NDJSON)'
+    })
+    @api.response(200, 'Success', [amenity_response])
+    @api.response(400, 'Invalid limit or cursor')
     def get(self):
-        """List all amenities"""
-        return [amenity.to_dict() for amenity in facade.get_all_amenities()]
+        """List amenities oldest first, one page at a time (X-Total-Count and Link headers) or streamed"""
+        mimetype = stream_format()
+        if mimetype:
+            return streamed_response(facade.iter_amenities(), _amenities_to_dicts,
+                                     amenity_response, mimetype)
+        try:
+            amenities, more, total = facade.get_amenities_page(*parse_page_args(request.args))
+        except ValueError as e:
+            api.abort(400, str(e))
+        return (marshal(_amenities_to_dicts(amenities), amenity_response), 200,
+                page_headers(amenities, more, total))
 
     @api.doc('create_amenity')
     @api.expect(amenity_create_model)
@@ -53,6 +79,22 @@ class AmenityList(Resource):
         except ValueError as e:
             api.abort(400, str(e))
 
+@api.route('/autocomplete')
+class AmenityAutocomplete(Resource):
+    @api.doc('autocomplete_amenities', params={
+        'prefix': 'Start of any word in the amenity name',
+        'limit': 'Maximum number of suggestions (1-50, default 10)'
+    })
+    @api.marshal_list_with(amenity_autocomplete_model)
+    @api.response(400, 'Invalid prefix or limit')
+    def get(self):
+        """Suggest amenities whose name starts with a prefix, most used first"""
+        try:
+            return facade.autocomplete_amenities(request.args.get('prefix', ''),
+                                                 request.args.get('limit', 10, type=int))
+        except ValueError as e:
+            api.abort(400, str(e))
+
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
 @api.response(404, 'Amenity not found')
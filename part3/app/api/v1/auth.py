@@ -2,6 +2,7 @@ from flask_restx import Namespace, Resource, fields
 from flask import request
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.utils.hashing import PasswordHashingUnavailable
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -35,21 +36,11 @@ class UserLogin(Resource):
             if not email or not password:
                 api.abort(400, 'Email and password are required')
             
-            # Get user by email
-            users = facade.get_all_users()
-            user = None
-            for u in users:
-                if u.email == email:
-                    user = u
-                    break
-            
+            # Look the user up through the email index and check the password
+            user = facade.authenticate_user(email, password)
             if not user:
                 api.abort(401, 'Invalid credentials')
             
-            # Check password
-            if not user.check_password(password):
-                api.abort(401, 'Invalid credentials')
-            
             # Create JWT token with additional claims
             additional_claims = {
                 "is_admin": user.is_admin,
@@ -66,6 +57,8 @@ class UserLogin(Resource):
                 'user': user.to_dict()
             }, 200
                 
+        except PasswordHashingUnavailable:
+            raise  # reported as 503 by the API error handler
         except Exception as e:
             api.abort(400, str(e))
 
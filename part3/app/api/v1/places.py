@@ -1,9 +1,11 @@
 # app/api/v1/places.py
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
 from app.utils.admin import admin_or_owner_required
+from app.utils.pagination import page_headers, parse_page_args
+from app.utils.streaming import stream_format, streamed_response
 
 api = Namespace('places', description='Place operations')
 
@@ -29,6 +31,13 @@ review_model = api.model('PlaceReview', {
     'created_at': fields.DateTime(description='Creation timestamp')
 })
 
+rating_model = api.model('PlaceRatingSummary', {
+    'count': fields.Integer(description='Number of reviews'),
+    'sum': fields.Integer(description='Sum of all ratings'),
+    'average': fields.Float(description='Average rating (null without reviews)'),
+    'histogram': fields.Raw(description='Number of reviews per star rating (1-5)')
+})
+
 # Define models for request/response
 place_create_model = api.model('PlaceCreate', {
     'name': fields.String(required=True, description='Place name'),
@@ -71,44 +80,154 @@ place_response = api.model('PlaceResponse', {
     'max_guests': fields.Integer(description='Maximum number of guests'),
     'amenities': fields.List(fields.Nested(amenity_model), description='List of amenities'),
     'reviews': fields.List(fields.Nested(review_model), description='List of reviews'),
+    'rating': fields.Nested(rating_model, description='Rating aggregates'),
     'created_at': fields.DateTime(description='Creation timestamp'),
     'updated_at': fields.DateTime(description='Update timestamp')
 })
 
+place_search_response = api.inherit('PlaceSearchResult', place_response, {
+    'distance_km': fields.Float(description='Distance from the search point (radius search only)'),
+    'score': fields.Float(description='Relevance score (text search only)'),
+    'snippet': fields.String(description='Highlighted matching text (text search with snippets only)')
+})
+
+facet_bucket_model = api.model('PlaceFacetBucket', {
+    'min': fields.Float(description='Inclusive lower bound'),
+    'max': fields.Float(description='Exclusive upper bound (null for the last bucket)'),
+    'count': fields.Integer(description='Number of matching places')
+})
+
+facet_amenity_model = api.model('PlaceFacetAmenity', {
+    'id': fields.String(description='Amenity ID'),
+    'name': fields.String(description='Amenity name'),
+    'count': fields.Integer(description='Number of matching places with this amenity')
+})
+
+place_facets_model = api.model('PlaceFacets', {
+    'amenities': fields.List(fields.Nested(facet_amenity_model), skip_none=True),
+    'price': fields.List(fields.Nested(facet_bucket_model), skip_none=True),
+    'guests': fields.List(fields.Nested(facet_bucket_model), skip_none=True)
+})
+
+place_page_model = api.model('PlaceListWithFacets', {
+    'places': fields.List(fields.Nested(place_response)),
+    'facets': fields.Nested(place_facets_model, skip_none=True)
+})
+
+place_search_page_model = api.model('PlaceSearchWithFacets', {
+    'places': fields.List(fields.Nested(place_search_response)),
+    'facets': fields.Nested(place_facets_model, skip_none=True)
+})
+
+place_autocomplete_model = api.model('PlaceAutocomplete', {
+    'id': fields.String(description='Place ID'),
+    'name': fields.String(description='Place name'),
+    'review_count': fields.Integer(description='Number of reviews, used for ranking')
+})
+
+def _parse_facets(args):
+    """Read 'facets=amenities,price,guests' from the query string"""
+    return [part.strip() for part in args.get('facets', '').split(',') if part.strip()]
+
+def _with_facets(places, facets, model, page_model):
+    """Marshal places alone, or wrapped together with their facet counts"""
+    if facets is None:
+        return marshal(places, model)
+    return marshal({'places': places, 'facets': facets}, page_model)
+
+def _places_with_details(places):
+    """Serialize one streamed chunk of places with their details"""
+    return facade.get_places_with_details([place.id for place in places])
+
+def _parse_bbox(value):
+    """Parse a 'min_lat,min_lon,max_lat,max_lon' query parameter"""
+    try:
+        parts = [float(part) for part in value.split(',')]
+    except ValueError:
+        raise ValueError("bbox must be four comma-separated numbers")
+    if len(parts) != 4:
+        raise ValueError("bbox must be min_lat,min_lon,max_lat,max_lon")
+    return parts
+
+# Listing query parameters handled by facade.filter_places
+PLACE_FILTER_PARAMS = {
+    'min_price': float,
+    'max_price': float,
+    'min_guests': int,
+    'min_rooms': int,
+    'city_id': str,
+    'sort': str,
+}
+
+def _parse_place_filters(args):
+    """Read and type-check the place listing filters from the query string"""
+    filters = {}
+    for name, cast in PLACE_FILTER_PARAMS.items():
+        value = args.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            filters[name] = cast(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a valid {cast.__name__}")
+    filters.update(_parse_amenity_filter(args))
+    return filters
+
+def _parse_amenity_filter(args):
+    """Read 'amenities=id1,id2' and 'amenity_match=all|any' from the query string"""
+    amenity_ids = [part.strip() for part in args.get('amenities', '').split(',') if part.strip()]
+    if not amenity_ids:
+        return {}
+    match = args.get('amenity_match', 'all')
+    if match not in ('all', 'any'):
+        raise ValueError("amenity_match must be 'all' or 'any'")
+    return {'amenity_ids': amenity_ids, 'match_all_amenities': match == 'all'}
+
 @api.route('/')
 class PlaceList(Resource):
-    @api.doc('list_places')
-    @api.marshal_list_with(place_response)
+    @api.doc('list_places', params={
+        'min_price': 'Minimum price per night',
+        'max_price': 'Maximum price per night',
+        'min_guests': 'Minimum guest capacity',
+        'min_rooms': 'Minimum number of rooms',
+        'city_id': 'Only places in this city',
+        'amenities': 'Comma-separated amenity IDs the places must have',
+        'amenity_match': 'all (default) or any of the given amenities',
+        'sort': 'price, guests, rooms, name or created_at (prefix with - for descending)',
+        'limit': 'Page size (default 100, at most 1000)',
+        'cursor': 'Cursor from the previous page\'s Link rel="next" header (not with sort)',
+        'facets': 'Comma-separated facets (amenities, price, guests); wraps the response as {places, facets}',
+        'stream': 'Set to true to stream every place as a chunked JSON array (Accept: application/x-ndjson streams NDJSON)'
+    })
+    @api.response(200, 'Places, or {places, facets} when facets are requested', [place_response])
+    @api.response(400, 'Invalid filter parameters')
     def get(self):
-        """List all places with details"""
-        places = facade.get_all_places()
-        result = []
-
-        for place in places:
-            place_dict = place.to_dict()
-            # add host details
-            try:
-                host = facade.get_user(place.host_id)
-                place_dict['host'] = host.to_dict()
-            except:
-                place_dict['host'] = None
-
-            # add amenities
-            place_dict['amenities'] = []
-            for amenity_id in place.amenity_ids:
-                try:
-                    amenity = facade.get_amenity(amenity_id)
-                    place_dict['amenities'].append(amenity.to_dict())
-                except:
-                    pass
-
-            # add reviews
-            reviews = facade.get_reviews_by_place(place.id)
-            place_dict['reviews'] = [review.to_dict() for review in reviews]
-
-            result.append(place_dict)
-
-        return result
+        """List places with details, optionally filtered, sorted and faceted, one page at a time"""
+        try:
+            filters = _parse_place_filters(request.args)
+            mimetype = stream_format()
+            if mimetype:
+                if filters or request.args.get('facets'):
+                    raise ValueError("Streamed listings cannot be filtered, sorted or faceted")
+                return streamed_response(facade.iter_places(), _places_with_details,
+                                         place_response, mimetype)
+            sort = filters.pop('sort', None)
+            limit, after = parse_page_args(request.args)
+            facet_names = _parse_facets(request.args)
+            facets = facade.get_place_facets(facet_names, **filters) if facet_names else None
+            if sort:
+                # Keyset cursors follow (created_at, id); other orders return one page
+                if after is not None:
+                    raise ValueError("cursor cannot be combined with sort")
+                places = facade.filter_places(sort=sort, limit=limit, **filters)
+                more, total = False, facade.count_places(**filters)
+            else:
+                places, more, total = facade.get_places_page(limit, after, **filters)
+            result = facade.get_places_with_details([place.id for place in places])
+            return (_with_facets(result, facets, place_response, place_page_model), 200,
+                    page_headers(places, more, total))
+        except ValueError as e:
+            api.abort(400, str(e))
 
     @api.doc('create_place')
     @api.expect(place_create_model)
@@ -127,15 +246,96 @@ class PlaceList(Resource):
             place = facade.create_place(**data)
 
             # prepare response with full details
-            place_dict = place.to_dict()
-            place_dict['host'] = facade.get_user(place.host_id).to_dict()
-            place_dict['amenities'] = []
-            for amenity_id in place.amenity_ids:
-                amenity = facade.get_amenity(amenity_id)
-                place_dict['amenities'].append(amenity.to_dict())
-            place_dict['reviews'] = []
-
-            return place_dict, 201
+            return facade.get_place_with_details(place.id), 201
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc('search_places', params={
+        'q': 'Full-text query over place names, descriptions and review comments',
+        'snippets': 'Set to true to return highlighted snippets with q',
+        'lat': 'Latitude of the search centre',
+        'lon': 'Longitude of the search centre',
+        'radius_km': 'Search radius in kilometres (with lat and lon)',
+        'bbox': 'Bounding box as min_lat,min_lon,max_lat,max_lon',
+        'amenities': 'Comma-separated amenity IDs the places must have',
+        'amenity_match': 'all (default) or any of the given amenities',
+        'limit': 'Maximum number of results (default 100)',
+        'facets': 'Comma-separated facets (amenities, price, guests); wraps the response as {places, facets}'
+    })
+    @api.response(200, 'Places, or {places, facets} when facets are requested', [place_search_response])
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Search places by text (ranked by relevance), radius (ranked by distance) or bounding box"""
+        try:
+            limit = request.args.get('limit', 100, type=int)
+            if limit <= 0:
+                raise ValueError("limit must be positive")
+
+            amenity_filter = _parse_amenity_filter(request.args)
+            facet_names = _parse_facets(request.args)
+            query = request.args.get('q', '').strip()
+            snippets = request.args.get('snippets', '').lower() in ('1', 'true', 'yes')
+            lat = request.args.get('lat', type=float)
+            lon = request.args.get('lon', type=float)
+            radius_km = request.args.get('radius_km', type=float)
+            # Facets count every match and text queries only use the location as a
+            # filter, so search without the limit and cut afterwards
+            search_limit = None if facet_names or query else limit
+
+            places, distances, scores, excerpts = None, {}, {}, {}
+            if request.args.get('bbox'):
+                places = facade.search_places_in_bbox(*_parse_bbox(request.args['bbox']),
+                                                      limit=search_limit, **amenity_filter)
+            elif lat is not None or lon is not None or radius_km is not None:
+                if lat is None or lon is None or radius_km is None:
+                    raise ValueError("Provide lat, lon and radius_km together")
+                ranked = facade.search_places_nearby(lat, lon, radius_km, limit=search_limit,
+                                                     **amenity_filter)
+                places = [place for place, _ in ranked]
+                distances = {place.id: round(distance, 3) for place, distance in ranked}
+            elif not query:
+                raise ValueError("Provide q, lat, lon and radius_km, or bbox")
+
+            if query:
+                text_limit = None if facet_names or places is not None else limit
+                matches = facade.search_places_text(query, limit=text_limit, snippets=snippets,
+                                                    **amenity_filter)
+                if places is not None:
+                    located = {place.id for place in places}
+                    matches = [match for match in matches if match[0].id in located]
+                places = [place for place, _, _ in matches]
+                scores = {place.id: round(score, 4) for place, score, _ in matches}
+                excerpts = {place.id: excerpt for place, _, excerpt in matches}
+
+            facets = None
+            if facet_names:
+                facets = facade.get_place_facets(facet_names, place_ids=[place.id for place in places])
+            places = places[:limit]
+
+            result = facade.get_places_with_details([place.id for place in places])
+            for place_dict in result:
+                place_dict['distance_km'] = distances.get(place_dict['id'])
+                place_dict['score'] = scores.get(place_dict['id'])
+                place_dict['snippet'] = excerpts.get(place_dict['id'])
+            return _with_facets(result, facets, place_search_response, place_search_page_model)
+        except ValueError as e:
+            api.abort(400, str(e))
+
+@api.route('/autocomplete')
+class PlaceAutocomplete(Resource):
+    @api.doc('autocomplete_places', params={
+        'prefix': 'Start of any word in the place name',
+        'limit': 'Maximum number of suggestions (1-50, default 10)'
+    })
+    @api.marshal_list_with(place_autocomplete_model)
+    @api.response(400, 'Invalid prefix or limit')
+    def get(self):
+        """Suggest places whose name starts with a prefix, most reviewed first"""
+        try:
+            return facade.autocomplete_places(request.args.get('prefix', ''),
+                                              request.args.get('limit', 10, type=int))
         except ValueError as e:
             api.abort(400, str(e))
 
@@ -148,26 +348,7 @@ class Place(Resource):
     def get(self, place_id):
         """Get a place by ID with full details"""
         try:
-            place = facade.get_place(place_id)
-            place_dict = place.to_dict()
-
-            # add host details
-            place_dict['host'] = facade.get_user(place.host_id).to_dict()
-
-            # add amenities
-            place_dict['amenities'] = []
-            for amenity_id in place.amenity_ids:
-                try:
-                    amenity = facade.get_amenity(amenity_id)
-                    place_dict['amenities'].append(amenity.to_dict())
-                except:
-                    pass
-
-            # add reviews
-            reviews = facade.get_reviews_by_place(place_id)
-            place_dict['reviews'] = [review.to_dict() for review in reviews]
-
-            return place_dict
+            return facade.get_place_with_details(place_id)
         except ValueError:
             api.abort(404, f"Place {place_id} not found")
 
@@ -196,16 +377,6 @@ class Place(Resource):
             place = facade.update_place(place_id, **update_data)
 
             # prepare response with full details
-            place_dict = place.to_dict()
-            place_dict['host'] = facade.get_user(place.host_id).to_dict()
-            place_dict['amenities'] = []
-            for amenity_id in place.amenity_ids:
-                amenity = facade.get_amenity(amenity_id)
-                place_dict['amenities'].append(amenity.to_dict())
-
-            reviews = facade.get_reviews_by_place(place_id)
-            place_dict['reviews'] = [review.to_dict() for review in reviews]
-
-            return place_dict
+            return facade.get_place_with_details(place.id)
         except ValueError as e:
             api.abort(404 if "not found" in str(e) else 400, str(e))
@@ -1,9 +1,13 @@
 # app/api/v1/reviews.py
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.services.loader import get_loader
+from app.models.user import User as UserModel
 from app.utils.admin import admin_or_owner_required
+from app.utils.pagination import page_headers, parse_page_args
+from app.utils.streaming import stream_format, streamed_response
 
 api = Namespace('reviews', description='Review operations')
 
@@ -39,26 +43,44 @@ review_response = api.model('ReviewResponse', {
     'updated_at': fields.DateTime(description='Update timestamp')
 })
 
+def _review_with_user(review):
+    """Serialize a review with its author resolved through the request loader"""
+    review_dict = review.to_dict()
+    user = get_loader().load(UserModel, review.user_id)
+    review_dict['user'] = user.to_dict() if user else None
+    return review_dict
+
+def _reviews_with_users(reviews):
+    """Serialize reviews, fetching all their authors with one batched lookup"""
+    get_loader().queue(UserModel, [review.user_id for review in reviews])
+    return [_review_with_user(review) for review in reviews]
+
+def _stream_chunk_with_users(reviews):
+    """Serialize one streamed chunk of reviews, forgetting the authors of the previous one"""
+    get_loader().clear(UserModel)
+    return _reviews_with_users(reviews)
+
 @api.route('/')
 class ReviewList(Resource):
-    @api.doc('list_reviews')
-    @api.marshal_list_with(review_response)
+    @api.doc('list_reviews', params={
+        'limit': 'Page size (default 100, at most 1000)',
+        'cursor': 'Cursor from the previous page\'s Link rel="next" header',
+        'stream': 'Set to true to stream every row as a chunked JSON array (Accept: application/x-ndjson streams NDJSON)'
+    })
+    @api.response(200, 'Success', [review_response])
+    @api.response(400, 'Invalid limit or cursor')
     def get(self):
-        """List all reviews"""
-        reviews = facade.get_all_reviews()
-        result = []
-
-        for review in reviews:
-            review_dict = review.to_dict()
-            # add user details
-            try:
-                user = facade.get_user(review.user_id)
-                review_dict['user'] = user.to_dict()
-            except:
-                review_dict['user'] = None
-            result.append(review_dict)
-
-        return result
+        """List reviews oldest first, one page at a time (X-Total-Count and Link headers) or streamed"""
+        mimetype = stream_format()
+        if mimetype:
+            return streamed_response(facade.iter_reviews(), _stream_chunk_with_users,
+                                     review_response, mimetype)
+        try:
+            reviews, more, total = facade.get_reviews_page(*parse_page_args(request.args))
+        except ValueError as e:
+            api.abort(400, str(e))
+        return (marshal(_reviews_with_users(reviews), review_response), 200,
+                page_headers(reviews, more, total))
 
     @api.doc('create_review')
     @api.expect(review_create_model)
@@ -89,10 +111,7 @@ class ReviewList(Resource):
             )
 
             # prepare response with user details
-            review_dict = review.to_dict()
-            review_dict['user'] = facade.get_user(review.user_id).to_dict()
-
-            return review_dict, 201
+            return _review_with_user(review), 201
         except ValueError as e:
             api.abort(400, str(e))
 
@@ -106,12 +125,7 @@ class Review(Resource):
         """Get a review by ID"""
         try:
             review = facade.get_review(review_id)
-            review_dict = review.to_dict()
-
-            # add user details
-            review_dict['user'] = facade.get_user(review.user_id).to_dict()
-
-            return review_dict
+            return _review_with_user(review)
         except ValueError:
             api.abort(404, f"Review {review_id} not found")
 
@@ -145,10 +159,7 @@ class Review(Resource):
             review = facade.update_review(review_id, **update_data)
 
             # prepare response
-            review_dict = review.to_dict()
-            review_dict['user'] = facade.get_user(review.user_id).to_dict()
-
-            return review_dict
+            return _review_with_user(review)
         except ValueError as e:
             api.abort(404 if "not found" in str(e) else 400, str(e))
 
@@ -177,21 +188,17 @@ class Review(Resource):
 @api.route('/places/<string:place_id>')
 @api.param('place_id', 'The place identifier')
 class PlaceReviews(Resource):
-    @api.doc('get_place_reviews')
+    @api.doc('get_place_reviews', params={
+        'limit': 'Page size (default 100, at most 1000)',
+        'cursor': 'Cursor from the previous page\'s Link rel="next" header'
+    })
     @api.marshal_list_with(review_response)
+    @api.response(400, 'Invalid limit or cursor')
     def get(self, place_id):
-        """Get all reviews for a specific place"""
-        reviews = facade.get_reviews_by_place(place_id)
-        result = []
-
-        for review in reviews:
-            review_dict = review.to_dict()
-            # add user details
-            try:
-                user = facade.get_user(review.user_id)
-                review_dict['user'] = user.to_dict()
-            except:
-                review_dict['user'] = None
-            result.append(review_dict)
-
-        return result
+        """Get the reviews of a place oldest first, one page at a time"""
+        try:
+            reviews, more, total = facade.get_reviews_page(*parse_page_args(request.args),
+                                                           place_id=place_id)
+        except ValueError as e:
+            api.abort(400, str(e))
+        return _reviews_with_users(reviews), 200, page_headers(reviews, more, total)
@@ -1,7 +1,9 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.utils.pagination import page_headers, parse_page_args
+from app.utils.streaming import stream_format, streamed_response
 
 api = Namespace('users', description='User operations')
 
@@ -29,13 +31,29 @@ user_response = api.model('UserResponse', {
     'updated_at': fields.DateTime(description='Update timestamp')
 })
 
+def _users_to_dicts(users):
+    """Serialize a list of users"""
+    return [user.to_dict() for user in users]
+
 @api.route('/')
 class UserList(Resource):
-    @api.doc('list_users')
-    @api.marshal_list_with(user_response)
+    @api.doc('list_users', params={
+        'limit': 'Page size (default 100, at most 1000)',
+        'cursor': 'Cursor from the previous page\'s Link rel="next" header',
+        'stream': 'Set to true to stream every row as a chunked JSON array (Accept: application/x-ndjson streams NDJSON)'
+    })
+    @api.response(200, 'Success', [user_response])
+    @api.response(400, 'Invalid limit or cursor')
     def get(self):
-        """List all users"""
-        return [user.to_dict() for user in facade.get_all_users()]
+        """List users oldest first, one page at a time (X-Total-Count and Link headers) or streamed"""
+        mimetype = stream_format()
+        if mimetype:
+            return streamed_response(facade.iter_users(), _users_to_dicts, user_response, mimetype)
+        try:
+            users, more, total = facade.get_users_page(*parse_page_args(request.args))
+        except ValueError as e:
+            api.abort(400, str(e))
+        return marshal(_users_to_dicts(users), user_response), 200, page_headers(users, more, total)
 
     @api.doc('create_user')
     @api.expect(user_model)
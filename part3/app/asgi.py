@@ -0,0 +1,270 @@
+"""ASGI application serving the hot read paths on asyncio.
+
+Place and amenity details and logins are answered by AsyncHBnBFacade on
+the event loop; every other request is handed to the Flask application
+through a WSGI bridge running on a worker thread, so the whole API is
+reachable from one ASGI server (uvicorn asgi:app).
+"""
+
+import asyncio
+import io
+import json
+import os
+import re
+import sys
+import threading
+from flask_jwt_extended import create_access_token
+from flask_restx import marshal
+from app import create_app, db
+from app.persistence.async_repository import AsyncRepositoryAdapter, AsyncSQLAlchemyRepository
+from app.persistence.engine import engine_options as usable_engine_options, install_sqlite_pragmas
+from app.services.async_facade import AsyncHBnBFacade
+from app.utils.hashing import PasswordHashingUnavailable
+
+
+# Fixed Flask routes that the async /<id> patterns would otherwise capture
+FLASK_SUBRESOURCES = frozenset(('search', 'autocomplete'))
+
+
+def _json_response(status: int, body) -> tuple:
+    return status, [(b'content-type', b'application/json')], json.dumps(body).encode('utf-8')
+
+
+class WSGIBridge:
+    """Runs a WSGI application for ASGI HTTP requests on a worker thread.
+
+    The body is relayed chunk by chunk as the application produces it, so
+    streamed listings stay streamed. At most max_queued_chunks chunks wait
+    for a slow client before the worker blocks, and the application's
+    iterator is closed once the client disconnects.
+    """
+
+    def __init__(self, wsgi_app, max_queued_chunks: int = 8):
+        self.wsgi_app = wsgi_app
+        # The worker may post one more chunk and the end marker after a disconnect
+        self.max_queued_chunks = max(2, max_queued_chunks)
+
+    @staticmethod
+    def environ(scope: dict, body: bytes) -> dict:
+        """PEP 3333 environ of an ASGI HTTP scope"""
+        server = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1] or 80),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': (scope.get('client') or ('127.0.0.1', 0))[0],
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                environ[name] = value
+                continue
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+    def _run(self, environ: dict, loop, queue: asyncio.Queue,
+             disconnected: threading.Event) -> None:
+        """Call the application and post its status, headers and chunks to queue.
+
+        Each post waits for room in the queue, so a slow client throttles the
+        application instead of buffering its whole response.
+        """
+        def post(message):
+            asyncio.run_coroutine_threadsafe(queue.put(message), loop).result()
+
+        def start_response(status, headers, exc_info=None):
+            post(('start', status, headers))
+
+        try:
+            result = self.wsgi_app(environ, start_response)
+            try:
+                for chunk in result:
+                    if disconnected.is_set():
+                        break
+                    if chunk:
+                        post(('body', chunk))
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            post(('end',))
+
+    @staticmethod
+    async def _watch_disconnect(receive, disconnected: threading.Event) -> None:
+        """Set disconnected when the client goes away (the body was already read)"""
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    async def __call__(self, scope: dict, body: bytes, send, receive=None) -> None:
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.max_queued_chunks)
+        disconnected = threading.Event()
+        worker = loop.run_in_executor(None, self._run, self.environ(scope, body), loop, queue,
+                                      disconnected)
+        watcher = loop.create_task(self._watch_disconnect(receive, disconnected)) if receive else None
+        started = finished = False
+        try:
+            while True:
+                message = await queue.get()
+                if message[0] == 'end':
+                    finished = True
+                    break
+                if disconnected.is_set():
+                    continue  # drain, so the worker can reach the end marker
+                try:
+                    if message[0] == 'start':
+                        _, status, headers = message
+                        await send({'type': 'http.response.start',
+                                    'status': int(status.split(' ', 1)[0]),
+                                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                                for name, value in headers]})
+                        started = True
+                    else:
+                        await send({'type': 'http.response.body', 'body': message[1],
+                                    'more_body': True})
+                except OSError:
+                    disconnected.set()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if not finished:
+                # Cancelled mid-response: stop the worker and unblock its puts
+                disconnected.set()
+                while not queue.empty():
+                    queue.get_nowait()
+        try:
+            await worker
+        except Exception:
+            if started:
+                raise
+            if disconnected.is_set():
+                return
+            status, headers, body = _json_response(500, {'message': 'Internal Server Error'})
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        if not disconnected.is_set():
+            await send({'type': 'http.response.body', 'body': b''})
+
+
+class HBnBASGI:
+    """ASGI application: async routes first, then the Flask app"""
+
+    def __init__(self, flask_app, facade: AsyncHBnBFacade):
+        self.flask_app = flask_app
+        self.facade = facade
+        self.fallback = WSGIBridge(flask_app.wsgi_app)
+        self.routes = [
+            ('GET', re.compile(r'^/api/v1/places/(?P<place_id>[^/]+)/?$'), self.get_place),
+            ('GET', re.compile(r'^/api/v1/amenities/(?P<amenity_id>[^/]+)/?$'), self.get_amenity),
+            ('POST', re.compile(r'^/api/v1/auth/login/?$'), self.login),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        for method, pattern, handler in self.routes:
+            match = pattern.match(scope['path'])
+            if match is None or scope['method'] != method:
+                continue
+            params = match.groupdict()
+            if not FLASK_SUBRESOURCES.intersection(params.values()):
+                status, headers, payload = await handler(body, **params)
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': payload})
+                return
+        await self.fallback(scope, body, send, receive)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.facade.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # Async routes, answering like their Flask-RESTX resources
+
+    async def get_place(self, body, place_id):
+        from app.api.v1.places import place_response
+        try:
+            place = await self.facade.get_place_with_details(place_id)
+        except ValueError:
+            return _json_response(404, {'message': f"Place {place_id} not found"})
+        return _json_response(200, marshal(place, place_response))
+
+    async def get_amenity(self, body, amenity_id):
+        from app.api.v1.amenities import amenity_response
+        try:
+            amenity = await self.facade.get_amenity(amenity_id)
+        except ValueError:
+            return _json_response(404, {'message': f"Amenity {amenity_id} not found"})
+        return _json_response(200, marshal(amenity, amenity_response))
+
+    async def login(self, body):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            return _json_response(400, {'message': 'Invalid JSON body'})
+        email, password = data.get('email'), data.get('password')
+        if not email or not password:
+            return _json_response(400, {'message': 'Email and password are required'})
+        try:
+            user = await self.facade.authenticate_user(email, password)
+        except PasswordHashingUnavailable as e:
+            return _json_response(503, {'message': str(e)})
+        if not user:
+            return _json_response(401, {'message': 'Invalid credentials'})
+        with self.flask_app.app_context():
+            access_token = create_access_token(
+                identity=user.id, additional_claims={"is_admin": user.is_admin, "email": user.email})
+        return _json_response(200, {'access_token': access_token, 'user': user.to_dict()})
+
+
+def create_asgi_app(config_name: str = 'development', **engine_options) -> HBnBASGI:
+    """Build the Flask app and an async facade over the configured repository.
+
+    With REPOSITORY_TYPE=sqlalchemy the async facade gets its own asyncio
+    engine on the Flask app's database, configured like the sync one
+    (SQLALCHEMY_ENGINE_OPTIONS updated with engine_options, SQLITE_PRAGMAS);
+    otherwise it shares the in-memory repositories of the synchronous facade.
+    """
+    flask_app = create_app(config_name)
+    if os.environ.get('REPOSITORY_TYPE') == 'sqlalchemy':
+        with flask_app.app_context():
+            url = db.engine.url.render_as_string(hide_password=False)
+        options = usable_engine_options(url, dict(flask_app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {},
+                                                  **engine_options))
+        repository = AsyncSQLAlchemyRepository(url, **options)
+        install_sqlite_pragmas(repository.engine, flask_app.config.get('SQLITE_PRAGMAS'))
+        facade = AsyncHBnBFacade(repository)
+    else:
+        from app.services import facade as shared_facade
+        facade = AsyncHBnBFacade(AsyncRepositoryAdapter(shared_facade.repo),
+                                 AsyncRepositoryAdapter(shared_facade.user_repo))
+    return HBnBASGI(flask_app, facade)
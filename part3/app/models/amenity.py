@@ -1,10 +1,14 @@
 from app.models.base_model import BaseModel
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 from sqlalchemy.orm import relationship
 
 class Amenity(BaseModel):
     """Amenity model with SQLAlchemy mapping"""
     __tablename__ = 'amenities'
+    __table_args__ = (
+        # Keyset pagination of the amenity listing
+        Index('idx_amenities_created', 'created_at', 'id'),
+    )
     
     name = Column(String(50), unique=True, nullable=False, index=True)
     
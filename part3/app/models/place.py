@@ -1,5 +1,6 @@
 from app.models.base_model import BaseModel
-from sqlalchemy import Column, String, Text, Float, Integer, ForeignKey, Table
+from app.models.place_rating import PlaceRating
+from sqlalchemy import Column, String, Text, Float, Integer, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from app import db
 import json
@@ -7,12 +8,25 @@ import json
 # Many-to-many association table for Place-Amenity relationship
 place_amenity = Table('place_amenity', db.Model.metadata,
     Column('place_id', String(36), ForeignKey('places.id'), primary_key=True),
-    Column('amenity_id', String(36), ForeignKey('amenities.id'), primary_key=True)
+    Column('amenity_id', String(36), ForeignKey('amenities.id'), primary_key=True),
+    # Serves amenity filters and facet counts, which look rows up by amenity
+    Index('idx_place_amenity_amenity_id', 'amenity_id')
 )
 
 class Place(BaseModel):
     """Place model with SQLAlchemy mapping"""
     __tablename__ = 'places'
+    __table_args__ = (
+        # Range filters and sorting on the place listing
+        Index('idx_places_host_id', 'host_id'),
+        Index('idx_places_city_id', 'city_id'),
+        Index('idx_places_price', 'price_per_night'),
+        Index('idx_places_max_guests', 'max_guests'),
+        Index('idx_places_rooms', 'number_of_rooms'),
+        Index('idx_places_city_price', 'city_id', 'price_per_night'),
+        # Keyset pagination on (created_at, id)
+        Index('idx_places_created', 'created_at', 'id'),
+    )
     
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
@@ -30,6 +44,7 @@ class Place(BaseModel):
     host = relationship('User', back_populates='places')
     reviews = relationship('Review', back_populates='place', cascade='all, delete-orphan')
     amenities = relationship('Amenity', secondary=place_amenity, back_populates='places')
+    rating_summary = relationship(PlaceRating, uselist=False, cascade='all, delete-orphan')
 
     def __init__(self, name, description, address, city_id, latitude, longitude,
                  host_id, number_of_rooms, number_of_bathrooms, price_per_night,
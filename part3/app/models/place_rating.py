@@ -0,0 +1,75 @@
+from app.models.base_model import BaseModel
+from sqlalchemy import Column, String, Integer, ForeignKey
+
+class PlaceRating(BaseModel):
+    """Incrementally maintained rating aggregates for a single place.
+
+    The primary key is the id of the place it summarizes, so the summary of a
+    place can be fetched with a plain get(PlaceRating, place_id).
+    """
+    __tablename__ = 'place_ratings'
+
+    id = Column(String(36), ForeignKey('places.id'), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, place_id):
+        super().__init__()
+        if not place_id:
+            raise ValueError("Place ID is required")
+        self.id = place_id
+        self.reset()
+
+    def reset(self):
+        """Zero every counter"""
+        self.review_count = 0
+        self.rating_sum = 0
+        for stars in range(1, 6):
+            setattr(self, f'stars_{stars}', 0)
+
+    def add_rating(self, rating, count=1):
+        """Account for count new reviews with this rating"""
+        self._apply(rating, count)
+
+    def remove_rating(self, rating):
+        """Account for a removed review rating"""
+        self._apply(rating, -1)
+
+    def _apply(self, rating, delta):
+        for column, change in self.deltas(rating, delta).items():
+            setattr(self, column, (getattr(self, column) or 0) + change)
+
+    @staticmethod
+    def deltas(rating, delta):
+        """Counter changes for delta reviews with this rating (negative to remove them)"""
+        if not isinstance(rating, int) or not 1 <= rating <= 5:
+            raise ValueError("Rating must be between 1 and 5")
+        return {'review_count': delta, 'rating_sum': delta * rating, f'stars_{rating}': delta}
+
+    @property
+    def average(self):
+        """Average rating, or None when the place has no reviews"""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    def to_dict(self):
+        """Convert the aggregates to a dictionary"""
+        return {
+            'count': self.review_count or 0,
+            'sum': self.rating_sum or 0,
+            'average': self.average,
+            'histogram': {str(stars): getattr(self, f'stars_{stars}') or 0
+                          for stars in range(1, 6)}
+        }
+
+    @staticmethod
+    def empty_dict():
+        """Aggregates of a place without any review"""
+        return {'count': 0, 'sum': 0, 'average': None,
+                'histogram': {str(stars): 0 for stars in range(1, 6)}}
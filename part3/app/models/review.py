@@ -1,10 +1,15 @@
 from app.models.base_model import BaseModel
-from sqlalchemy import Column, String, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 class Review(BaseModel):
     """Review model with SQLAlchemy mapping"""
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # Keyset pagination of the review listings, overall and per place
+        Index('idx_reviews_created', 'created_at', 'id'),
+        Index('idx_reviews_place_created', 'place_id', 'created_at', 'id'),
+    )
     
     place_id = Column(String(36), ForeignKey('places.id'), nullable=False)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
@@ -1,12 +1,16 @@
 from app.models.base_model import BaseModel
-from app import bcrypt, db
-from sqlalchemy import Column, String, Boolean
+from app import password_hasher, db
+from sqlalchemy import Column, String, Boolean, Index
 from sqlalchemy.orm import relationship
 import re
 
 class User(BaseModel):
     """User model with secure password hashing and SQLAlchemy mapping"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Keyset pagination of the user listing
+        Index('idx_users_created', 'created_at', 'id'),
+    )
     
     email = Column(String(120), unique=True, nullable=False, index=True)
     first_name = Column(String(50), nullable=False)
@@ -55,13 +59,13 @@ class User(BaseModel):
             raise ValueError("Password cannot be empty")
         if len(password) < 6:
             raise ValueError("Password must be at least 6 characters long")
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.generate_password_hash(password)
     
     def check_password(self, password):
         """Check if the provided password matches the stored hash"""
         if not self.password_hash:
             return False
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.check_password_hash(self.password_hash, password)
     
     
     def to_dict(self):
@@ -0,0 +1,265 @@
+"""Awaitable repositories for the asyncio (ASGI) serving path.
+
+AsyncRepository mirrors the core Repository contract with coroutines.
+AsyncSQLAlchemyRepository runs it on SQLAlchemy's asyncio engine (aiosqlite
+for SQLite); each call uses its own short session and connection, so several
+calls can be awaited concurrently. AsyncRepositoryAdapter exposes any
+in-process repository through the same interface.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Type
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.models.base_model import BaseModel
+from app.persistence.compact_repository import owned_associations
+from app.persistence.repository import Repository
+from app import db
+
+try:
+    import aiosqlite
+except ImportError:  # optional dependency, see README
+    aiosqlite = None
+
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:  # needs greenlet
+    async_sessionmaker = create_async_engine = None
+
+# Async drivers used in place of the synchronous DBAPI of each backend
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a synchronous database URL to use the backend's async driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS and parsed.get_driver_name() != ASYNC_DRIVERS[backend]:
+        parsed = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return parsed.render_as_string(hide_password=False)
+
+
+class AsyncRepository(ABC):
+    """Coroutine version of the Repository contract.
+
+    Returned objects are detached from any session: their columns and owned
+    many-to-many collections (Place.amenities) are loaded, other
+    relationships are fetched with get_related().
+    """
+
+    @abstractmethod
+    async def add(self, obj: BaseModel) -> None:
+        """Add an object to the repository"""
+
+    @abstractmethod
+    async def get(self, model_class: Type[BaseModel], obj_id: str) -> Optional[BaseModel]:
+        """Retrieve an object by its ID"""
+
+    @abstractmethod
+    async def get_all(self, model_class: Type[BaseModel]) -> List[BaseModel]:
+        """Retrieve all objects of a given class"""
+
+    @abstractmethod
+    async def update(self, obj: BaseModel) -> None:
+        """Update an existing object"""
+
+    @abstractmethod
+    async def delete(self, model_class: Type[BaseModel], obj_id: str) -> bool:
+        """Delete an object by its ID"""
+
+    @abstractmethod
+    async def get_by_attribute(self, model_class: Type[BaseModel], **kwargs) -> List[BaseModel]:
+        """Get objects by attribute values"""
+
+    @abstractmethod
+    async def add_many(self, objs: Iterable[BaseModel]) -> None:
+        """Add several objects in a single operation"""
+
+    @abstractmethod
+    async def get_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> List[BaseModel]:
+        """Retrieve the objects matching the given IDs, in request order"""
+
+    @abstractmethod
+    async def delete_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs and return how many were deleted"""
+
+    @abstractmethod
+    async def get_related(self, model_class: Type[BaseModel], obj_id: str,
+                          relationship: str) -> List[BaseModel]:
+        """Objects of a collection relationship of one object (empty when it does not exist)"""
+
+    async def exists(self, model_class: Type[BaseModel], **kwargs) -> bool:
+        """Whether any object has the given attribute values"""
+        return bool(await self.get_by_attribute(model_class, **kwargs))
+
+    async def count(self, model_class: Type[BaseModel], **kwargs) -> int:
+        """Number of objects with the given attribute values"""
+        if kwargs:
+            return len(await self.get_by_attribute(model_class, **kwargs))
+        return len(await self.get_all(model_class))
+
+    async def close(self) -> None:
+        """Release connections held by the repository"""
+
+
+class AsyncRepositoryAdapter(AsyncRepository):
+    """AsyncRepository over a synchronous in-process repository.
+
+    Meant for the in-memory repositories, whose calls never wait on I/O, so
+    they run directly on the event loop and share their objects with the
+    synchronous facade.
+    """
+
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+    async def add(self, obj):
+        self.repository.add(obj)
+
+    async def get(self, model_class, obj_id):
+        return self.repository.get(model_class, obj_id)
+
+    async def get_all(self, model_class):
+        return self.repository.get_all(model_class)
+
+    async def update(self, obj):
+        self.repository.update(obj)
+
+    async def delete(self, model_class, obj_id):
+        return self.repository.delete(model_class, obj_id)
+
+    async def get_by_attribute(self, model_class, **kwargs):
+        return self.repository.get_by_attribute(model_class, **kwargs)
+
+    async def add_many(self, objs):
+        self.repository.add_many(objs)
+
+    async def get_many(self, model_class, obj_ids):
+        return self.repository.get_many(model_class, obj_ids)
+
+    async def delete_many(self, model_class, obj_ids):
+        return self.repository.delete_many(model_class, obj_ids)
+
+    async def get_related(self, model_class, obj_id, relationship):
+        obj = self.repository.get(model_class, obj_id)
+        return list(getattr(obj, relationship)) if obj else []
+
+    async def exists(self, model_class, **kwargs):
+        return self.repository.exists(model_class, **kwargs)
+
+    async def count(self, model_class, **kwargs):
+        return self.repository.count(model_class, **kwargs)
+
+
+class AsyncSQLAlchemyRepository(AsyncRepository):
+    """AsyncRepository on an SQLAlchemy asyncio engine.
+
+    Every call opens its own session, so concurrent calls run on separate
+    pooled connections instead of queueing on one.
+    """
+
+    def __init__(self, database_url: str, **engine_options):
+        url = make_url(async_database_url(database_url))
+        if create_async_engine is None:
+            raise ValueError("greenlet is required for an async SQLAlchemy repository")
+        if url.get_backend_name() == 'sqlite':
+            if aiosqlite is None:
+                raise ValueError("aiosqlite is required for an async SQLite repository")
+            if url.database not in (None, '', ':memory:'):
+                # aiosqlite defaults to NullPool, opening a connection (and its thread) per call
+                engine_options.setdefault('poolclass', AsyncAdaptedQueuePool)
+        self.engine = create_async_engine(url, **engine_options)
+        self._sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def create_all(self) -> None:
+        """Create any missing tables (and their triggers) on the async engine"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    def _select(self, model_class):
+        """SELECT of model_class that also loads its owned associations"""
+        return select(model_class).options(
+            *(selectinload(getattr(model_class, key)) for key in owned_associations(model_class)))
+
+    async def _all(self, query) -> List[BaseModel]:
+        async with self._sessions() as session:
+            return list((await session.scalars(query)).unique().all())
+
+    async def add(self, obj):
+        async with self._sessions() as session, session.begin():
+            session.add(obj)
+
+    async def get(self, model_class, obj_id):
+        found = await self._all(self._select(model_class).where(model_class.id == obj_id))
+        return found[0] if found else None
+
+    async def get_all(self, model_class):
+        return await self._all(self._select(model_class))
+
+    async def update(self, obj):
+        obj.save()
+        async with self._sessions() as session, session.begin():
+            await session.merge(obj)
+
+    async def delete(self, model_class, obj_id):
+        async with self._sessions() as session, session.begin():
+            obj = await session.get(model_class, obj_id)
+            if obj is None:
+                return False
+            # Through the session so ORM cascades still apply
+            await session.delete(obj)
+            return True
+
+    async def get_by_attribute(self, model_class, **kwargs):
+        query = self._select(model_class)
+        for key, value in kwargs.items():
+            if hasattr(model_class, key):
+                query = query.where(getattr(model_class, key) == value)
+        return await self._all(query)
+
+    async def add_many(self, objs):
+        async with self._sessions() as session, session.begin():
+            session.add_all(list(objs))
+
+    async def get_many(self, model_class, obj_ids):
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return []
+        found = {obj.id: obj for obj in
+                 await self._all(self._select(model_class).where(model_class.id.in_(ids)))}
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+
+    async def delete_many(self, model_class, obj_ids):
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return 0
+        async with self._sessions() as session, session.begin():
+            objs = (await session.scalars(select(model_class).where(model_class.id.in_(ids)))).all()
+            for obj in objs:
+                await session.delete(obj)
+            return len(objs)
+
+    async def get_related(self, model_class, obj_id, relationship):
+        attr = getattr(model_class, relationship)
+        query = (self._select(attr.property.mapper.class_)
+                 .join_from(model_class, attr).where(model_class.id == obj_id))
+        return await self._all(query)
+
+    async def exists(self, model_class, **kwargs):
+        query = select(model_class.id).filter_by(**kwargs).limit(1)
+        async with self._sessions() as session:
+            return (await session.scalar(query)) is not None
+
+    async def count(self, model_class, **kwargs):
+        query = select(func.count()).select_from(model_class).filter_by(**kwargs)
+        async with self._sessions() as session:
+            return await session.scalar(query)
@@ -0,0 +1,209 @@
+"""Columnar projection of numeric model fields for analytics queries.
+
+Each ColumnTable keeps one float64 array per column and an integer group code
+per row (city_id for places, place_id for reviews), so aggregates, group-bys
+and quantiles run as vectorized NumPy operations over contiguous arrays
+instead of loading model objects. Without NumPy the same interface works on
+stdlib arrays with plain loops.
+"""
+
+import math
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see README
+    np = None
+
+# Sentinel for "every group" in group-filtered aggregates
+ALL_GROUPS = object()
+
+_FREE = -1
+
+
+class ColumnTable:
+    """Float columns plus a group code per row, addressed by object id.
+
+    Deleted rows are marked free (group code -1) and reused by later inserts,
+    so the arrays only grow with the peak number of live rows. Missing values
+    are stored as NaN and ignored by every aggregate.
+    """
+
+    def __init__(self, columns: Iterable[str], capacity: int = 1024,
+                 vectorized: Optional[bool] = None):
+        self.columns = tuple(columns)
+        self.vectorized = np is not None if vectorized is None else vectorized
+        if self.vectorized and np is None:
+            raise ValueError("NumPy is required for a vectorized ColumnTable")
+        self._capacity = max(1, capacity)
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # high-water mark of used rows
+        self._group_codes: Dict[Any, int] = {}
+        self._group_values: List[Any] = []
+        self._allocate()
+
+    def _allocate(self) -> None:
+        if self.vectorized:
+            self._data = {column: np.full(self._capacity, np.nan) for column in self.columns}
+            self._codes = np.full(self._capacity, _FREE, dtype=np.int64)
+        else:
+            self._data = {column: array('d') for column in self.columns}
+            self._codes = array('q')
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key) -> bool:
+        return key in self._slots
+
+    def clear(self) -> None:
+        """Drop every row and group"""
+        self._slots.clear()
+        self._free.clear()
+        self._size = 0
+        self._group_codes.clear()
+        self._group_values.clear()
+        self._allocate()
+
+    # Writes
+
+    def _code(self, group: Any) -> int:
+        code = self._group_codes.get(group)
+        if code is None:
+            code = self._group_codes[group] = len(self._group_values)
+            self._group_values.append(group)
+        return code
+
+    def _new_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        row = self._size
+        self._size += 1
+        if not self.vectorized:
+            for column in self.columns:
+                self._data[column].append(math.nan)
+            self._codes.append(_FREE)
+        elif row >= self._capacity:
+            grow = self._capacity
+            self._capacity += grow
+            for column in self.columns:
+                self._data[column] = np.concatenate((self._data[column], np.full(grow, np.nan)))
+            self._codes = np.concatenate((self._codes, np.full(grow, _FREE, dtype=np.int64)))
+        return row
+
+    def upsert(self, key: str, values: Dict[str, Any], group: Any = None) -> None:
+        """Insert or overwrite the row of key (columns missing from values become NaN)"""
+        row = self._slots.get(key)
+        if row is None:
+            row = self._slots[key] = self._new_row()
+        for column in self.columns:
+            value = values.get(column)
+            self._data[column][row] = math.nan if value is None else float(value)
+        self._codes[row] = self._code(group)
+
+    def remove(self, key: str) -> None:
+        """Remove the row of key if present"""
+        row = self._slots.pop(key, None)
+        if row is None:
+            return
+        self._codes[row] = _FREE
+        for column in self.columns:
+            self._data[column][row] = math.nan
+        self._free.append(row)
+
+    def group_of(self, key: str) -> Any:
+        """Group value of a row, or None when key is absent"""
+        row = self._slots.get(key)
+        return None if row is None else self._group_values[self._codes[row]]
+
+    # Reads
+
+    def _rows(self, column: str, group: Any = ALL_GROUPS):
+        """Codes and values of the live rows of column that have a value"""
+        codes, values = self._codes[:self._size], self._data[column][:self._size]
+        if self.vectorized:
+            mask = (codes != _FREE) & ~np.isnan(values)
+            if group is not ALL_GROUPS:
+                mask &= codes == self._group_codes.get(group, -2)
+            return codes[mask], values[mask]
+        wanted = None if group is ALL_GROUPS else self._group_codes.get(group, -2)
+        pairs = [(code, value) for code, value in zip(codes, values)
+                 if code != _FREE and not math.isnan(value) and (wanted is None or code == wanted)]
+        return [code for code, _ in pairs], [value for _, value in pairs]
+
+    def summary(self, column: str, group: Any = ALL_GROUPS) -> Dict[str, Any]:
+        """Count, sum, mean, min and max of a column"""
+        _, values = self._rows(column, group)
+        count = len(values)
+        if not count:
+            return {'count': 0, 'sum': 0.0, 'mean': None, 'min': None, 'max': None}
+        if self.vectorized:
+            total, low, high = float(values.sum()), float(values.min()), float(values.max())
+        else:
+            total, low, high = math.fsum(values), min(values), max(values)
+        return {'count': count, 'sum': total, 'mean': total / count, 'min': low, 'max': high}
+
+    def quantiles(self, column: str, qs: Iterable[float], group: Any = ALL_GROUPS) -> List[Optional[float]]:
+        """Quantiles of a column with linear interpolation (NumPy's default method)"""
+        qs = list(qs)
+        _, values = self._rows(column, group)
+        if not len(values):
+            return [None] * len(qs)
+        if self.vectorized:
+            return [float(value) for value in np.quantile(values, qs)]
+        ordered = sorted(values)
+        results = []
+        for q in qs:
+            position = q * (len(ordered) - 1)
+            below = math.floor(position)
+            above = min(below + 1, len(ordered) - 1)
+            results.append(ordered[below] + (ordered[above] - ordered[below]) * (position - below))
+        return results
+
+    def value_counts(self, column: str) -> Dict[float, int]:
+        """Number of rows per distinct value of a column"""
+        _, values = self._rows(column)
+        if self.vectorized:
+            distinct, counts = np.unique(values, return_counts=True)
+            return {float(value): int(count) for value, count in zip(distinct, counts)}
+        counts: Dict[float, int] = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def group_sums(self, column: str,
+                   regroup: Optional[Callable[[Any], Any]] = None) -> Dict[Any, Dict[str, float]]:
+        """Count and sum of a column per group, with bincount over the group codes.
+
+        regroup maps each group value to another one (a review's place_id to
+        the place's city_id, say); rows mapped to None are dropped.
+        """
+        codes, values = self._rows(column)
+        groups = self._group_values
+        if regroup is not None:
+            targets = [regroup(group) for group in groups]
+            groups = list(dict.fromkeys(target for target in targets if target is not None))
+            index = {target: code for code, target in enumerate(groups)}
+            remap = [index.get(target, _FREE) if target is not None else _FREE for target in targets]
+        if self.vectorized:
+            if regroup is not None:
+                codes = np.asarray(remap, dtype=np.int64)[codes] if len(remap) else codes
+                keep = codes != _FREE
+                codes, values = codes[keep], values[keep]
+            counts = np.bincount(codes, minlength=len(groups))
+            sums = np.bincount(codes, weights=values, minlength=len(groups))
+            return {group: {'count': int(counts[code]), 'sum': float(sums[code])}
+                    for code, group in enumerate(groups) if counts[code]}
+        totals: Dict[int, List[float]] = {}
+        for code, value in zip(codes, values):
+            if regroup is not None:
+                code = remap[code]
+                if code == _FREE:
+                    continue
+            total = totals.setdefault(code, [0, 0.0])
+            total[0] += 1
+            total[1] += value
+        return {groups[code]: {'count': count, 'sum': total}
+                for code, (count, total) in sorted(totals.items())}
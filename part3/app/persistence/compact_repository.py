@@ -0,0 +1,135 @@
+"""In-memory repository that keeps compact __slots__ records instead of mapped models"""
+
+import sys
+from collections.abc import MutableMapping
+from operator import attrgetter
+from typing import Dict, Iterator, Tuple, Type
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.base_model import BaseModel
+from app.persistence.repository import InMemoryRepository
+# Imported so every model and relationship is mapped before layouts are built
+from app.models import amenity, place, place_rating, review, user  # noqa: F401
+
+
+def owned_associations(model_class: Type[BaseModel]) -> Tuple[str, ...]:
+    """Many-to-many relationships stored from this side of their association table.
+
+    Each association table belongs to the class its first column points at
+    (Place.amenities); the reverse collection (Amenity.places) is derived.
+    """
+    mapper = sa_inspect(model_class)
+    return tuple(rel.key for rel in mapper.relationships if rel.secondary is not None
+                 and any(fk.references(mapper.local_table)
+                         for fk in list(rel.secondary.columns)[0].foreign_keys))
+
+
+class RecordLayout:
+    """__slots__ record type of one model class, with conversions both ways.
+
+    A record holds the column values and, for each owned association, a tuple
+    of related IDs. IDs and foreign keys are interned so a host_id shares the
+    string of the user's id.
+    """
+
+    def __init__(self, model_class: Type[BaseModel]):
+        mapper = sa_inspect(model_class)
+        self.model_class = model_class
+        self.columns = tuple(attr.key for attr in mapper.column_attrs)
+        self.links = owned_associations(model_class)
+        self.related = {key: mapper.relationships[key].mapper.class_.__name__ for key in self.links}
+        self.interned = tuple(key for key in self.columns if key == 'id' or key.endswith('_id'))
+        self.record_class = type(f'{model_class.__name__}Record', (),
+                                 {'__slots__': self.columns + self.links})
+        self._values = attrgetter(*self.columns)
+        self._manager = mapper.class_manager
+
+    def to_record(self, obj: BaseModel):
+        """Copy a model's columns and association IDs into a new record"""
+        record = self.record_class()
+        for key in self.columns:
+            setattr(record, key, getattr(obj, key))
+        for key in self.interned:
+            value = getattr(record, key)
+            if isinstance(value, str):
+                setattr(record, key, sys.intern(value))
+        for key in self.links:
+            setattr(record, key, tuple(sys.intern(related.id) for related in getattr(obj, key)))
+        return record
+
+    def to_model(self, record, stores: Dict[str, 'RecordStore']) -> BaseModel:
+        """Materialize a detached model from a record, bypassing __init__"""
+        obj = self._manager.new_instance()
+        obj.__dict__.update(zip(self.columns, self._values(record)))
+        for key in self.links:
+            related = stores.get(self.related[key], {})
+            set_committed_value(obj, key, [related[related_id] for related_id in getattr(record, key)
+                                           if related_id in related])
+        return obj
+
+
+class RecordStore(MutableMapping):
+    """Object dict of one model class: records inside, models at the boundary"""
+
+    def __init__(self, layout: RecordLayout, stores: Dict[str, 'RecordStore']):
+        self.layout = layout
+        self.records = {}
+        self._stores = stores
+
+    def __getitem__(self, obj_id: str) -> BaseModel:
+        return self.layout.to_model(self.records[obj_id], self._stores)
+
+    def __setitem__(self, obj_id: str, obj: BaseModel) -> None:
+        self.records[sys.intern(obj_id)] = self.layout.to_record(obj)
+
+    def __delitem__(self, obj_id: str) -> None:
+        del self.records[obj_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, obj_id) -> bool:
+        return obj_id in self.records
+
+    def get(self, obj_id: str, default=None):
+        record = self.records.get(obj_id)
+        return default if record is None else self.layout.to_model(record, self._stores)
+
+
+class RecordStores(dict):
+    """Class name -> RecordStore; plain dicts assigned by InMemoryRepository are converted"""
+
+    def __init__(self):
+        super().__init__()
+        self._layouts: Dict[str, RecordLayout] = {}
+
+    def layout(self, class_name: str) -> RecordLayout:
+        if class_name not in self._layouts:
+            classes = {mapper.class_.__name__: mapper.class_ for mapper in BaseModel.registry.mappers}
+            self._layouts[class_name] = RecordLayout(classes[class_name])
+        return self._layouts[class_name]
+
+    def __setitem__(self, class_name: str, objects) -> None:
+        if not isinstance(objects, RecordStore):
+            store = RecordStore(self.layout(class_name), self)
+            store.update(objects)
+            objects = store
+        super().__setitem__(class_name, objects)
+
+
+class CompactInMemoryRepository(InMemoryRepository):
+    """InMemoryRepository storing __slots__ records instead of SQLAlchemy models.
+
+    A mapped instance carries an InstanceState, an attribute dict and
+    relationship collections; a record is a fixed array of column values.
+    Objects are converted on add() and update(), and every read materializes
+    a new detached model, as a database load would: changes to a returned
+    object are only stored by update(). Indexes work as in the base class.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._storage = RecordStores()
@@ -0,0 +1,108 @@
+"""Thread-safe in-memory repository for multi-threaded serving"""
+
+import threading
+from functools import wraps
+from typing import Dict, Iterable, List, Optional, Type
+from app.models.base_model import BaseModel
+from app.persistence.repository import InMemoryRepository
+
+
+def _model_locked(method):
+    """Run a repository method while holding the lock of its model class"""
+    @wraps(method)
+    def wrapper(self, model_class, *args, **kwargs):
+        with self._lock(model_class.__name__):
+            return method(self, model_class, *args, **kwargs)
+    return wrapper
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """InMemoryRepository safe to share between request threads.
+
+    Each model class maps to one of LOCK_STRIPES locks. Writers hold it while
+    they change the class's object dict and indexes in place. Readers that
+    iterate (get_all(), get_many() and lookups through the secondary indexes)
+    hold the same lock while they copy out their results, so they never see a
+    dict change size mid-iteration; get() is a single dict lookup and does not
+    lock.
+    """
+
+    LOCK_STRIPES = 16
+
+    def __init__(self):
+        self._locks = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
+        super().__init__()
+
+    def _lock(self, class_name: str) -> threading.RLock:
+        """Lock stripe guarding a model class"""
+        return self._locks[hash(class_name) % self.LOCK_STRIPES]
+
+    # Writes: storage and indexes updated in place under the lock
+
+    def add(self, obj: BaseModel) -> None:
+        """Add an object to the repository"""
+        self.add_many([obj])
+
+    def add_many(self, objs: Iterable[BaseModel]) -> None:
+        """Add several objects, taking each model's lock once"""
+        by_class: Dict[str, List[BaseModel]] = {}
+        for obj in objs:
+            by_class.setdefault(obj.__class__.__name__, []).append(obj)
+        for class_name, group in by_class.items():
+            with self._lock(class_name):
+                objects = self._storage.setdefault(class_name, {})
+                for obj in group:
+                    self._unindex_object(class_name, obj.id)
+                    objects[obj.id] = obj
+                    self._index_object(class_name, obj)
+
+    def update(self, obj: BaseModel) -> None:
+        """Update an existing object"""
+        class_name = obj.__class__.__name__
+        with self._lock(class_name):
+            objects = self._storage.get(class_name, {})
+            if obj.id not in objects:
+                return
+            obj.save()  # Update the updated_at timestamp
+            self._unindex_object(class_name, obj.id)
+            objects[obj.id] = obj
+            self._index_object(class_name, obj)
+
+    def delete(self, model_class: Type[BaseModel], obj_id: str) -> bool:
+        """Delete an object by its ID"""
+        return self.delete_many(model_class, [obj_id]) == 1
+
+    def delete_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs under one lock"""
+        class_name = model_class.__name__
+        with self._lock(class_name):
+            objects = self._storage.get(class_name, {})
+            doomed = [obj_id for obj_id in dict.fromkeys(obj_ids) if obj_id in objects]
+            for obj_id in doomed:
+                self._unindex_object(class_name, obj_id)
+                del objects[obj_id]
+            return len(doomed)
+
+    declare_index = _model_locked(InMemoryRepository.declare_index)
+    # Counters are read and written back under the lock so no increment is lost
+    increment = _model_locked(InMemoryRepository.increment)
+
+    # Single lookups: no lock
+
+    def get(self, model_class: Type[BaseModel], obj_id: str) -> Optional[BaseModel]:
+        """Retrieve an object by its ID"""
+        return self._storage.get(model_class.__name__, {}).get(obj_id)
+
+    # Iterating reads: hold the model's lock while the storage and indexes are consulted
+
+    get_all = _model_locked(InMemoryRepository.get_all)
+    get_many = _model_locked(InMemoryRepository.get_many)
+
+    get_by_attribute = _model_locked(InMemoryRepository.get_by_attribute)
+    count = _model_locked(InMemoryRepository.count)
+    find = _model_locked(InMemoryRepository.find)
+    find_ids = _model_locked(InMemoryRepository.find_ids)
+    count_buckets = _model_locked(InMemoryRepository.count_buckets)
+    search_text = _model_locked(InMemoryRepository.search_text)
+    search_trigrams = _model_locked(InMemoryRepository.search_trigrams)
+    find_within_bbox = _model_locked(InMemoryRepository.find_within_bbox)
@@ -0,0 +1,399 @@
+"""In-memory repository made durable by an append-only log and compacted snapshots.
+
+Both files are sequences of frames: a 4-byte little-endian length followed by
+a pickle. Log frames hold one operation each, either
+('A', class_name, (columns, links, row)) for an add or update, or
+('D', class_name, obj_id) for a delete. A snapshot starts with SNAPSHOT_MAGIC
+and holds (class_name, columns, links, rows) frames of up to SNAPSHOT_CHUNK
+rows. A row is the column values of an object followed by the related IDs of
+each many-to-many relationship named in links.
+
+Compaction moves the log aside as PREVIOUS_LOG_FILE and writes the snapshot
+on a background thread; until the new snapshot is in place, startup replays
+the previous log before the current one.
+"""
+
+import atexit
+import gc
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple, Type
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.base_model import BaseModel
+from app.persistence.compact_repository import owned_associations
+from app.persistence.repository import InMemoryRepository
+# Imported so every model is mapped before snapshots are read
+from app.models import amenity, place, place_rating, review, user  # noqa: F401
+
+SNAPSHOT_MAGIC = b'HBNBSNP1'
+SNAPSHOT_CHUNK = 10000
+_FRAME = struct.Struct('<I')
+
+
+def _frames(data, offset: int = 0, torn_tail: bool = False) -> Iterator[Tuple[int, object]]:
+    """Yield (end offset, record) for every frame of a buffer.
+
+    A short or unreadable frame raises ValueError. With torn_tail, one that
+    runs to the end of the buffer, or is followed only by zero fill, is a
+    write cut off by a crash and ends the iteration instead.
+    """
+    size = len(data)
+    with memoryview(data) as view:
+        while offset < size:
+            end = offset + _FRAME.size
+            if end <= size:
+                end += _FRAME.unpack_from(view, offset)[0]
+            try:
+                if end > size:
+                    raise ValueError("frame runs past the end of the file")
+                record = pickle.loads(view[offset + _FRAME.size:end])
+            except Exception as error:
+                if torn_tail and (end >= size or not bytes(view[end:]).strip(b'\0')):
+                    return
+                raise ValueError(f"Corrupt frame at offset {offset}: {error}") from error
+            yield end, record
+            offset = end
+
+
+def _frame(record) -> bytes:
+    """Encode one record as a length-prefixed pickle"""
+    payload = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    return _FRAME.pack(len(payload)) + payload
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make a rename inside directory durable (no-op where unsupported)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DurableInMemoryRepository(InMemoryRepository):
+    """InMemoryRepository that survives restarts.
+
+    Every add, update and delete appends the object's full column state (or
+    its deletion) to the log. The log is flushed on each write and fsynced
+    every fsync_batch records or fsync_interval seconds (a timer covers a
+    write followed by idle time), and on sync() and close(). One lock
+    serializes each write with its log record, fsyncs and log rotation, so
+    the log order matches the order the store saw. After snapshot_every log records the log starts over and the
+    store is compacted into a new snapshot on a background thread. Startup
+    memory-maps the snapshot, rebuilds objects without running model
+    __init__ validation, replays the log tail, then builds the indexes in
+    one pass.
+    """
+
+    SNAPSHOT_FILE = 'snapshot.bin'
+    LOG_FILE = 'ops.log'
+    PREVIOUS_LOG_FILE = 'ops.log.prev'
+
+    def __init__(self, directory: str, fsync_batch: int = 64, fsync_interval: float = 1.0,
+                 snapshot_every: int = 100000):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, self.LOG_FILE)
+        self._previous_log_path = os.path.join(directory, self.PREVIOUS_LOG_FILE)
+        self._classes = {mapper.class_.__name__: mapper.class_
+                         for mapper in BaseModel.registry.mappers}
+        self._layouts: Dict[str, Tuple[tuple, tuple]] = {}
+        self._managers = {}
+        self._log = None
+        self._lock = threading.RLock()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._compaction: Optional[threading.Thread] = None
+        # Last error of a background compaction; its log is kept for the next one
+        self.compaction_error: Optional[Exception] = None
+        # Every loaded object survives, so cyclic collections during the load
+        # would only rescan them
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            self.loaded_objects, self.replayed_records = self._load()
+        finally:
+            if collecting:
+                gc.enable()
+        self._log = open(self._log_path, 'ab')
+        self._log_records = self.replayed_records
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        if os.path.exists(self._previous_log_path):
+            # An interrupted compaction is finished before serving writes
+            self.snapshot()
+        atexit.register(self.close)
+
+    # Encoding
+
+    def _layout(self, class_name: str) -> Tuple[tuple, tuple]:
+        """Column names and many-to-many relationship names stored for a class"""
+        if class_name not in self._layouts:
+            model_class = self._classes[class_name]
+            columns = tuple(attr.key for attr in sa_inspect(model_class).column_attrs)
+            # The reverse side of each association is rebuilt on load
+            links = owned_associations(model_class)
+            self._layouts[class_name] = (columns, links)
+        return self._layouts[class_name]
+
+    @staticmethod
+    def _row(obj: BaseModel, columns: tuple, links: tuple) -> tuple:
+        """Column values of obj followed by the related IDs of each link"""
+        return (tuple(getattr(obj, key) for key in columns)
+                + tuple(tuple(related.id for related in getattr(obj, key)) for key in links))
+
+    def _restore(self, class_name: str, columns: tuple, row: tuple) -> BaseModel:
+        """Rebuild an object from stored column values, bypassing __init__.
+
+        Values go straight into the instance dict, as a query load does, so
+        they count as committed state without per-attribute events.
+        """
+        manager = self._managers.get(class_name)
+        if manager is None:
+            manager = self._managers[class_name] = sa_inspect(self._classes[class_name]).class_manager
+        obj = manager.new_instance()
+        obj.__dict__.update(zip(columns, row))
+        return obj
+
+    # Loading
+
+    def _load(self) -> Tuple[int, int]:
+        """Load the snapshot and replay the logs, returning (objects, log records).
+
+        Objects go straight into the storage; the indexes of each class are
+        built once everything is loaded.
+        """
+        pending_links: Dict[Tuple[str, str], dict] = {}
+
+        def restore(class_name, columns, links, row):
+            obj = self._restore(class_name, columns, row)
+            self._storage.setdefault(class_name, {})[obj.id] = obj
+            if links:
+                pending_links[(class_name, obj.id)] = dict(zip(links, row[len(columns):]))
+
+        def remove(class_name, obj_id):
+            self._storage.get(class_name, {}).pop(obj_id, None)
+            pending_links.pop((class_name, obj_id), None)
+
+        if os.path.exists(self._snapshot_path) and os.path.getsize(self._snapshot_path):
+            with open(self._snapshot_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                    raise ValueError(f"{self._snapshot_path} is not a repository snapshot")
+                for _, (class_name, columns, links, rows) in _frames(data, len(SNAPSHOT_MAGIC)):
+                    for row in rows:
+                        restore(class_name, columns, links, row)
+
+        records = sum(self._replay(path, restore, remove)
+                      for path in (self._previous_log_path, self._log_path))
+        for class_name in self._storage:
+            self._rebuild_indexes(class_name)
+
+        backrefs: Dict[Tuple[int, str], Tuple[BaseModel, list]] = {}
+        for (class_name, obj_id), links in pending_links.items():
+            obj = self._storage[class_name][obj_id]
+            mapper = sa_inspect(type(obj))
+            for key, related_ids in links.items():
+                relationship = mapper.relationships[key]
+                related_objects = self._storage.get(relationship.mapper.class_.__name__, {})
+                related = [related_objects[related_id] for related_id in related_ids
+                           if related_id in related_objects]
+                set_committed_value(obj, key, related)
+                if relationship.back_populates:
+                    for other in related:
+                        backrefs.setdefault((id(other), relationship.back_populates),
+                                            (other, []))[1].append(obj)
+        for (_, key), (other, objs) in backrefs.items():
+            set_committed_value(other, key, objs)
+        return sum(len(objects) for objects in self._storage.values()), records
+
+    def _replay(self, path: str, restore, remove) -> int:
+        """Replay one log file, dropping a torn record at its tail; returns the record count"""
+        if not os.path.exists(path) or not os.path.getsize(path):
+            return 0
+        records, good_offset = 0, 0
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for good_offset, (op, class_name, payload) in _frames(data, torn_tail=True):
+                if op == 'A':
+                    restore(class_name, *payload)
+                else:
+                    remove(class_name, payload)
+                records += 1
+        if good_offset < os.path.getsize(path):
+            # Drop a torn record left by a crash mid-write
+            with open(path, 'r+b') as f:
+                f.truncate(good_offset)
+        return records
+
+    # Logging
+
+    def _append(self, record) -> None:
+        """Append one operation to the log, fsyncing in batches"""
+        self._log.write(_frame(record))
+        self._log.flush()
+        self._unsynced += 1
+        self._log_records += 1
+        if (self._unsynced >= self.fsync_batch
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+        elif self._sync_timer is None or not self._sync_timer.is_alive():
+            # Without another write, nothing would fsync this record before close()
+            self._sync_timer = threading.Timer(self.fsync_interval, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+        if self.snapshot_every and self._log_records >= self.snapshot_every:
+            self.compact_in_background()
+
+    def _log_object(self, obj: BaseModel) -> None:
+        class_name = obj.__class__.__name__
+        columns, links = self._layout(class_name)
+        self._append(('A', class_name, (columns, links, self._row(obj, columns, links))))
+
+    def add(self, obj: BaseModel) -> None:
+        """Add an object and log it"""
+        with self._lock:
+            super().add(obj)
+            self._log_object(obj)
+
+    def update(self, obj: BaseModel) -> None:
+        """Update an existing object and log its new state"""
+        with self._lock:
+            super().update(obj)
+            if self.get(type(obj), obj.id) is obj:
+                self._log_object(obj)
+
+    def delete(self, model_class: Type[BaseModel], obj_id: str) -> bool:
+        """Delete an object and log the deletion"""
+        with self._lock:
+            deleted = super().delete(model_class, obj_id)
+            if deleted:
+                self._append(('D', model_class.__name__, obj_id))
+            return deleted
+
+    def increment(self, model_class: Type[BaseModel], obj_id: str, deltas: Dict[str, int],
+                  create: bool = False) -> Optional[Dict[str, int]]:
+        """Add deltas to counters of an object and log its new state"""
+        with self._lock:
+            return super().increment(model_class, obj_id, deltas, create)
+
+    def sync(self) -> None:
+        """fsync every logged operation"""
+        with self._lock:
+            if self._log is None or self._log.closed:
+                return
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    # Compaction
+
+    def _rotate_log(self) -> Dict[str, list]:
+        """Move the log aside, start a new one and capture the objects to snapshot.
+
+        Every later write lands in the new log as full object state, so
+        replaying it over a snapshot that already holds some of those
+        changes still gives the same store. Callers hold the lock.
+        """
+        self.sync()
+        self._log.close()
+        if os.path.exists(self._previous_log_path):
+            # An earlier compaction failed: its log stays in front of this one
+            with open(self._previous_log_path, 'ab') as previous, open(self._log_path, 'rb') as log:
+                shutil.copyfileobj(log, previous)
+                previous.flush()
+                os.fsync(previous.fileno())
+        else:
+            os.replace(self._log_path, self._previous_log_path)
+        self._log = open(self._log_path, 'wb')
+        _fsync_directory(self.directory)
+        self._log_records = 0
+        return {class_name: list(objects.values()) for class_name, objects in self._storage.items()}
+
+    def _write_snapshot(self, captured: Dict[str, list]) -> int:
+        """Write captured objects as the new snapshot and drop the previous log.
+
+        The snapshot is written to a temporary file and renamed into place, so
+        a crash leaves either the old snapshot and both logs or the new one.
+        """
+        temporary = self._snapshot_path + '.tmp'
+        count = 0
+        with open(temporary, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            for class_name, objs in captured.items():
+                columns, links = self._layout(class_name)
+                for start in range(0, len(objs), SNAPSHOT_CHUNK):
+                    rows = [self._row(obj, columns, links) for obj in objs[start:start + SNAPSHOT_CHUNK]]
+                    f.write(_frame((class_name, columns, links, rows)))
+                count += len(objs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self._snapshot_path)
+        _fsync_directory(self.directory)
+        # Replaying the previous log over the new snapshot would be harmless,
+        # so a crash before this removal loses nothing
+        os.remove(self._previous_log_path)
+        _fsync_directory(self.directory)
+        return count
+
+    def _compact(self, captured: Dict[str, list]) -> None:
+        try:
+            self._write_snapshot(captured)
+            self.compaction_error = None
+        except Exception as error:
+            self.compaction_error = error
+
+    def compact_in_background(self) -> bool:
+        """Start compacting on a background thread; False if one is still running.
+
+        The calling thread only rotates the log; building and writing the
+        snapshot happens off it.
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return False
+            captured = self._rotate_log()
+            self._compaction = threading.Thread(target=self._compact, args=(captured,),
+                                                name='repository-snapshot', daemon=True)
+            self._compaction.start()
+            return True
+
+    def wait_for_compaction(self, timeout: float = None) -> bool:
+        """Wait for a background compaction; False if it is still running"""
+        if self._compaction is not None:
+            self._compaction.join(timeout)
+            if self._compaction.is_alive():
+                return False
+            self._compaction = None
+        return True
+
+    def snapshot(self) -> int:
+        """Compact the store into a new snapshot now and restart the log; returns the object count"""
+        with self._lock:
+            self.wait_for_compaction()
+            return self._write_snapshot(self._rotate_log())
+
+    def close(self) -> None:
+        """Finish a background compaction, then fsync and close the log"""
+        self.wait_for_compaction()
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+            if self._log is not None and not self._log.closed:
+                self.sync()
+                self._log.close()
@@ -0,0 +1,123 @@
+"""Engine tuning: pool options and SQLite PRAGMAs applied to every new connection.
+
+SQLite defaults to a rollback journal, full fsync on every commit and a 2 MB
+page cache, so readers block writers and each commit is expensive. The
+'connect' hook installed here switches each connection to the configured
+SQLITE_PRAGMAS (WAL, synchronous=NORMAL, ...) before the pool hands it out.
+"""
+
+import re
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# PRAGMAs that may be configured, in the order they are applied
+SQLITE_PRAGMA_NAMES = ('journal_mode', 'synchronous', 'cache_size', 'mmap_size',
+                       'temp_store', 'busy_timeout')
+
+# Values are interpolated into the PRAGMA statement, so only words and integers pass
+_PRAGMA_VALUE = re.compile(r'^(-?\d+|[A-Za-z_]+)$')
+
+# Integer readings of enumerated PRAGMAs, reported by name
+_PRAGMA_NAMES_BY_VALUE = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+}
+
+# create_engine() options that only a QueuePool accepts
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def is_memory_sqlite(url) -> bool:
+    """Whether url is an in-memory SQLite database (served from a StaticPool)"""
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(url, options: Optional[Dict]) -> Dict:
+    """Engine options usable for url: QueuePool sizing is dropped for in-memory SQLite"""
+    options = dict(options or {})
+    if url and is_memory_sqlite(url):
+        for key in QUEUE_POOL_OPTIONS:
+            options.pop(key, None)
+    return options
+
+
+def check_pragmas(pragmas: Optional[Dict]) -> Dict:
+    """Validate configured PRAGMAs, returning them in application order"""
+    pragmas = pragmas or {}
+    unknown = set(pragmas) - set(SQLITE_PRAGMA_NAMES)
+    if unknown:
+        raise ValueError(f"Unsupported SQLite PRAGMAs: {', '.join(sorted(unknown))}")
+    checked = {}
+    for name in SQLITE_PRAGMA_NAMES:
+        value = pragmas.get(name)
+        if value is None or value == '':
+            continue
+        if not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        checked[name] = value
+    return checked
+
+
+def apply_pragmas(dbapi_connection, pragmas: Dict) -> None:
+    """Run PRAGMA name=value on a raw DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_pragmas(engine, pragmas: Optional[Dict]) -> bool:
+    """Apply pragmas to every new connection of a SQLite engine (sync or async).
+
+    Returns False, doing nothing, for other databases or when no PRAGMA is set.
+    """
+    engine = getattr(engine, 'sync_engine', engine)
+    pragmas = check_pragmas(pragmas)
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return False
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+    return True
+
+
+def _pool_settings(pool) -> Dict:
+    """Class, sizing and health-check settings of a connection pool"""
+    settings = {
+        'class': type(pool).__name__,
+        'pre_ping': pool._pre_ping,
+        'recycle': pool._recycle,
+        'status': pool.status(),
+    }
+    # Only queue pools have a size, overflow and checkout timeout
+    if hasattr(pool, 'size'):
+        settings.update(size=pool.size(), max_overflow=pool._max_overflow, timeout=pool.timeout(),
+                        checked_out=pool.checkedout(), overflow=pool.overflow())
+    return settings
+
+
+def engine_settings(engine, pragmas: Optional[Dict] = None) -> Dict:
+    """Effective pool settings and, on SQLite, configured versus effective PRAGMAs"""
+    engine = getattr(engine, 'sync_engine', engine)
+    settings = {
+        'dialect': engine.dialect.name,
+        'driver': engine.driver,
+        'url': engine.url.render_as_string(hide_password=True),
+        'pool': _pool_settings(engine.pool),
+        'pragmas': {},
+    }
+    if engine.dialect.name != 'sqlite':
+        return settings
+    configured = check_pragmas(pragmas)
+    with engine.connect() as connection:
+        for name in SQLITE_PRAGMA_NAMES:
+            value = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            value = _PRAGMA_NAMES_BY_VALUE.get(name, {}).get(value, value)
+            settings['pragmas'][name] = {'configured': configured.get(name), 'effective': value}
+    return settings
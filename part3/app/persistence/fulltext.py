@@ -0,0 +1,373 @@
+"""Full-text indexes for place and review text and for user names.
+
+InvertedIndex and TrigramIndex back the in-memory repository; the SQLite FTS5
+helpers back the SQLAlchemy repositories. Word search uses the same
+tokenization on both (lower-cased word characters with diacritics removed,
+like FTS5's unicode61 tokenizer), requires every query term to match and ranks
+with BM25. Name search uses character trigrams, like FTS5's trigram tokenizer.
+PrefixIndex serves name autocomplete from memory on every backend.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, text
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Searchable columns per model class with their BM25 weights
+FULLTEXT_FIELDS = {
+    'Place': {'name': 5.0, 'description': 1.0},
+    'Review': {'comment': 1.0},
+}
+
+# FTS5 external-content table per indexed SQL table
+FULLTEXT_TABLES = {
+    'places': 'places_fts',
+    'reviews': 'reviews_fts',
+}
+
+# Columns searchable by substring / similarity per model class, and their
+# FTS5 trigram tables
+TRIGRAM_FIELDS = {
+    'User': ('first_name', 'last_name'),
+}
+TRIGRAM_TABLES = {
+    'users': 'users_name_trgm',
+}
+
+# Minimum trigram similarity of a fuzzy (non-substring) name match
+TRIGRAM_THRESHOLD = 0.3
+
+SNIPPET_OPEN = '<mark>'
+SNIPPET_CLOSE = '</mark>'
+SNIPPET_TOKENS = 12
+
+
+def normalize(word: str) -> str:
+    """Lower-case a word and strip its diacritics"""
+    if word.isascii():
+        return word.lower()
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Split text into normalized word tokens"""
+    return [normalize(match.group()) for match in _TOKEN_RE.finditer(value or '')]
+
+
+def fts5_query(query: str) -> str:
+    """Build an FTS5 MATCH expression requiring every term of a free-text query.
+
+    Each term is quoted, so user input can never use FTS5 operators.
+    """
+    return ' '.join(f'"{term}"' for term in tokenize(query))
+
+
+def fts5_phrase(value: str) -> str:
+    """Quote a string as a single FTS5 phrase"""
+    return '"' + value.replace('"', '""') + '"'
+
+
+def trigrams(value: Optional[str]) -> set:
+    """Case-folded three-character substrings of value"""
+    folded = (value or '').casefold()
+    return {folded[position:position + 3] for position in range(len(folded) - 2)}
+
+
+def word_trigrams(value: Optional[str]) -> set:
+    """Trigrams of each word padded with spaces (as in pg_trgm), used for similarity"""
+    grams = set()
+    for word in tokenize(value):
+        padded = f'  {word} '
+        grams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(first: set, second: set) -> float:
+    """Share of trigrams two strings have in common (Jaccard index)"""
+    if not first or not second:
+        return 0.0
+    shared = len(first & second)
+    return shared / (len(first) + len(second) - shared)
+
+
+def snippet(value: Optional[str], terms: Iterable[str], size: int = SNIPPET_TOKENS) -> Optional[str]:
+    """Excerpt of about size words around the first matching term, matches highlighted"""
+    terms = set(terms)
+    matches = list(_TOKEN_RE.finditer(value or ''))
+    hits = [position for position, match in enumerate(matches) if normalize(match.group()) in terms]
+    if not hits:
+        return None
+    first = max(0, min(hits[0] - size // 3, len(matches) - size))
+    last = min(len(matches), first + size)
+    pieces, cursor = [], matches[first].start()
+    for match in matches[first:last]:
+        pieces.append(value[cursor:match.start()])
+        word = match.group()
+        pieces.append(f'{SNIPPET_OPEN}{word}{SNIPPET_CLOSE}' if normalize(word) in terms else word)
+        cursor = match.end()
+    excerpt = ''.join(pieces)
+    return ('…' if first > 0 else '') + excerpt + ('…' if last < len(matches) else '')
+
+
+class InvertedIndex:
+    """Term -> postings index over weighted text fields, ranked with BM25"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._documents: Dict[str, Dict[str, float]] = {}
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def insert(self, key: str, fields: Dict[str, Optional[str]]) -> None:
+        """Index (or re-index) a document from its field values"""
+        self.remove(key)
+        frequencies: Dict[str, float] = {}
+        for field, weight in self.weights.items():
+            for term in tokenize(fields.get(field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        if not frequencies:
+            return
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[key] = frequency
+        self._documents[key] = frequencies
+        self._lengths[key] = sum(frequencies.values())
+        self._total_length += self._lengths[key]
+
+    def remove(self, key: str) -> None:
+        """Drop a document if present"""
+        frequencies = self._documents.pop(key, None)
+        if frequencies is None:
+            return
+        for term in frequencies:
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+
+    def search(self, query: str, limit: int = None) -> List[Tuple[str, float]]:
+        """(key, score) pairs of documents containing every query term, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or any(term not in self._postings for term in terms):
+            return []
+        postings = sorted((self._postings[term] for term in terms), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+
+        count = len(self._documents)
+        average_length = self._total_length / count
+        scores = []
+        for key in candidates:
+            length_norm = self.K1 * (1 - self.B + self.B * self._lengths[key] / average_length)
+            score = 0.0
+            for term_postings in postings:
+                frequency = term_postings[key]
+                idf = math.log(1 + (count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+                score += idf * frequency * (self.K1 + 1) / (frequency + length_norm)
+            scores.append((key, score))
+        scores.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scores[:limit] if limit else scores
+
+
+class TrigramIndex:
+    """Trigram -> keys index for substring and similarity search over short strings"""
+
+    def __init__(self):
+        self._postings: Dict[str, set] = {}
+        self._trigrams: Dict[str, set] = {}
+
+    def __len__(self):
+        return len(self._trigrams)
+
+    def insert(self, key: str, values: Iterable[Optional[str]]) -> None:
+        """Index (or re-index) the trigrams of each value under key"""
+        self.remove(key)
+        grams = set()
+        for value in values:
+            grams |= trigrams(value)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+        self._trigrams[key] = grams
+
+    def remove(self, key: str) -> None:
+        """Drop a key if present"""
+        for gram in self._trigrams.pop(key, ()):
+            postings = self._postings[gram]
+            postings.discard(key)
+            if not postings:
+                del self._postings[gram]
+
+    def candidates(self, grams: Iterable[str]) -> Dict[str, int]:
+        """Keys sharing at least one of the trigrams, with the number shared"""
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+        return shared
+
+
+class PrefixIndex:
+    """Sorted array of normalized name suffixes for type-ahead prefix lookups.
+
+    Each name is stored once per word it contains ("seaside villa", "villa"),
+    so a prefix matches the start of any word. Matches are ranked by a weight
+    such as popularity.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str]] = []
+        self._suffixes: Dict[str, List[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._weights: Dict[str, float] = {}
+
+    def __len__(self):
+        return len(self._names)
+
+    def insert(self, key: str, name: Optional[str], weight: float = None) -> None:
+        """Index (or rename) key; its previous weight is kept unless weight is given"""
+        previous = self._weights.get(key, 0)
+        self.remove(key)
+        suffixes = self._word_suffixes(name)
+        for suffix in suffixes:
+            insort(self._entries, (suffix, key))
+        self._suffixes[key] = suffixes
+        self._names[key] = name
+        self._weights[key] = previous if weight is None else weight
+
+    def load(self, items: Iterable[Tuple[str, Optional[str], float]]) -> None:
+        """Replace the contents with (key, name, weight) triples, sorting once.
+
+        insert() keeps the array sorted one entry at a time, which is fine
+        for single writes but quadratic for a full build.
+        """
+        self.clear()
+        for key, name, weight in items:
+            self._suffixes[key] = self._word_suffixes(name)
+            self._names[key] = name
+            self._weights[key] = weight or 0
+        self._entries = sorted((suffix, key) for key, suffixes in self._suffixes.items()
+                               for suffix in suffixes)
+
+    @staticmethod
+    def _word_suffixes(name: Optional[str]) -> List[str]:
+        """Normalized name suffixes starting at each word, without duplicates"""
+        words = tokenize(name)
+        return list(dict.fromkeys(' '.join(words[start:]) for start in range(len(words))))
+
+    def remove(self, key: str) -> None:
+        """Drop key if present"""
+        for suffix in self._suffixes.pop(key, ()):
+            position = bisect_left(self._entries, (suffix, key))
+            if position < len(self._entries) and self._entries[position] == (suffix, key):
+                del self._entries[position]
+        self._names.pop(key, None)
+        self._weights.pop(key, None)
+
+    def weight(self, key: str) -> float:
+        """Ranking weight of key, 0 when it is not indexed"""
+        return self._weights.get(key, 0)
+
+    def set_weight(self, key: str, weight: float) -> None:
+        """Change the ranking weight of an indexed key"""
+        if key in self._names:
+            self._weights[key] = weight
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self.__init__()
+
+    def search(self, prefix: str, limit: int = 10, weight=None) -> List[Tuple[str, str]]:
+        """Top (key, name) pairs whose words start with prefix, heaviest first.
+
+        weight optionally maps a key to its weight instead of the stored one.
+        """
+        needle = ' '.join(tokenize(prefix))
+        if not needle:
+            return []
+        start = bisect_left(self._entries, (needle,))
+        end = bisect_left(self._entries, (needle + '\U0010ffff',), start)
+        keys = {self._entries[position][1] for position in range(start, end)}
+        weight = weight or self.weight
+        best = heapq.nsmallest(limit, keys, key=lambda key: (-weight(key),
+                                                              self._names[key].casefold(), key))
+        return [(key, self._names[key]) for key in best]
+
+
+def fulltext_ddl(table: str, columns: Iterable[str], fts: str = None,
+                 tokenizer: str = None) -> List[str]:
+    """FTS5 external-content table over table.rowid plus the triggers keeping it in sync"""
+    fts = fts or FULLTEXT_TABLES[table]
+    columns = list(columns)
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+                  f"VALUES ('delete', old.rowid, {old_values});")
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values});"
+    options = f", tokenize='{tokenizer}'" if tokenizer else ''
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table}', content_rowid='rowid'{options})",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"{insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"{delete_old} {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"{delete_old} END",
+    ]
+
+
+def install_fulltext(connection, table: str, columns: Iterable[str], fts: str = None,
+                     tokenizer: str = None) -> None:
+    """Create the FTS5 table and triggers of table and rebuild it from its rows.
+
+    Like the place R*Tree the index is keyed by rowid, so run this again after
+    a VACUUM.
+    """
+    for statement in fulltext_ddl(table, columns, fts, tokenizer):
+        connection.execute(text(statement))
+    fts = fts or FULLTEXT_TABLES[table]
+    connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def fulltext_supported(connection, tokenizer: str = None) -> bool:
+    """Check for SQLite, and for 3.34+ when the trigram tokenizer is needed"""
+    if connection.dialect.name != 'sqlite':
+        return False
+    return tokenizer != 'trigram' or connection.dialect.server_version_info >= (3, 34)
+
+
+def has_fulltext(connection, table: str, fts: str = None) -> bool:
+    """Check whether the FTS5 table of table exists on this database"""
+    return connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {'name': fts or FULLTEXT_TABLES[table]}).first() is not None
+
+
+def register_fulltext(sql_table, columns: Iterable[str], fts: str = None,
+                      tokenizer: str = None) -> None:
+    """Create/drop the FTS5 table together with sql_table on SQLite"""
+    columns = list(columns)
+    fts = fts or FULLTEXT_TABLES[sql_table.name]
+
+    @event.listens_for(sql_table, 'after_create')
+    def create_fulltext(target, connection, **kw):
+        if fulltext_supported(connection, tokenizer):
+            install_fulltext(connection, target.name, columns, fts, tokenizer)
+
+    @event.listens_for(sql_table, 'before_drop')
+    def drop_fulltext(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
@@ -0,0 +1,239 @@
+"""Ordered secondary indexes for the in-memory repository"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Sorts after any object id, used to make range upper bounds inclusive
+_HIGHEST_ID = '\U0010ffff'
+
+
+class SortedIndex:
+    """Sorted (value, id) pairs supporting bisect range scans"""
+
+    def __init__(self):
+        self._entries: List[Tuple[Any, str]] = []
+        self._values: Dict[str, Any] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def insert(self, key: str, value: Any) -> None:
+        """Insert or move an id (None values are not indexed)"""
+        self.remove(key)
+        if value is None:
+            return
+        insort(self._entries, (value, key))
+        self._values[key] = value
+
+    def load(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Replace the contents with (id, value) pairs, sorting once.
+
+        insert() keeps the entries sorted one at a time, which is fine for
+        single writes but quadratic for a full build.
+        """
+        self._values = {key: value for key, value in items if value is not None}
+        self._entries = sorted((value, key) for key, value in self._values.items())
+
+    def remove(self, key: str) -> None:
+        """Remove an id if present"""
+        if key not in self._values:
+            return
+        entry = (self._values.pop(key), key)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def _bounds(self, low: Optional[Any], high: Optional[Any]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        end = len(self._entries) if high is None else bisect_right(self._entries, (high, _HIGHEST_ID))
+        return start, max(start, end)
+
+    def range(self, low: Optional[Any] = None, high: Optional[Any] = None,
+              descending: bool = False) -> Iterator[str]:
+        """Yield ids whose value lies in [low, high] (open ends when None), in order"""
+        start, end = self._bounds(low, high)
+        positions = range(end - 1, start - 1, -1) if descending else range(start, end)
+        for position in positions:
+            yield self._entries[position][1]
+
+    def after(self, value: Any = None, key: str = None) -> Iterator[str]:
+        """Yield ids ordered by (value, id) strictly after (value, key), or all of them"""
+        start = 0 if value is None else bisect_right(self._entries, (value, key))
+        for position in range(start, len(self._entries)):
+            yield self._entries[position][1]
+
+    def count(self, low: Optional[Any] = None, high: Optional[Any] = None) -> int:
+        """Number of ids whose value lies in [low, high]"""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def histogram(self, edges, keys=None) -> List[int]:
+        """Count ids per bucket [edges[i], edges[i + 1]), the last one open-ended.
+
+        Without keys the counts come from bisecting the whole index, otherwise
+        only the given ids are counted.
+        """
+        if keys is None:
+            positions = [bisect_left(self._entries, (edge,)) for edge in edges]
+            positions.append(len(self._entries))
+            return [positions[i + 1] - positions[i] for i in range(len(edges))]
+        counts = [0] * len(edges)
+        for key in keys:
+            value = self._values.get(key)
+            if value is None:
+                continue
+            position = bisect_right(edges, value) - 1
+            if position >= 0:
+                counts[position] += 1
+        return counts
+
+
+class BitmapIndex:
+    """Per-value bitmaps over dense object ordinals, stored as Python ints.
+
+    Objects get a small integer ordinal on first use (freed ordinals are
+    reused), so AND/OR filters across values are single bitwise operations.
+    Setting one bit copies the whole int, so bulk builds go through load()
+    and bitmap_of(), which pack the bits into a bytearray first.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._bitmaps: Dict[Any, int] = {}
+        self._values: Dict[str, set] = {}
+        # (bitmap, its little-endian bytes) of the last contains() call
+        self._unpacked: Tuple[int, bytes] = (0, b'')
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def _ordinal(self, key: str) -> int:
+        ordinal = self._ordinals.get(key)
+        if ordinal is None:
+            if self._free:
+                ordinal = self._free.pop()
+                self._keys[ordinal] = key
+            else:
+                ordinal = len(self._keys)
+                self._keys.append(key)
+            self._ordinals[key] = ordinal
+            self._values[key] = set()
+        return ordinal
+
+    @staticmethod
+    def _pack(ordinals: Iterable[int]) -> int:
+        """Bitmap with the given ordinals set, built in one pass"""
+        ordinals = list(ordinals)
+        if not ordinals:
+            return 0
+        data = bytearray((max(ordinals) >> 3) + 1)
+        for ordinal in ordinals:
+            data[ordinal >> 3] |= 1 << (ordinal & 7)
+        return int.from_bytes(data, 'little')
+
+    def load(self, pairs: Iterable[Tuple[str, Any]]) -> None:
+        """Replace the contents with (key, value) pairs, building each bitmap once"""
+        self.clear()
+        keys, key_ordinals, key_values = self._keys, self._ordinals, self._values
+        ordinals: Dict[Any, List[int]] = {}
+        for key, value in pairs:
+            ordinal = key_ordinals.get(key)
+            if ordinal is None:
+                ordinal = key_ordinals[key] = len(keys)
+                keys.append(key)
+                key_values[key] = set()
+            ordinals.setdefault(value, []).append(ordinal)
+            key_values[key].add(value)
+        self._bitmaps = {value: self._pack(bits) for value, bits in ordinals.items()}
+
+    def add(self, key: str, value: Any) -> None:
+        """Set the bit of key in the bitmap of value"""
+        ordinal = self._ordinal(key)
+        self._bitmaps[value] = self._bitmaps.get(value, 0) | (1 << ordinal)
+        self._values[key].add(value)
+
+    def discard(self, key: str, value: Any) -> None:
+        """Clear the bit of key in the bitmap of value"""
+        if value not in self._values.get(key, ()):
+            return
+        self._bitmaps[value] &= ~(1 << self._ordinals[key])
+        self._values[key].discard(value)
+
+    def set(self, key: str, values) -> None:
+        """Replace the values of key"""
+        values = set(values)
+        for value in self._values.get(key, set()) - values:
+            self.discard(key, value)
+        for value in values:
+            self.add(key, value)
+
+    def remove(self, key: str) -> None:
+        """Forget key and free its ordinal"""
+        if key not in self._ordinals:
+            return
+        for value in list(self._values[key]):
+            self.discard(key, value)
+        ordinal = self._ordinals.pop(key)
+        del self._values[key]
+        self._keys[ordinal] = None
+        self._free.append(ordinal)
+
+    def clear(self) -> None:
+        """Drop every bitmap and ordinal"""
+        self.__init__()
+
+    def values(self) -> List[Any]:
+        """Values that have a bitmap"""
+        return list(self._bitmaps)
+
+    def bitmap(self, values, match_all: bool = True) -> int:
+        """Bitmap of keys having all (AND) or any (OR) of the values"""
+        result = None
+        for value in values:
+            bits = self._bitmaps.get(value, 0)
+            if result is None:
+                result = bits
+            else:
+                result = result & bits if match_all else result | bits
+        return result or 0
+
+    def keys(self, bitmap: int) -> Iterator[str]:
+        """Yield the keys whose bits are set in bitmap"""
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield self._keys[byte_index * 8 + low.bit_length() - 1]
+                byte ^= low
+
+    def match(self, values, match_all: bool = True) -> List[str]:
+        """Keys having all (AND) or any (OR) of the values"""
+        return list(self.keys(self.bitmap(values, match_all)))
+
+    def bitmap_of(self, keys) -> int:
+        """Bitmap with the bits of the given keys set"""
+        ordinals = self._ordinals
+        return self._pack(ordinals[key] for key in keys if key in ordinals)
+
+    def contains(self, bitmap: int, key: str) -> bool:
+        """Check whether key's bit is set in bitmap.
+
+        The bitmap is unpacked to bytes once and reused while the same bitmap
+        is tested key after key, so each test reads one byte.
+        """
+        ordinal = self._ordinals.get(key)
+        if ordinal is None:
+            return False
+        unpacked = self._unpacked
+        if unpacked[0] is not bitmap:
+            unpacked = self._unpacked = (bitmap, bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little'))
+        data = unpacked[1]
+        index = ordinal >> 3
+        return index < len(data) and bool(data[index] >> (ordinal & 7) & 1)
+
+    def count(self, value: Any, bitmap: int = None) -> int:
+        """Number of keys having value, optionally restricted to bitmap"""
+        bits = self._bitmaps.get(value, 0)
+        return bin(bits if bitmap is None else bits & bitmap).count('1')
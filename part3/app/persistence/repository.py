@@ -1,9 +1,84 @@
-from typing import Dict, List, Optional, Type
+from bisect import bisect_right
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
 from abc import ABC, abstractmethod
 from app.models.base_model import BaseModel
+from app.persistence.fulltext import (FULLTEXT_FIELDS, TRIGRAM_FIELDS, TRIGRAM_THRESHOLD,
+                                      InvertedIndex, TrigramIndex, snippet, tokenize,
+                                      trigram_similarity, trigrams, word_trigrams)
+from app.persistence.indexes import SortedIndex
+from app.persistence.spatial import GridIndex
+
+
+def matches(obj: BaseModel, equals: Dict[str, object],
+            ranges: Dict[str, Tuple[object, object]]) -> bool:
+    """Check an object against equality filters and inclusive (min, max) ranges"""
+    for key, value in equals.items():
+        if getattr(obj, key, None) != value:
+            return False
+    for key, (low, high) in ranges.items():
+        value = getattr(obj, key, None)
+        if value is None or (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+def after_cursor(obj: BaseModel, after: Optional[Tuple]) -> bool:
+    """Check whether obj sorts after a (created_at, id) keyset cursor"""
+    return after is None or (obj.created_at, obj.id) > tuple(after)
+
+
+def rank_trigram_matches(objs: Iterable[BaseModel], query: str,
+                         threshold: float = TRIGRAM_THRESHOLD) -> List[Tuple[BaseModel, float]]:
+    """Rank objects against a name query by their TRIGRAM_FIELDS.
+
+    Objects containing the query as a substring score 1 + similarity and come
+    first; the others are kept when their trigram similarity (the best of the
+    whole name and each field) reaches threshold.
+    """
+    needle = query.strip().casefold()
+    needle_trigrams = word_trigrams(needle)
+    ranked = []
+    for obj in objs:
+        values = [getattr(obj, field) for field in TRIGRAM_FIELDS[type(obj).__name__]]
+        score = trigram_match_score(values, needle, needle_trigrams, threshold)
+        if score is not None:
+            ranked.append((obj, score))
+    ranked.sort(key=lambda pair: (-pair[1], pair[0].id))
+    return ranked
+
+
+def trigram_match_score(values: Iterable[Optional[str]], needle: str, needle_trigrams: set,
+                        threshold: float = TRIGRAM_THRESHOLD) -> Optional[float]:
+    """Score of name field values against a casefolded needle, None when they do not match.
+
+    1 + similarity for a substring match of the joined values, otherwise
+    the similarity when it reaches threshold.
+    """
+    values = [value or '' for value in values]
+    name = ' '.join(values).casefold()
+    similarity = max(trigram_similarity(needle_trigrams, word_trigrams(value))
+                     for value in values + [name])
+    if needle in name:
+        return 1.0 + similarity
+    return similarity if similarity >= threshold else None
+
+
+def text_snippet(obj: BaseModel, query: str) -> Optional[str]:
+    """Highlighted excerpt of the first searchable field of obj matching query"""
+    terms = set(tokenize(query))
+    fields = FULLTEXT_FIELDS.get(type(obj).__name__, {})
+    for field in sorted(fields, key=fields.get, reverse=True):
+        excerpt = snippet(getattr(obj, field, None), terms)
+        if excerpt:
+            return excerpt
+    return None
 
 class Repository(ABC):
     """Abstract base class for repository implementations"""
+
+    # Whether get_all_eager() populates relationship attributes on the results
+    loads_relationships = False
     
     @abstractmethod
     def add(self, obj: BaseModel) -> None:
@@ -35,18 +110,435 @@ class Repository(ABC):
         """Get objects by attribute values"""
         pass
 
+    @abstractmethod
+    def add_many(self, objs: Iterable[BaseModel]) -> None:
+        """Add several objects in a single operation"""
+        pass
+
+    @abstractmethod
+    def get_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> List[BaseModel]:
+        """Retrieve the objects matching the given IDs, in request order"""
+        pass
+
+    @abstractmethod
+    def delete_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs and return how many were deleted"""
+        pass
+
+    def iter_all(self, model_class: Type[BaseModel], chunk_size: int = 1000) -> Iterator[BaseModel]:
+        """Yield every object in (created_at, id) order, fetching chunk_size at a time.
+
+        Each chunk resumes from a keyset cursor, so objects added or removed
+        while iterating neither repeat nor shift the rest.
+        """
+        after = None
+        while True:
+            chunk = self.find(model_class, limit=chunk_size, after=after)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after = (chunk[-1].created_at, chunk[-1].id)
+
+    def count(self, model_class: Type[BaseModel], **kwargs) -> int:
+        """Number of objects, optionally only those with the given attribute values"""
+        if not kwargs:
+            return len(self.get_all(model_class))
+        return len(self.get_by_attribute(model_class, **kwargs))
+
+    def exists(self, model_class: Type[BaseModel], **kwargs) -> bool:
+        """Check whether an object with the given attribute values exists"""
+        return bool(self.get_by_attribute(model_class, **kwargs))
+
+    def unit_of_work(self):
+        """Group several writes into a single transaction (no-op by default)"""
+        return nullcontext()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the current transaction commits (right away by default)"""
+        callback()
+
+    def detached_copy(self, obj: BaseModel) -> BaseModel:
+        """Return a version of obj that is safe to keep across requests"""
+        return obj
+
+    def attach(self, obj: BaseModel) -> BaseModel:
+        """Return a version of a detached_copy() usable in the current request"""
+        return obj
+
+    def find(self, model_class: Type[BaseModel], equals: Dict[str, object] = None,
+             ranges: Dict[str, Tuple[object, object]] = None, order_by: str = None,
+             descending: bool = False, limit: int = None,
+             ids: Optional[set] = None, after: Optional[Tuple] = None,
+             related: Optional[Tuple[str, Iterable[str], bool]] = None) -> List[BaseModel]:
+        """Get objects matching equality filters and inclusive (min, max) ranges.
+
+        A None bound leaves that side of the range open. ids, when given,
+        restricts the results to those object IDs, and related, a
+        (relationship, related IDs, match_all) triple, to objects linked to
+        all (or any) of those related objects. Results are sorted by
+        order_by when given, otherwise by (created_at, id), and truncated to
+        limit. after is a (created_at, id) keyset cursor: only objects sorting
+        after it are returned, and it cannot be combined with order_by.
+        """
+        if after is not None and order_by:
+            raise ValueError("A keyset cursor requires the default (created_at, id) order")
+        ids = self._restrict_ids(model_class, ids, related)
+        equals, ranges = equals or {}, ranges or {}
+        results = [obj for obj in self.get_all(model_class) if matches(obj, equals, ranges)
+                   and (ids is None or obj.id in ids) and after_cursor(obj, after)]
+        if order_by:
+            results.sort(key=lambda obj: getattr(obj, order_by), reverse=descending)
+        else:
+            results.sort(key=lambda obj: (obj.created_at, obj.id))
+        return results[:limit] if limit else results
+
+    def find_ids(self, model_class: Type[BaseModel], equals: Dict[str, object] = None,
+                 ranges: Dict[str, Tuple[object, object]] = None,
+                 ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> set:
+        """IDs of the objects matching find() filters"""
+        return {obj.id for obj in self.find(model_class, equals, ranges, ids=ids, related=related)}
+
+    def count_matching(self, model_class: Type[BaseModel], equals: Dict[str, object] = None,
+                       ranges: Dict[str, Tuple[object, object]] = None,
+                       ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> int:
+        """Number of objects matching find() filters"""
+        return len(self.find_ids(model_class, equals, ranges, ids, related))
+
+    def related_ids(self, model_class: Type[BaseModel], relationship: str,
+                    related_ids: Iterable[str], match_all: bool = True) -> set:
+        """IDs of objects linked to all (or any) of related_ids through a many-to-many relationship"""
+        wanted = set(related_ids)
+        result = set()
+        for obj in self.get_all(model_class):
+            linked = {other.id for other in getattr(obj, relationship)}
+            if (wanted <= linked) if match_all else (wanted & linked):
+                result.add(obj.id)
+        return result
+
+    def _restrict_ids(self, model_class: Type[BaseModel], ids: Optional[set],
+                      related: Optional[Tuple[str, Iterable[str], bool]]) -> Optional[set]:
+        """Fold a find() related criterion into its ID filter"""
+        if related is None:
+            return ids
+        matching = self.related_ids(model_class, *related)
+        return matching if ids is None else set(ids) & matching
+
+    def count_buckets(self, model_class: Type[BaseModel], attr: str, edges: Tuple,
+                      equals: Dict[str, object] = None,
+                      ranges: Dict[str, Tuple[object, object]] = None,
+                      ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> List[int]:
+        """Count filtered objects per bucket of attr.
+
+        Bucket i holds values in [edges[i], edges[i + 1]), the last bucket is
+        open-ended and values below edges[0] are not counted.
+        """
+        counts = [0] * len(edges)
+        for obj in self.find(model_class, equals, ranges, ids=ids, related=related):
+            position = bisect_right(edges, getattr(obj, attr)) - 1
+            if position >= 0:
+                counts[position] += 1
+        return counts
+
+    def count_related(self, model_class: Type[BaseModel], relationship: str,
+                      equals: Dict[str, object] = None,
+                      ranges: Dict[str, Tuple[object, object]] = None,
+                      ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> Dict[str, int]:
+        """Count filtered objects per related object ID of a many-to-many relationship"""
+        counts: Dict[str, int] = {}
+        for obj in self.find(model_class, equals, ranges, ids=ids, related=related):
+            for related in getattr(obj, relationship):
+                counts[related.id] = counts.get(related.id, 0) + 1
+        return counts
+
+    def search_text(self, model_class: Type[BaseModel], query: str, limit: int = None,
+                    snippets: bool = False) -> List[Tuple[BaseModel, float, Optional[str]]]:
+        """Full-text search over the FULLTEXT_FIELDS of a class.
+
+        Returns (object, score, snippet) triples, best match first; every query
+        term must match and snippet is None unless snippets is set. This
+        fallback indexes every object on each call.
+        """
+        index = InvertedIndex(FULLTEXT_FIELDS.get(model_class.__name__, {}))
+        objects = {}
+        for obj in self.get_all(model_class):
+            objects[obj.id] = obj
+            index.insert(obj.id, {field: getattr(obj, field) for field in index.weights})
+        return [(objects[key], score, text_snippet(objects[key], query) if snippets else None)
+                for key, score in index.search(query, limit)]
+
+    def search_text_with_children(self, model_class: Type[BaseModel], query: str,
+                                  child_class: Type[BaseModel], parent_attr: str,
+                                  child_weight: float, limit: int = None, snippets: bool = False,
+                                  ids: Optional[set] = None,
+                                  related: Optional[Tuple[str, Iterable[str], bool]] = None
+                                  ) -> List[Tuple[BaseModel, float, Optional[str]]]:
+        """Full-text search in which a matching child (e.g. a review) also makes its parent match.
+
+        A parent scores its own match plus child_weight times the score of its
+        best matching child, whose parent ID is in parent_attr. ids and related
+        restrict the parents as in find(). Returns (object, score, snippet)
+        triples like search_text(); the snippet is the parent's own excerpt,
+        or its best child's when only a child matched.
+        """
+        ids = self._restrict_ids(model_class, ids, related)
+        results = {}
+        for obj, score, _ in self.search_text(model_class, query):
+            if ids is None or obj.id in ids:
+                results[obj.id] = [obj, score, obj]
+        best_children = {}
+        for child, score, _ in self.search_text(child_class, query):
+            parent_id = getattr(child, parent_attr)
+            if (ids is None or parent_id in ids) and \
+                    (parent_id not in best_children or score > best_children[parent_id][0]):
+                best_children[parent_id] = (score, child)
+        missing = [parent_id for parent_id in best_children if parent_id not in results]
+        for obj in self.get_many(model_class, missing):
+            results[obj.id] = [obj, 0.0, None]
+        for parent_id, (score, child) in best_children.items():
+            if parent_id in results:
+                results[parent_id][1] += child_weight * score
+                results[parent_id][2] = results[parent_id][2] or child
+
+        ranked = sorted(results.values(), key=lambda entry: (-entry[1], entry[0].id))
+        if limit:
+            ranked = ranked[:limit]
+        # Snippets only for the returned results
+        return [(obj, score, text_snippet(source, query) if snippets else None)
+                for obj, score, source in ranked]
+
+    def search_trigrams(self, model_class: Type[BaseModel],
+                        query: str) -> List[Tuple[BaseModel, float]]:
+        """Substring and fuzzy search over the TRIGRAM_FIELDS of a class.
+
+        Returns (object, score) pairs ranked by rank_trigram_matches(). This
+        fallback scores every object.
+        """
+        return rank_trigram_matches(self.get_all(model_class), query)
+
+    def search_trigrams_page(self, model_class: Type[BaseModel], query: str, offset: int = 0,
+                             limit: int = None) -> Tuple[List[Tuple[BaseModel, float]], int]:
+        """One slice of search_trigrams() results and the total number of matches"""
+        matches = self.search_trigrams(model_class, query)
+        return matches[offset:offset + limit if limit else None], len(matches)
+
+    def find_within_bbox(self, model_class: Type[BaseModel], min_lat: float, min_lon: float,
+                         max_lat: float, max_lon: float) -> List[BaseModel]:
+        """Get objects whose latitude/longitude fall inside a bounding box"""
+        return [obj for obj in self.get_all(model_class)
+                if min_lat <= obj.latitude <= max_lat and min_lon <= obj.longitude <= max_lon]
+
+    def get_relationship_pairs(self, model_class: Type[BaseModel],
+                               relationship: str) -> List[Tuple[str, str]]:
+        """Get (object id, related id) pairs of a many-to-many relationship"""
+        return [(obj.id, related.id) for obj in self.get_all(model_class)
+                for related in getattr(obj, relationship)]
+
+    def get_values(self, model_class: Type[BaseModel], *attrs: str) -> List[Tuple]:
+        """Get (id, *attrs) tuples for every object without loading relationships"""
+        return [(obj.id,) + tuple(getattr(obj, attr) for attr in attrs)
+                for obj in self.get_all(model_class)]
+
+    def count_grouped(self, model_class: Type[BaseModel], *attrs: str) -> Dict[Tuple, int]:
+        """Count objects per distinct combination of attrs values"""
+        counts: Dict[Tuple, int] = {}
+        for row in self.get_values(model_class, *attrs):
+            counts[row[1:]] = counts.get(row[1:], 0) + 1
+        return counts
+
+    def increment(self, model_class: Type[BaseModel], obj_id: str, deltas: Dict[str, int],
+                  create: bool = False) -> Optional[Dict[str, int]]:
+        """Add deltas to integer attributes of an object and return their new values.
+
+        With create, a missing object is first added as model_class(obj_id);
+        otherwise None is returned for it.
+        """
+        obj = self.get(model_class, obj_id)
+        if obj is None:
+            if not create:
+                return None
+            obj = model_class(obj_id)
+            self.add(obj)
+        for attr, delta in deltas.items():
+            setattr(obj, attr, (getattr(obj, attr) or 0) + delta)
+        self.update(obj)
+        return {attr: getattr(obj, attr) for attr in deltas}
+
+    def get_all_eager(self, model_class: Type[BaseModel], relationships: Iterable[str],
+                      obj_ids: Optional[Iterable[str]] = None) -> List[BaseModel]:
+        """Retrieve objects (all, or the given IDs) with relationships preloaded.
+
+        Backends that cannot preload relationships return the plain objects and
+        leave loads_relationships set to False.
+        """
+        if obj_ids is None:
+            return self.get_all(model_class)
+        return self.get_many(model_class, obj_ids)
+
 class InMemoryRepository(Repository):
     """In-memory repository for storing objects"""
 
+    # Secondary indexes declared by default, keyed by model class name.
+    # Each entry is a tuple of attribute names (single-column or composite).
+    DEFAULT_INDEXES = {
+        'User': [('email',)],
+        'Amenity': [('name',)],
+        'Review': [('place_id',), ('user_id',), ('place_id', 'user_id')],
+        'Place': [('host_id',), ('city_id',)],
+    }
+
+    # Sorted indexes used for range filters and ordering, keyed by class name
+    SORTED_INDEXES = {
+        'Place': ('price_per_night', 'max_guests', 'number_of_rooms'),
+    }
+
+    # Grid indexes over (latitude, longitude) attributes, keyed by class name
+    SPATIAL_INDEXES = {
+        'Place': ('latitude', 'longitude'),
+    }
+
     def __init__(self):
         self._storage: Dict[str, Dict[str, BaseModel]] = {}
+        # class name -> attribute tuple -> key tuple -> {obj_id: None}
+        self._indexes: Dict[str, Dict[Tuple[str, ...], Dict[tuple, Dict[str, None]]]] = {}
+        # class name -> obj_id -> attribute tuple -> key tuple currently indexed
+        self._index_keys: Dict[str, Dict[str, Dict[Tuple[str, ...], tuple]]] = {}
+        for class_name, attr_sets in self.DEFAULT_INDEXES.items():
+            for attrs in attr_sets:
+                self._declare_index(class_name, attrs)
+        self._spatial: Dict[str, GridIndex] = {
+            class_name: GridIndex() for class_name in self.SPATIAL_INDEXES
+        }
+        self._sorted: Dict[str, Dict[str, SortedIndex]] = {
+            class_name: {attr: SortedIndex() for attr in attrs}
+            for class_name, attrs in self.SORTED_INDEXES.items()
+        }
+        self._fulltext: Dict[str, InvertedIndex] = {
+            class_name: InvertedIndex(weights) for class_name, weights in FULLTEXT_FIELDS.items()
+        }
+        self._trigrams: Dict[str, TrigramIndex] = {
+            class_name: TrigramIndex() for class_name in TRIGRAM_FIELDS
+        }
+        # (created_at, id) order of every class, for keyset pagination
+        self._created: Dict[str, SortedIndex] = {}
+
+    def declare_index(self, model_class: Type[BaseModel], *attrs: str) -> None:
+        """Declare a secondary hash index on one or more attributes"""
+        if not attrs:
+            raise ValueError("At least one attribute is required for an index")
+        self._declare_index(model_class.__name__, tuple(attrs))
+
+    def _declare_index(self, class_name: str, attrs: Tuple[str, ...]) -> None:
+        """Create an index and populate it from the objects already stored"""
+        indexes = self._indexes.setdefault(class_name, {})
+        if attrs in indexes:
+            return
+        indexes[attrs] = {}
+        for obj in self._storage.get(class_name, {}).values():
+            self._index_object(class_name, obj, only=attrs)
+
+    @staticmethod
+    def _index_key(obj: BaseModel, attrs: Tuple[str, ...]) -> Optional[tuple]:
+        """Build the index key of an object, or None if it cannot be hashed"""
+        key = tuple(getattr(obj, attr, None) for attr in attrs)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _index_object(self, class_name: str, obj: BaseModel,
+                      only: Optional[Tuple[str, ...]] = None, ordered: bool = True) -> None:
+        """Insert an object into the indexes of its class (sorted ones only when ordered)"""
+        if only is None and class_name in self._spatial:
+            lat_attr, lon_attr = self.SPATIAL_INDEXES[class_name]
+            self._spatial[class_name].insert(obj.id, getattr(obj, lat_attr), getattr(obj, lon_attr))
+        if only is None:
+            if ordered:
+                self._created.setdefault(class_name, SortedIndex()).insert(obj.id, obj.created_at)
+                for attr, sorted_index in self._sorted.get(class_name, {}).items():
+                    sorted_index.insert(obj.id, getattr(obj, attr, None))
+            if class_name in self._fulltext:
+                fulltext = self._fulltext[class_name]
+                fulltext.insert(obj.id, {field: getattr(obj, field, None) for field in fulltext.weights})
+            if class_name in self._trigrams:
+                self._trigrams[class_name].insert(
+                    obj.id, [getattr(obj, field, None) for field in TRIGRAM_FIELDS[class_name]])
+        indexes = self._indexes.get(class_name)
+        if not indexes:
+            return
+        indexed = self._index_keys.setdefault(class_name, {}).setdefault(obj.id, {})
+        for attrs, index in indexes.items():
+            if only is not None and attrs != only:
+                continue
+            key = self._index_key(obj, attrs)
+            if key is None:
+                continue
+            index.setdefault(key, {})[obj.id] = None
+            indexed[attrs] = key
+
+    def _unindex_object(self, class_name: str, obj_id: str) -> None:
+        """Remove an object from the indexes using the keys it was stored under"""
+        if class_name in self._spatial:
+            self._spatial[class_name].remove(obj_id)
+        if class_name in self._created:
+            self._created[class_name].remove(obj_id)
+        for sorted_index in self._sorted.get(class_name, {}).values():
+            sorted_index.remove(obj_id)
+        if class_name in self._fulltext:
+            self._fulltext[class_name].remove(obj_id)
+        if class_name in self._trigrams:
+            self._trigrams[class_name].remove(obj_id)
+        indexed = self._index_keys.get(class_name, {}).pop(obj_id, None)
+        if not indexed:
+            return
+        indexes = self._indexes[class_name]
+        for attrs, key in indexed.items():
+            bucket = indexes[attrs].get(key)
+            if bucket is None:
+                continue
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del indexes[attrs][key]
+
+    def _rebuild_indexes(self, class_name: str) -> None:
+        """Rebuild every index of a class from the objects in its storage.
+
+        Used after filling the storage in bulk: each object is indexed once
+        and the sorted indexes are sorted once rather than insorted.
+        """
+        objects = self._storage.get(class_name, {})
+        for attrs in self._indexes.get(class_name, {}):
+            self._indexes[class_name][attrs] = {}
+        self._index_keys.pop(class_name, None)
+        if class_name in self._spatial:
+            self._spatial[class_name] = GridIndex()
+        if class_name in self._fulltext:
+            self._fulltext[class_name] = InvertedIndex(self._fulltext[class_name].weights)
+        if class_name in self._trigrams:
+            self._trigrams[class_name] = TrigramIndex()
+        for obj in objects.values():
+            self._index_object(class_name, obj, ordered=False)
+        self._created[class_name] = SortedIndex()
+        self._created[class_name].load((obj.id, obj.created_at) for obj in objects.values())
+        for attr, sorted_index in self._sorted.get(class_name, {}).items():
+            sorted_index.load((obj.id, getattr(obj, attr, None)) for obj in objects.values())
+
+    def _find_index(self, class_name: str, keys) -> Optional[Tuple[str, ...]]:
+        """Pick the most selective declared index covered by the given keys"""
+        best = None
+        for attrs in self._indexes.get(class_name, {}):
+            if set(attrs).issubset(keys) and (best is None or len(attrs) > len(best)):
+                best = attrs
+        return best
 
     def add(self, obj: BaseModel) -> None:
         """Add an object to the repository"""
         class_name = obj.__class__.__name__
         if class_name not in self._storage:
             self._storage[class_name] = {}
+        self._unindex_object(class_name, obj.id)
         self._storage[class_name][obj.id] = obj
+        self._index_object(class_name, obj)
 
     def get(self, model_class: Type[BaseModel], obj_id: str) -> Optional[BaseModel]:
         """Retrieve an object by its ID"""
@@ -67,12 +559,16 @@ class InMemoryRepository(Repository):
         class_name = obj.__class__.__name__
         if class_name in self._storage and obj.id in self._storage[class_name]:
             obj.save()  # Update the updated_at timestamp
+            # Re-index in case an indexed attribute changed
+            self._unindex_object(class_name, obj.id)
             self._storage[class_name][obj.id] = obj
+            self._index_object(class_name, obj)
 
     def delete(self, model_class: Type[BaseModel], obj_id: str) -> bool:
         """Delete an object by its ID"""
         class_name = model_class.__name__
         if class_name in self._storage and obj_id in self._storage[class_name]:
+            self._unindex_object(class_name, obj_id)
             del self._storage[class_name][obj_id]
             return True
         return False
@@ -83,8 +579,20 @@ class InMemoryRepository(Repository):
         if class_name not in self._storage:
             return []
 
+        objects = self._storage[class_name]
+        candidates = objects.values()
+        attrs = self._find_index(class_name, kwargs.keys())
+        if attrs is not None:
+            key = tuple(kwargs[attr] for attr in attrs)
+            try:
+                bucket = self._indexes[class_name][attrs].get(key, {})
+            except TypeError:
+                bucket = None  # unhashable lookup value, fall back to a scan
+            if bucket is not None:
+                candidates = [objects[obj_id] for obj_id in bucket if obj_id in objects]
+
         results = []
-        for obj in self._storage[class_name].values():
+        for obj in candidates:
             match = True
             for key, value in kwargs.items():
                 if not hasattr(obj, key) or getattr(obj, key) != value:
@@ -93,3 +601,181 @@ class InMemoryRepository(Repository):
             if match:
                 results.append(obj)
         return results
+
+    def add_many(self, objs: Iterable[BaseModel]) -> None:
+        """Add several objects in a single operation"""
+        for obj in objs:
+            self.add(obj)
+
+    def get_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> List[BaseModel]:
+        """Retrieve the objects matching the given IDs, in request order"""
+        objects = self._storage.get(model_class.__name__, {})
+        return [objects[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in objects]
+
+    def delete_many(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs and return how many were deleted"""
+        return sum(1 for obj_id in dict.fromkeys(obj_ids) if self.delete(model_class, obj_id))
+
+    def count(self, model_class: Type[BaseModel], **kwargs) -> int:
+        """Number of objects, read from the storage or a matching hash index"""
+        class_name = model_class.__name__
+        if not kwargs:
+            return len(self._storage.get(class_name, {}))
+        attrs = self._find_index(class_name, kwargs.keys())
+        if attrs is not None and set(attrs) == set(kwargs):
+            try:
+                return len(self._indexes[class_name][attrs].get(tuple(kwargs[a] for a in attrs), {}))
+            except TypeError:
+                pass  # unhashable lookup value, fall back to a scan
+        return len(self.get_by_attribute(model_class, **kwargs))
+
+    def find_within_bbox(self, model_class: Type[BaseModel], min_lat: float, min_lon: float,
+                         max_lat: float, max_lon: float) -> List[BaseModel]:
+        """Get objects inside a bounding box using the grid index when available"""
+        class_name = model_class.__name__
+        if class_name not in self._spatial:
+            return super().find_within_bbox(model_class, min_lat, min_lon, max_lat, max_lon)
+        objects = self._storage.get(class_name, {})
+        return [objects[obj_id] for obj_id in
+                self._spatial[class_name].query(min_lat, min_lon, max_lat, max_lon)
+                if obj_id in objects]
+
+    def find(self, model_class: Type[BaseModel], equals: Dict[str, object] = None,
+             ranges: Dict[str, Tuple[object, object]] = None, order_by: str = None,
+             descending: bool = False, limit: int = None,
+             ids: Optional[set] = None, after: Optional[Tuple] = None,
+             related: Optional[Tuple[str, Iterable[str], bool]] = None) -> List[BaseModel]:
+        """Get objects matching equality filters and ranges using hash and sorted indexes"""
+        if after is not None and order_by:
+            raise ValueError("A keyset cursor requires the default (created_at, id) order")
+        ids = self._restrict_ids(model_class, ids, related)
+        class_name = model_class.__name__
+        objects = self._storage.get(class_name, {})
+        equals = equals or {}
+        ranges = {attr: bounds for attr, bounds in (ranges or {}).items()
+                  if bounds != (None, None)}
+        sorted_indexes = self._sorted.get(class_name, {})
+
+        # Ordering by a sorted attribute: walk that index in order and stop at limit
+        if order_by in sorted_indexes:
+            low, high = ranges.get(order_by, (None, None))
+            results = []
+            for obj_id in sorted_indexes[order_by].range(low, high, descending=descending):
+                if ids is not None and obj_id not in ids:
+                    continue
+                obj = objects.get(obj_id)
+                if obj is not None and matches(obj, equals, ranges):
+                    results.append(obj)
+                    if limit and len(results) >= limit:
+                        break
+            return results
+
+        # Otherwise narrow the candidates with every usable index
+        candidate_ids, _ = self._candidate_ids(class_name, equals, ranges, ids)
+        if candidate_ids is None and not order_by:
+            # Walk the (created_at, id) order from the cursor and stop at limit
+            results = []
+            created = self._created.get(class_name, SortedIndex())
+            for obj_id in created.after(*(after or ())):
+                obj = objects.get(obj_id)
+                if obj is not None and matches(obj, equals, ranges):
+                    results.append(obj)
+                    if limit and len(results) >= limit:
+                        break
+            return results
+        if candidate_ids is None:
+            candidates = objects.values()
+        else:
+            candidates = [objects[obj_id] for obj_id in candidate_ids if obj_id in objects]
+
+        results = [obj for obj in candidates
+                   if matches(obj, equals, ranges) and after_cursor(obj, after)]
+        if order_by:
+            results.sort(key=lambda obj: getattr(obj, order_by), reverse=descending)
+        else:
+            results.sort(key=lambda obj: (obj.created_at, obj.id))
+        return results[:limit] if limit else results
+
+    def _candidate_ids(self, class_name: str, equals: Dict[str, object],
+                       ranges: Dict[str, Tuple[object, object]],
+                       ids: Optional[set]) -> Tuple[Optional[set], bool]:
+        """Intersect every usable hash/sorted index, smallest first.
+
+        Returns the candidate IDs (None when no index applies) and whether the
+        indexes fully answer the filters, so no object needs to be checked.
+        """
+        sorted_indexes = self._sorted.get(class_name, {})
+        candidate_sets = [] if ids is None else [ids]
+        covered = set()
+        attrs = self._find_index(class_name, equals.keys())
+        if attrs is not None:
+            key = tuple(equals[attr] for attr in attrs)
+            candidate_sets.append(self._indexes[class_name][attrs].get(key, {}).keys())
+            covered.update(attrs)
+        for attr, (low, high) in ranges.items():
+            if attr in sorted_indexes:
+                candidate_sets.append(set(sorted_indexes[attr].range(low, high)))
+                covered.add(attr)
+        fully_covered = covered >= set(equals) | set(ranges)
+        if not candidate_sets:
+            return None, fully_covered
+        candidate_sets.sort(key=len)
+        return set(candidate_sets[0]).intersection(*candidate_sets[1:]), fully_covered
+
+    def find_ids(self, model_class: Type[BaseModel], equals: Dict[str, object] = None,
+                 ranges: Dict[str, Tuple[object, object]] = None,
+                 ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> set:
+        """IDs matching the filters, answered from the indexes when they cover them"""
+        ids = self._restrict_ids(model_class, ids, related)
+        class_name = model_class.__name__
+        objects = self._storage.get(class_name, {})
+        equals = equals or {}
+        ranges = {attr: bounds for attr, bounds in (ranges or {}).items()
+                  if bounds != (None, None)}
+        candidate_ids, covered = self._candidate_ids(class_name, equals, ranges, ids)
+        if candidate_ids is None:
+            candidate_ids = objects.keys()
+        if covered:
+            return {obj_id for obj_id in candidate_ids if obj_id in objects}
+        return {obj_id for obj_id in candidate_ids
+                if obj_id in objects and matches(objects[obj_id], equals, ranges)}
+
+    def count_buckets(self, model_class: Type[BaseModel], attr: str, edges: Tuple,
+                      equals: Dict[str, object] = None,
+                      ranges: Dict[str, Tuple[object, object]] = None,
+                      ids: Optional[set] = None, related: Optional[Tuple[str, Iterable[str], bool]] = None) -> List[int]:
+        """Histogram of attr over the filtered objects, read from its sorted index"""
+        sorted_index = self._sorted.get(model_class.__name__, {}).get(attr)
+        if sorted_index is None:
+            return super().count_buckets(model_class, attr, edges, equals, ranges, ids, related)
+        if not equals and not ranges and ids is None and related is None:
+            return sorted_index.histogram(edges)
+        return sorted_index.histogram(edges, self.find_ids(model_class, equals, ranges, ids, related))
+
+    def search_text(self, model_class: Type[BaseModel], query: str, limit: int = None,
+                    snippets: bool = False) -> List[Tuple[BaseModel, float, Optional[str]]]:
+        """Full-text search through the maintained inverted index"""
+        class_name = model_class.__name__
+        if class_name not in self._fulltext:
+            return super().search_text(model_class, query, limit, snippets)
+        objects = self._storage.get(class_name, {})
+        results = []
+        for key, score in self._fulltext[class_name].search(query):
+            obj = objects.get(key)
+            if obj is None:
+                continue
+            results.append((obj, score, text_snippet(obj, query) if snippets else None))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def search_trigrams(self, model_class: Type[BaseModel],
+                        query: str) -> List[Tuple[BaseModel, float]]:
+        """Substring and fuzzy search, scoring only objects sharing a trigram with query"""
+        class_name = model_class.__name__
+        if class_name not in self._trigrams:
+            return super().search_trigrams(model_class, query)
+        objects = self._storage.get(class_name, {})
+        candidates = self._trigrams[class_name].candidates(trigrams(query.strip()))
+        return rank_trigram_matches(
+            [objects[key] for key in candidates if key in objects], query)
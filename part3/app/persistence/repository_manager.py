@@ -2,6 +2,9 @@
 
 import os
 from app.persistence.repository import InMemoryRepository
+from app.persistence.compact_repository import CompactInMemoryRepository
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.persistence.durable_repository import DurableInMemoryRepository
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
 class RepositoryManager:
@@ -16,6 +19,16 @@ class RepositoryManager:
         
         if repo_type == 'sqlalchemy':
             return SQLAlchemyRepository()
+        elif repo_type == 'in_memory_concurrent':
+            # Thread-safe variant for threaded servers (Werkzeug, gunicorn gthread)
+            return ConcurrentInMemoryRepository()
+        elif repo_type == 'in_memory_compact':
+            # Stores __slots__ records instead of mapped models to save memory
+            return CompactInMemoryRepository()
+        elif repo_type == 'in_memory_durable':
+            # In-memory store persisted to a snapshot plus append-only log
+            return DurableInMemoryRepository(
+                os.environ.get('INMEMORY_DATA_DIR', os.path.join('instance', 'memory_store')))
         else:
             # Default to in-memory repository for backwards compatibility
             return InMemoryRepository()
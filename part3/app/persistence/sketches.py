@@ -0,0 +1,336 @@
+"""Streaming sketches for live dashboards: t-digest quantiles and HyperLogLog counts.
+
+Both update in amortized O(1), answer without touching the tables and
+serialize to a few kilobytes. Neither supports deletion: removed or changed
+values stay counted until the sketches are rebuilt, so AnalyticsSketches
+tracks that drift and tells the caller when a rebuild is due.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SKETCH_MAGIC = b'HBNBSKT1'
+
+
+def _pack_str(value: Optional[str]) -> bytes:
+    """Length-prefixed UTF-8, with length 0xffff standing for None"""
+    if value is None:
+        return struct.pack('<H', 0xffff)
+    data = value.encode('utf-8')
+    return struct.pack('<H', len(data)) + data
+
+
+def _unpack_str(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    (length,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    if length == 0xffff:
+        return None, offset
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+class TDigest:
+    """Merging t-digest (Dunning) for approximate quantiles.
+
+    Values are buffered and merged into at most about compression centroids
+    using the arcsine scale function, which keeps the tails (p99) precise.
+    """
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+
+    def __len__(self):
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add a value (buffered; merged every few compression additions)"""
+        value = float(value)
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: 'TDigest') -> None:
+        """Fold another digest into this one"""
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _k_limit(self, q: float) -> float:
+        """Quantile where the centroid starting at q must end"""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        angle = k * 2 * math.pi / self.compression
+        return 1.0 if angle >= math.pi / 2 else (math.sin(angle) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+        means, weights = [], []
+        mean, weight = points[0]
+        done = 0.0
+        limit = total * self._k_limit(0.0)
+        for next_mean, next_weight in points[1:]:
+            if done + weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = total * self._k_limit(done / total)
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q, interpolating between centroid centers"""
+        self._compress()
+        if not self._means:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        if len(self._means) == 1:
+            return self._means[0]
+        means, weights = self._means, self._weights
+        index = q * self.count
+        half = weights[0] / 2
+        if index < half:
+            return self.min + (means[0] - self.min) * index / half
+        cumulative = half
+        for i in range(len(means) - 1):
+            step = (weights[i] + weights[i + 1]) / 2
+            if cumulative + step > index:
+                return means[i] + (means[i + 1] - means[i]) * (index - cumulative) / step
+            cumulative += step
+        half = weights[-1] / 2
+        return means[-1] + (self.max - means[-1]) * min((index - cumulative) / half, 1.0)
+
+    def to_bytes(self) -> bytes:
+        """compression, count, min, max and the (mean, weight) centroids"""
+        self._compress()
+        header = struct.pack('<ddddI', self.compression, self.count, self.min, self.max,
+                             len(self._means))
+        return header + struct.pack(f'<{2 * len(self._means)}d',
+                                    *(x for pair in zip(self._means, self._weights) for x in pair))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Tuple['TDigest', int]:
+        compression, count, low, high, size = struct.unpack_from('<ddddI', data, offset)
+        offset += struct.calcsize('<ddddI')
+        values = struct.unpack_from(f'<{2 * size}d', data, offset)
+        digest = cls(compression)
+        digest.count, digest.min, digest.max = count, low, high
+        digest._means, digest._weights = list(values[0::2]), list(values[1::2])
+        return digest, offset + 16 * size
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with a sparse representation for small sets.
+
+    2**precision one-byte registers (1024 by default, about 3% standard
+    error). Until a quarter of them are set, only the non-zero registers are
+    kept, so hosts with a handful of reviewers cost a few bytes.
+    """
+
+    def __init__(self, precision: int = 10):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        self._sparse: Optional[Dict[int, int]] = {}
+        self._registers: Optional[bytearray] = None
+
+    def add(self, item: str) -> None:
+        """Count an item"""
+        digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+        bits = 64 - self.precision
+        index = value >> bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+        self._set(index, rank)
+
+    def _set(self, index: int, rank: int) -> None:
+        if self._registers is not None:
+            if rank > self._registers[index]:
+                self._registers[index] = rank
+            return
+        if rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            if len(self._sparse) > self.size // 4:
+                self._registers = bytearray(self.size)
+                for position, value in self._sparse.items():
+                    self._registers[position] = value
+                self._sparse = None
+
+    def _ranks(self) -> Iterable[Tuple[int, int]]:
+        if self._registers is not None:
+            return enumerate(self._registers)
+        return self._sparse.items()
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Fold another counter of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        for index, rank in other._ranks():
+            if rank:
+                self._set(index, rank)
+
+    def estimate(self) -> int:
+        """Approximate number of distinct items"""
+        ranks = [rank for _, rank in self._ranks() if rank]
+        zeros = self.size - len(ranks)
+        harmonic = zeros + sum(2.0 ** -rank for rank in ranks)
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / harmonic
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)  # linear counting
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        """Precision, then sparse (index, rank) pairs or the dense registers"""
+        if self._registers is not None:
+            return struct.pack('<BBI', 1, self.precision, self.size) + bytes(self._registers)
+        pairs = sorted(self._sparse.items())
+        return (struct.pack('<BBI', 0, self.precision, len(pairs))
+                + b''.join(struct.pack('<HB', index, rank) for index, rank in pairs))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, offset: int = 0) -> Tuple['HyperLogLog', int]:
+        dense, precision, length = struct.unpack_from('<BBI', data, offset)
+        offset += struct.calcsize('<BBI')
+        counter = cls(precision)
+        if dense:
+            counter._registers, counter._sparse = bytearray(data[offset:offset + length]), None
+            return counter, offset + length
+        for _ in range(length):
+            index, rank = struct.unpack_from('<HB', data, offset)
+            counter._sparse[index] = rank
+            offset += 3
+        return counter, offset
+
+
+class AnalyticsSketches:
+    """Price digests per city and distinct-reviewer counters per host.
+
+    stale counts the deletions and changes the sketches could not apply;
+    needs_rebuild() reports when they exceed max_drift of what was added.
+    """
+
+    def __init__(self, compression: float = 100, precision: int = 10, max_drift: float = 0.1):
+        self.compression = compression
+        self.precision = precision
+        self.max_drift = max_drift
+        self.prices: Dict[Optional[str], TDigest] = {}
+        self.reviewers: Dict[str, HyperLogLog] = {}
+        self.added = 0
+        self.stale = 0
+
+    def clear(self) -> None:
+        self.prices.clear()
+        self.reviewers.clear()
+        self.added = self.stale = 0
+
+    def add_price(self, city_id: Optional[str], price: float) -> None:
+        """Record a place's price in its city's digest"""
+        if price is None:
+            return
+        digest = self.prices.get(city_id)
+        if digest is None:
+            digest = self.prices[city_id] = TDigest(self.compression)
+        digest.add(price)
+        self.added += 1
+
+    def add_reviewer(self, host_id: str, user_id: str) -> None:
+        """Record that user_id reviewed one of host_id's places"""
+        counter = self.reviewers.get(host_id)
+        if counter is None:
+            counter = self.reviewers[host_id] = HyperLogLog(self.precision)
+        counter.add(user_id)
+        self.added += 1
+
+    def mark_stale(self, count: int = 1) -> None:
+        """Note values the sketches still count but should not"""
+        self.stale += count
+
+    def needs_rebuild(self) -> bool:
+        return self.stale > self.max_drift * max(self.added, 1)
+
+    def price_quantiles(self, qs: Iterable[float], city_id: Optional[str] = None,
+                        all_cities: bool = False) -> Dict[str, object]:
+        """Count and quantiles of one city's digest, or of all of them merged"""
+        if all_cities:
+            digest = TDigest(self.compression)
+            for city_digest in self.prices.values():
+                digest.merge(city_digest)
+        else:
+            digest = self.prices.get(city_id, TDigest(self.compression))
+        return {'count': len(digest),
+                'quantiles': {f"p{q * 100:g}": digest.quantile(q) for q in qs}}
+
+    def distinct_reviewers(self, host_id: str) -> int:
+        counter = self.reviewers.get(host_id)
+        return counter.estimate() if counter else 0
+
+    def to_bytes(self) -> bytes:
+        """Serialize every sketch with its key"""
+        parts = [SKETCH_MAGIC, struct.pack('<QQII', self.added, self.stale,
+                                           len(self.prices), len(self.reviewers))]
+        for city_id, digest in self.prices.items():
+            parts += [_pack_str(city_id), digest.to_bytes()]
+        for host_id, counter in self.reviewers.items():
+            parts += [_pack_str(host_id), counter.to_bytes()]
+        return b''.join(parts)
+
+    def load_bytes(self, data: bytes) -> None:
+        """Replace the sketches with serialized ones"""
+        if data[:len(SKETCH_MAGIC)] != SKETCH_MAGIC:
+            raise ValueError("Not a sketch file")
+        offset = len(SKETCH_MAGIC)
+        added, stale, prices, reviewers = struct.unpack_from('<QQII', data, offset)
+        offset += struct.calcsize('<QQII')
+        self.clear()
+        self.added, self.stale = added, stale
+        for _ in range(prices):
+            city_id, offset = _unpack_str(data, offset)
+            self.prices[city_id], offset = TDigest.from_bytes(data, offset)
+        for _ in range(reviewers):
+            host_id, offset = _unpack_str(data, offset)
+            self.reviewers[host_id], offset = HyperLogLog.from_bytes(data, offset)
+
+    def save(self, path: str) -> int:
+        """Write the sketches atomically, returning the number of bytes"""
+        data = self.to_bytes()
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        return len(data)
+
+    def load(self, path: str) -> bool:
+        """Load sketches saved by save(); False when the file does not exist"""
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            self.load_bytes(f.read())
+        return True
@@ -0,0 +1,111 @@
+"""Spatial indexes for latitude/longitude lookups.
+
+GridIndex backs the in-memory repository; the SQLite R*Tree helpers back the
+SQLAlchemy repository. Both answer bounding-box queries; distance ranking is
+done by the facade.
+"""
+
+import math
+from typing import Dict, Iterator, Tuple
+from sqlalchemy import event, text
+
+
+class GridIndex:
+    """Uniform lat/lon grid mapping cells to the points they contain"""
+
+    def __init__(self, cell_size: float = 0.25):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[str, Tuple[float, float]]] = {}
+        self._positions: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size), math.floor(lon / self.cell_size))
+
+    def insert(self, key: str, lat: float, lon: float) -> None:
+        """Insert or move a point"""
+        self.remove(key)
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[key] = (lat, lon)
+        self._positions[key] = cell
+
+    def remove(self, key: str) -> None:
+        """Remove a point if present"""
+        cell = self._positions.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        bucket.pop(key, None)
+        if not bucket:
+            del self._cells[cell]
+
+    def query(self, min_lat: float, min_lon: float,
+              max_lat: float, max_lon: float) -> Iterator[str]:
+        """Yield the keys of points inside the box (bounds inclusive)"""
+        lat_lo, lon_lo = self._cell(min_lat, min_lon)
+        lat_hi, lon_hi = self._cell(max_lat, max_lon)
+        cell_count = (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1)
+        if cell_count > len(self._cells):
+            # Huge box: walking the occupied cells is cheaper than the grid
+            buckets = self._cells.values()
+        else:
+            buckets = (self._cells.get((i, j)) for i in range(lat_lo, lat_hi + 1)
+                       for j in range(lon_lo, lon_hi + 1))
+        for bucket in buckets:
+            if not bucket:
+                continue
+            for key, (lat, lon) in bucket.items():
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                    yield key
+
+
+# SQLite R*Tree over places.rowid, kept in sync by triggers on the places table
+PLACE_RTREE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS place_rtree USING rtree("
+    "id, min_lat, max_lat, min_lon, max_lon)",
+    "CREATE TRIGGER IF NOT EXISTS place_rtree_insert AFTER INSERT ON places BEGIN "
+    "INSERT OR REPLACE INTO place_rtree VALUES "
+    "(new.rowid, new.latitude, new.latitude, new.longitude, new.longitude); END",
+    "CREATE TRIGGER IF NOT EXISTS place_rtree_update "
+    "AFTER UPDATE OF latitude, longitude ON places BEGIN "
+    "UPDATE place_rtree SET min_lat = new.latitude, max_lat = new.latitude, "
+    "min_lon = new.longitude, max_lon = new.longitude WHERE id = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS place_rtree_delete AFTER DELETE ON places BEGIN "
+    "DELETE FROM place_rtree WHERE id = old.rowid; END",
+]
+
+
+def install_place_rtree(connection) -> None:
+    """Create the R*Tree and its triggers and (re)index the existing places.
+
+    The R*Tree is keyed by places.rowid, which VACUUM may renumber, so run this
+    again after a VACUUM to rebuild it.
+    """
+    for statement in PLACE_RTREE_DDL:
+        connection.execute(text(statement))
+    connection.execute(text("DELETE FROM place_rtree"))
+    connection.execute(text(
+        "INSERT OR REPLACE INTO place_rtree "
+        "SELECT rowid, latitude, latitude, longitude, longitude FROM places"))
+
+
+def has_place_rtree(connection) -> bool:
+    """Check whether the R*Tree exists on this database"""
+    return connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'place_rtree'"
+    )).first() is not None
+
+
+def register_place_rtree(places_table) -> None:
+    """Create/drop the R*Tree together with the places table on SQLite"""
+    @event.listens_for(places_table, 'after_create')
+    def create_rtree(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            install_place_rtree(connection)
+
+    @event.listens_for(places_table, 'before_drop')
+    def drop_rtree(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text("DROP TABLE IF EXISTS place_rtree"))
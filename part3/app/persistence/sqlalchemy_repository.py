@@ -1,28 +1,275 @@
 """SQLAlchemy-based repository implementation for database persistence"""
 
-from typing import List, Optional, Type
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Type
+from sqlalchemy.orm import sessionmaker, joinedload, selectinload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import (and_, case, create_engine, func, insert as sa_insert,
+                        inspect as sa_inspect, literal_column, null, select,
+                        table as sa_table, text, tuple_, union_all, update as sa_update)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.models.base_model import BaseModel
-from app.persistence.repository import Repository
+from app.persistence.repository import Repository, trigram_match_score
+from app.persistence.fulltext import (FULLTEXT_FIELDS, FULLTEXT_TABLES, SNIPPET_CLOSE, SNIPPET_OPEN,
+                                      SNIPPET_TOKENS, TRIGRAM_FIELDS, TRIGRAM_TABLES, fts5_phrase,
+                                      fts5_query, fulltext_supported, has_fulltext,
+                                      install_fulltext, register_fulltext, trigrams,
+                                      word_trigrams)
+from app.persistence.spatial import has_place_rtree, install_place_rtree, register_place_rtree
+from app.persistence import unit_of_work as uow
+from app.persistence.unit_of_work import commit, rollback
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
 from app import db
 
+# Keep the SQLite R*Tree over place coordinates in step with the places table
+register_place_rtree(Place.__table__)
+
+# Keep the SQLite FTS5 tables over place and review text in step with their tables
+for _model in (Place, Review):
+    register_fulltext(_model.__table__, FULLTEXT_FIELDS[_model.__name__])
+
+# ... and the FTS5 trigram table over user names in step with the users table
+register_fulltext(User.__table__, TRIGRAM_FIELDS['User'], TRIGRAM_TABLES['users'], 'trigram')
+
+# Most rows a trigram search reads from FTS5 before ranking them in Python
+MAX_TRIGRAM_CANDIDATES = 1000
+
+
+def detached_copy(obj: BaseModel) -> BaseModel:
+    """Copy the column values of obj into a new detached instance.
+
+    The copy is never part of a session, so commits cannot expire it and it
+    can be cached beyond the current request.
+    """
+    mapper = sa_inspect(type(obj))
+    copy = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(copy, attr.key, getattr(obj, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def attach(obj: BaseModel) -> BaseModel:
+    """Attach a detached copy to the current session without querying"""
+    return db.session.merge(obj, load=False)
+
+
+def ensure_fulltext(checked: set, table: str, columns, fts: str = None,
+                    tokenizer: str = None) -> bool:
+    """Check for an FTS5 table, creating it on older SQLite databases.
+
+    checked caches the (database URL, FTS table) pairs already verified.
+    """
+    connection = db.session.connection()
+    if not fulltext_supported(connection, tokenizer):
+        return False
+    key = (str(connection.engine.url), fts or FULLTEXT_TABLES[table])
+    if key not in checked:
+        if not has_fulltext(connection, table, fts):
+            install_fulltext(connection, table, columns, fts, tokenizer)
+            commit()
+        checked.add(key)
+    return True
+
+
+def trigram_match_clause(model_class, match: str, limit: int = None):
+    """WHERE clause for rows matching an FTS5 expression on the trigram table of a model.
+
+    With a limit, only the best ranked limit matches are kept.
+    """
+    table = model_class.__tablename__
+    fts = TRIGRAM_TABLES[table]
+    best = f" ORDER BY rank LIMIT {int(limit)}" if limit else ''
+    return text(f"{table}.rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :match{best})"
+                ).bindparams(match=match)
+
+
+def search_trigrams(repo, checked: set, model_class, query: str) -> list:
+    """Trigram search through FTS5: every substring match and the best fuzzy candidates"""
+    return search_trigrams_page(repo, checked, model_class, query)[0]
+
+
+def search_trigrams_page(repo, checked: set, model_class, query: str, offset: int = 0,
+                         limit: int = None) -> tuple:
+    """One page of trigram search results and the total number of matches.
+
+    Substring matches come from an FTS5 phrase query, or a LIKE over the
+    joined name when the query has a space and may span two fields, and
+    are all ranked from their name columns. Only the fuzzy tail, rows
+    sharing a trigram without containing the query, is capped at
+    MAX_TRIGRAM_CANDIDATES. Objects are loaded for the returned page only.
+    """
+    table = getattr(model_class, '__tablename__', None)
+    needle = query.strip()
+    grams = trigrams(needle)
+    if table not in TRIGRAM_TABLES or not grams or not ensure_fulltext(
+            checked, table, TRIGRAM_FIELDS[model_class.__name__], TRIGRAM_TABLES[table], 'trigram'):
+        return Repository.search_trigrams_page(repo, model_class, query, offset, limit)
+    columns = [getattr(model_class, field) for field in TRIGRAM_FIELDS[model_class.__name__]]
+    phrase = fts5_phrase(needle)
+    if ' ' in needle:
+        joined = func.coalesce(columns[0], '')
+        for column in columns[1:]:
+            joined = joined.op('||')(' ').op('||')(func.coalesce(column, ''))
+        pattern = needle.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        substring = joined.like(f"%{pattern}%", escape='\\')
+    else:
+        substring = trigram_match_clause(model_class, phrase)
+    needle = needle.casefold()
+    needle_trigrams = word_trigrams(needle)
+
+    def ranked(rows) -> list:
+        scores = []
+        for key, *values in rows:
+            score = trigram_match_score(values, needle, needle_trigrams)
+            if score is not None:
+                scores.append((key, score))
+        return scores
+
+    substring_matches = ranked(db.session.query(model_class.id, *columns).filter(substring))
+    seen = {key for key, _ in substring_matches}
+    fuzzy = f"({' OR '.join(fts5_phrase(gram) for gram in sorted(grams))}) NOT {phrase}"
+    fuzzy_matches = ranked(db.session.query(model_class.id, *columns).filter(
+        trigram_match_clause(model_class, fuzzy, MAX_TRIGRAM_CANDIDATES)))
+    scores = sorted(substring_matches + [(key, score) for key, score in fuzzy_matches
+                                         if key not in seen and score < 1.0],
+                    key=lambda pair: (-pair[1], pair[0]))
+    page = scores[offset:offset + limit if limit else None]
+    objects = {obj.id: obj for obj in repo.get_many(model_class, [key for key, _ in page])}
+    return [(objects[key], score) for key, score in page if key in objects], len(scores)
+
+
+def fulltext_hits(model_class, expression: str, key, snippets: bool = False):
+    """SELECT key, score, snippet over the FTS5 matches of a model, best score highest"""
+    table = model_class.__tablename__
+    fts = FULLTEXT_TABLES[table]
+    index = literal_column(fts)
+    score = -func.bm25(index, *FULLTEXT_FIELDS[model_class.__name__].values())
+    excerpt = (func.snippet(index, -1, SNIPPET_OPEN, SNIPPET_CLOSE, '…', SNIPPET_TOKENS)
+               if snippets else null())
+    return (select(key.label('key'), score.label('score'), excerpt.label('snippet'))
+            .select_from(model_class)
+            .join(sa_table(fts), literal_column(f'{fts}.rowid') == literal_column(f'{table}.rowid'))
+            .where(index.op('MATCH')(expression)))
+
+
+def _apply_filters(query, model_class, equals: dict = None, ranges: dict = None):
+    """Add equality filters and inclusive (min, max) ranges to a query"""
+    for key, value in (equals or {}).items():
+        query = query.filter(getattr(model_class, key) == value)
+    for key, (low, high) in (ranges or {}).items():
+        column = getattr(model_class, key)
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+    return query
+
+def related_clause(model_class, relationship: str, related_ids: Iterable[str],
+                   match_all: bool = True, correlated: bool = False):
+    """Condition on model_class.id for rows linked to all (or any) of related_ids.
+
+    Evaluated against the association table of a many-to-many relationship,
+    so the matching IDs never leave the database. correlated=True uses an
+    EXISTS per row, which lets a LIMIT query walk its index order and stop
+    early; otherwise an IN subquery is read from the related-ID index, which
+    suits counts over every match.
+    """
+    prop = getattr(model_class, relationship).property
+    if prop.secondary is None:
+        raise ValueError(f"{relationship} is not a many-to-many relationship")
+    # Aliased so the subquery still correlates when the outer query reads the same table
+    links = prop.secondary.alias()
+    local = links.c[next(iter(prop.synchronize_pairs))[1].name]
+    remote = links.c[next(iter(prop.secondary_synchronize_pairs))[1].name]
+    wanted = list(dict.fromkeys(related_ids))
+    if correlated:
+        conditions = [remote == related_id for related_id in wanted] if match_all else [remote.in_(wanted)]
+        return and_(*[select(local).where(local == model_class.id, condition).exists()
+                      for condition in conditions])
+    if match_all:
+        return and_(*[model_class.id.in_(select(local).where(remote == related_id))
+                      for related_id in wanted])
+    return model_class.id.in_(select(local).where(remote.in_(wanted)))
+
+
+def find_rows(model_class, equals: dict = None, ranges: dict = None, order_by: str = None,
+              descending: bool = False, limit: int = None, ids: Optional[set] = None,
+              after: Optional[tuple] = None, max_in_ids: int = 500,
+              related: Optional[tuple] = None) -> List[BaseModel]:
+    """Run a Repository.find() query; ID sets above max_in_ids are checked on the results"""
+    if after is not None and order_by:
+        raise ValueError("A keyset cursor requires the default (created_at, id) order")
+    query = _apply_filters(db.session.query(model_class), model_class, equals, ranges)
+    if related is not None:
+        query = query.filter(related_clause(model_class, *related, correlated=bool(limit)))
+    post_filter = ids is not None and len(ids) > max_in_ids
+    if ids is not None and not post_filter:
+        query = query.filter(model_class.id.in_(list(ids)))
+    if order_by:
+        column = getattr(model_class, order_by)
+        query = query.order_by(column.desc() if descending else column.asc(), model_class.id)
+    else:
+        # Keyset order, served by the (created_at, id) indexes
+        if after is not None:
+            query = query.filter(tuple_(model_class.created_at, model_class.id) > tuple(after))
+        query = query.order_by(model_class.created_at, model_class.id)
+    if post_filter:
+        results = []
+        for obj in query:
+            if obj.id in ids:
+                results.append(obj)
+                if limit and len(results) >= limit:
+                    break
+        return results
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def iter_rows(model_class, chunk_size: int = 1000) -> Iterator[BaseModel]:
+    """Stream every row in (created_at, id) order, buffering chunk_size rows at a time"""
+    query = db.session.query(model_class).order_by(model_class.created_at, model_class.id)
+    yield from query.yield_per(chunk_size)
+
+
+def count_rows(model_class, **kwargs) -> int:
+    """SELECT COUNT(*) over the rows with the given column values"""
+    return db.session.query(func.count()).select_from(model_class).filter_by(**kwargs).scalar()
+
+
+def rows_exist(model_class, **kwargs) -> bool:
+    """SELECT EXISTS over the rows with the given column values"""
+    return db.session.query(db.session.query(model_class.id).filter_by(**kwargs).exists()).scalar()
+
+
 class SQLAlchemyRepository(Repository):
     """SQLAlchemy repository for database persistence"""
+
+    loads_relationships = True
+
+    # Largest ID set passed to find() as an IN (...) list
+    MAX_IN_IDS = 500
     
     def __init__(self):
         """Initialize the SQLAlchemy repository"""
         # Note: The actual database session will be handled by Flask-SQLAlchemy
         # This repository will use the global db object from the Flask app
-        pass
+        # Database URLs on which the place R*Tree is known to exist
+        self._rtree_checked = set()
+        # (database URL, FTS table) pairs known to exist
+        self._fulltext_checked = set()
     
     def add(self, obj: BaseModel) -> None:
         """Add an object to the database"""
         try:
             db.session.add(obj)
-            db.session.commit()
+            commit()
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
     
     def get(self, model_class: Type[BaseModel], obj_id: str) -> Optional[BaseModel]:
@@ -47,9 +294,9 @@ class SQLAlchemyRepository(Repository):
             
             # Merge the object to handle potential detached instances
             db.session.merge(obj)
-            db.session.commit()
+            commit()
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
     
     def delete(self, model_class: Type[BaseModel], obj_id: str) -> bool:
@@ -58,11 +305,11 @@ class SQLAlchemyRepository(Repository):
             obj = self.get(model_class, obj_id)
             if obj:
                 db.session.delete(obj)
-                db.session.commit()
+                commit()
                 return True
             return False
         except Exception as e:
-            db.session.rollback()
+            rollback()
             return False
     
     def get_by_attribute(self, model_class: Type[BaseModel], **kwargs) -> List[BaseModel]:
@@ -79,6 +326,355 @@ class SQLAlchemyRepository(Repository):
         except Exception:
             return []
     
+    def add_many(self, objs: Iterable[BaseModel]) -> None:
+        """Add several objects in a single transaction (batched INSERTs)"""
+        try:
+            db.session.add_all(list(objs))
+            commit()
+        except Exception as e:
+            rollback()
+            raise e
+    
+    def get_many(self, model_class, obj_ids: Iterable[str]) -> List[BaseModel]:
+        """Retrieve the objects matching the given IDs with a single IN query"""
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return []
+        try:
+            found = {obj.id: obj for obj in
+                     db.session.query(model_class).filter(model_class.id.in_(ids)).all()}
+        except Exception:
+            return []
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+    
+    def delete_many(self, model_class, obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs in a single transaction"""
+        try:
+            objs = self.get_many(model_class, obj_ids)
+            # Delete through the session so ORM cascades still apply
+            for obj in objs:
+                db.session.delete(obj)
+            commit()
+            return len(objs)
+        except Exception as e:
+            rollback()
+            return 0
+    
+    def get_all_eager(self, model_class, relationships: Iterable[str],
+                      obj_ids: Optional[Iterable[str]] = None) -> List[BaseModel]:
+        """Retrieve objects with relationships loaded in a fixed number of queries"""
+        options = []
+        for name in relationships:
+            attr = getattr(model_class, name)
+            # Collections get one extra SELECT ... IN, scalar references a JOIN
+            options.append(selectinload(attr) if attr.property.uselist else joinedload(attr))
+        query = db.session.query(model_class).options(*options)
+        if obj_ids is None:
+            return query.all()
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return []
+        found = {obj.id: obj for obj in query.filter(model_class.id.in_(ids)).all()}
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+    
+    def detached_copy(self, obj: BaseModel) -> BaseModel:
+        """Return a detached copy of obj that is safe to keep across requests"""
+        return detached_copy(obj)
+    
+    def attach(self, obj: BaseModel) -> BaseModel:
+        """Attach a detached copy to the current session without querying"""
+        return attach(obj)
+    
+    def find(self, model_class, equals: dict = None, ranges: dict = None,
+             order_by: str = None, descending: bool = False, limit: int = None,
+             ids: Optional[set] = None, after: Optional[tuple] = None,
+             related: Optional[tuple] = None) -> List[BaseModel]:
+        """Get objects matching equality filters and ranges with indexed SQL"""
+        return find_rows(model_class, equals, ranges, order_by, descending, limit, ids, after,
+                         self.MAX_IN_IDS, related)
+
+    def iter_all(self, model_class, chunk_size: int = 1000) -> Iterator[BaseModel]:
+        """Stream every row with a yield_per query instead of building a list"""
+        return iter_rows(model_class, chunk_size)
+
+    def count(self, model_class, **kwargs) -> int:
+        """Number of rows, counted with SELECT COUNT(*)"""
+        return count_rows(model_class, **kwargs)
+
+    def exists(self, model_class, **kwargs) -> bool:
+        """Check for a matching row with SELECT EXISTS"""
+        return rows_exist(model_class, **kwargs)
+
+    def _id_chunks(self, ids: Optional[set]):
+        """Split an ID filter into IN (...) lists of at most MAX_IN_IDS (None: no filter)"""
+        if ids is None:
+            yield None
+            return
+        ids = list(ids)
+        for start in range(0, len(ids), self.MAX_IN_IDS):
+            yield ids[start:start + self.MAX_IN_IDS]
+
+    def find_ids(self, model_class, equals: dict = None, ranges: dict = None,
+                 ids: Optional[set] = None, related: Optional[tuple] = None) -> set:
+        """IDs matching the filters, selecting only the id column"""
+        result = set()
+        for chunk in self._id_chunks(ids):
+            query = _apply_filters(db.session.query(model_class.id), model_class, equals, ranges)
+            if related is not None:
+                query = query.filter(related_clause(model_class, *related))
+            if chunk is not None:
+                query = query.filter(model_class.id.in_(chunk))
+            result.update(row[0] for row in query)
+        return result
+
+    def count_matching(self, model_class, equals: dict = None, ranges: dict = None,
+                       ids: Optional[set] = None, related: Optional[tuple] = None) -> int:
+        """Number of rows matching the filters, counted with SELECT COUNT(*)"""
+        total = 0
+        for chunk in self._id_chunks(ids):
+            query = _apply_filters(db.session.query(func.count(model_class.id)), model_class,
+                                   equals, ranges)
+            if related is not None:
+                query = query.filter(related_clause(model_class, *related))
+            if chunk is not None:
+                query = query.filter(model_class.id.in_(chunk))
+            total += query.scalar()
+        return total
+
+    def count_buckets(self, model_class, attr: str, edges, equals: dict = None,
+                      ranges: dict = None, ids: Optional[set] = None,
+                      related: Optional[tuple] = None) -> List[int]:
+        """Histogram of attr computed with a CASE ... GROUP BY query"""
+        column = getattr(model_class, attr)
+        bucket = case(*[(column < edge, position) for position, edge in enumerate(edges[1:])],
+                      else_=len(edges) - 1).label('bucket')
+        counts = [0] * len(edges)
+        for chunk in self._id_chunks(ids):
+            query = _apply_filters(db.session.query(bucket, func.count()), model_class, equals, ranges)
+            query = query.filter(column >= edges[0])
+            if related is not None:
+                query = query.filter(related_clause(model_class, *related))
+            if chunk is not None:
+                query = query.filter(model_class.id.in_(chunk))
+            for position, count in query.group_by(bucket):
+                counts[position] += count
+        return counts
+
+    def count_related(self, model_class, relationship: str, equals: dict = None,
+                      ranges: dict = None, ids: Optional[set] = None,
+                      related: Optional[tuple] = None) -> dict:
+        """Count objects per related ID with a GROUP BY on the association table"""
+        prop = getattr(model_class, relationship).property
+        if prop.secondary is None:
+            return super().count_related(model_class, relationship, equals, ranges, ids, related)
+        local = next(iter(prop.synchronize_pairs))[1]
+        remote = next(iter(prop.secondary_synchronize_pairs))[1]
+        counts = {}
+        for chunk in self._id_chunks(ids):
+            query = db.session.query(remote, func.count()).select_from(prop.secondary)
+            if equals or ranges or related is not None:
+                query = _apply_filters(query.join(model_class, model_class.id == local),
+                                       model_class, equals, ranges)
+            if related is not None:
+                query = query.filter(related_clause(model_class, *related))
+            if chunk is not None:
+                query = query.filter(local.in_(chunk))
+            for related_id, count in query.group_by(remote):
+                counts[related_id] = counts.get(related_id, 0) + count
+        return counts
+
+    def related_ids(self, model_class, relationship: str, related_ids: Iterable[str],
+                    match_all: bool = True) -> set:
+        """IDs of rows linked to all (or any) of related_ids, from the association table"""
+        prop = getattr(model_class, relationship).property
+        if prop.secondary is None:
+            return super().related_ids(model_class, relationship, related_ids, match_all)
+        clause = related_clause(model_class, relationship, related_ids, match_all)
+        return {row[0] for row in db.session.query(model_class.id).filter(clause)}
+
+    def get_relationship_pairs(self, model_class, relationship: str) -> list:
+        """Get (object id, related id) pairs straight from the association table"""
+        prop = getattr(model_class, relationship).property
+        if prop.secondary is None:
+            return super().get_relationship_pairs(model_class, relationship)
+        local = next(iter(prop.synchronize_pairs))[1]
+        remote = next(iter(prop.secondary_synchronize_pairs))[1]
+        return [tuple(row) for row in db.session.execute(select(local, remote))]
+    
+    def get_values(self, model_class, *attrs: str) -> list:
+        """Get (id, *attrs) tuples for every row, selecting only those columns"""
+        columns = [getattr(model_class, attr) for attr in attrs]
+        return [tuple(row) for row in db.session.query(model_class.id, *columns)]
+
+    def count_grouped(self, model_class, *attrs: str) -> dict:
+        """Count rows per distinct combination of attrs with one GROUP BY query"""
+        columns = [getattr(model_class, attr) for attr in attrs]
+        return {tuple(row[:-1]): row[-1]
+                for row in db.session.query(*columns, func.count()).group_by(*columns)}
+
+    def _insert_missing(self, obj: BaseModel) -> None:
+        """INSERT the row of obj unless one with its primary key exists"""
+        values = {attr.key: getattr(obj, attr.key) for attr in sa_inspect(type(obj)).column_attrs}
+        dialect = db.session.connection().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = (sqlite_insert if dialect == 'sqlite' else postgresql_insert)(type(obj))
+            db.session.execute(insert.values(values).on_conflict_do_nothing())
+        elif dialect in ('mysql', 'mariadb'):
+            db.session.execute(sa_insert(type(obj)).values(values).prefix_with('IGNORE'))
+        elif self.get(type(obj), obj.id) is None:
+            db.session.add(obj)
+            db.session.flush()
+
+    def increment(self, model_class, obj_id: str, deltas: dict,
+                  create: bool = False) -> Optional[dict]:
+        """Add deltas with one UPDATE ... SET column = column + delta.
+
+        A read followed by update() would let two concurrent requests lose
+        one of their changes (or fail with SQLITE_BUSY_SNAPSHOT under WAL);
+        the UPDATE applies both. With create, a missing row is first
+        inserted as model_class(obj_id) by an INSERT that ignores conflicts.
+        """
+        try:
+            if create:
+                self._insert_missing(model_class(obj_id))
+            changes = {attr: getattr(model_class, attr) + delta for attr, delta in deltas.items()}
+            changes['updated_at'] = datetime.utcnow()
+            result = db.session.execute(
+                sa_update(model_class).where(model_class.id == obj_id).values(changes))
+            if not result.rowcount:
+                commit()
+                return None
+            # The row stays locked by this transaction, so these are our values
+            counts = db.session.query(*[getattr(model_class, attr) for attr in deltas]).filter(
+                model_class.id == obj_id).one()
+            commit()
+        except Exception as e:
+            rollback()
+            raise e
+        return dict(zip(deltas, counts))
+
+    def find_within_bbox(self, model_class, min_lat: float, min_lon: float,
+                         max_lat: float, max_lon: float) -> List[BaseModel]:
+        """Get objects inside a bounding box, through the R*Tree for places on SQLite"""
+        query = db.session.query(model_class).filter(
+            model_class.latitude.between(min_lat, max_lat),
+            model_class.longitude.between(min_lon, max_lon))
+        if model_class is Place and self._place_rtree_available():
+            query = query.filter(text(
+                "places.rowid IN (SELECT id FROM place_rtree WHERE "
+                "max_lat >= :min_lat AND min_lat <= :max_lat AND "
+                "max_lon >= :min_lon AND min_lon <= :max_lon)"
+            ).bindparams(min_lat=min_lat, max_lat=max_lat, min_lon=min_lon, max_lon=max_lon))
+        return query.all()
+    
+    def _place_rtree_available(self) -> bool:
+        """Check for the place R*Tree, creating it on older SQLite databases"""
+        connection = db.session.connection()
+        if connection.dialect.name != 'sqlite':
+            return False
+        url = str(connection.engine.url)
+        if url not in self._rtree_checked:
+            if not has_place_rtree(connection):
+                install_place_rtree(connection)
+                commit()
+            self._rtree_checked.add(url)
+        return True
+    
+    def search_text(self, model_class, query: str, limit: int = None,
+                    snippets: bool = False) -> list:
+        """Full-text search through the SQLite FTS5 table, ranked by bm25()"""
+        table = getattr(model_class, '__tablename__', None)
+        if table not in FULLTEXT_TABLES or not self._fulltext_available(model_class):
+            return super().search_text(model_class, query, limit, snippets)
+        expression = fts5_query(query)
+        if not expression:
+            return []
+        fts = FULLTEXT_TABLES[table]
+        weights = ', '.join(str(weight) for weight in FULLTEXT_FIELDS[model_class.__name__].values())
+        excerpt = (f"snippet({fts}, -1, :open, :close, '…', {SNIPPET_TOKENS})"
+                   if snippets else "NULL")
+        rows = db.session.execute(text(
+            f"SELECT {table}.id, -bm25({fts}, {weights}) AS score, {excerpt} AS snippet "
+            f"FROM {fts} JOIN {table} ON {table}.rowid = {fts}.rowid "
+            f"WHERE {fts} MATCH :query ORDER BY score DESC, {table}.id LIMIT :limit"
+        ), {'query': expression, 'limit': limit or -1, 'open': SNIPPET_OPEN,
+            'close': SNIPPET_CLOSE}).all()
+        objects = {obj.id: obj for obj in self.get_many(model_class, [row[0] for row in rows])}
+        return [(objects[obj_id], score, excerpt) for obj_id, score, excerpt in rows
+                if obj_id in objects]
+    
+    def search_text_with_children(self, model_class, query: str, child_class, parent_attr: str,
+                                  child_weight: float, limit: int = None, snippets: bool = False,
+                                  ids: Optional[set] = None, related: Optional[tuple] = None) -> list:
+        """Parent and child FTS5 matches merged, ranked and limited in one query.
+
+        Each parent's own score and its best child's score are combined with
+        a UNION ALL grouped by parent ID, so only the returned page of
+        parents is loaded.
+        """
+        # AS MATERIALIZED needs SQLite 3.35
+        if db.session.connection().dialect.server_version_info < (3, 35) or not all(
+                getattr(model, '__tablename__', None) in FULLTEXT_TABLES
+                and self._fulltext_available(model) for model in (model_class, child_class)):
+            return super().search_text_with_children(model_class, query, child_class, parent_attr,
+                                                     child_weight, limit, snippets, ids, related)
+        expression = fts5_query(query)
+        if not expression:
+            return []
+        # Materialized so that bm25() and snippet() run in their MATCH query,
+        # not in the aggregates the planner would otherwise flatten them into
+        own = fulltext_hits(model_class, expression, model_class.id, snippets).cte(
+            'own_hits').prefix_with('MATERIALIZED')
+        children = fulltext_hits(child_class, expression, getattr(child_class, parent_attr),
+                                 snippets).cte('child_hits').prefix_with('MATERIALIZED')
+        # With a single max() SQLite takes the bare snippet from the best child's row
+        best = select(children.c.key, func.max(children.c.score).label('score'),
+                      children.c.snippet).group_by(children.c.key).subquery()
+        hits = union_all(
+            select(own.c.key, own.c.score.label('own'), null().label('child'),
+                   own.c.snippet.label('own_snippet'), null().label('child_snippet')),
+            select(best.c.key, null(), best.c.score, null(), best.c.snippet),
+        ).subquery()
+        ranked = select(
+            hits.c.key,
+            (func.coalesce(func.max(hits.c.own), 0)
+             + child_weight * func.coalesce(func.max(hits.c.child), 0)).label('score'),
+            func.coalesce(func.max(hits.c.own_snippet), func.max(hits.c.child_snippet)).label('snippet'),
+        ).group_by(hits.c.key).subquery()
+
+        rows = db.session.query(model_class, ranked.c.score, ranked.c.snippet).join(
+            ranked, ranked.c.key == model_class.id)
+        if related is not None:
+            rows = rows.filter(related_clause(model_class, *related))
+        if ids is not None:
+            rows = rows.filter(model_class.id.in_(list(ids)))
+        rows = rows.order_by(ranked.c.score.desc(), model_class.id)
+        if limit:
+            rows = rows.limit(limit)
+        return [(obj, score, excerpt) for obj, score, excerpt in rows]
+
+    def _fulltext_available(self, model_class) -> bool:
+        """Check for the FTS5 table of a model, creating it on older SQLite databases"""
+        return ensure_fulltext(self._fulltext_checked, model_class.__tablename__,
+                               FULLTEXT_FIELDS[model_class.__name__])
+
+    def search_trigrams(self, model_class, query: str) -> list:
+        """Substring and fuzzy search through the FTS5 trigram table"""
+        return search_trigrams(self, self._fulltext_checked, model_class, query)
+
+    def search_trigrams_page(self, model_class, query: str, offset: int = 0,
+                             limit: int = None) -> tuple:
+        """One page of trigram search results and the total, counting every substring match"""
+        return search_trigrams_page(self, self._fulltext_checked, model_class, query, offset, limit)
+    
+    def unit_of_work(self):
+        """Group several writes into a single transaction"""
+        return uow.unit_of_work()
+
+    def after_commit(self, callback) -> None:
+        """Run callback after the outermost unit of work commits, dropping it on rollback"""
+        uow.after_commit(callback)
+    
     def save(self, obj: BaseModel) -> None:
         """Save (add or update) an object to the database"""
         try:
@@ -92,5 +688,5 @@ class SQLAlchemyRepository(Repository):
                 # Add new object
                 self.add(obj)
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
\ No newline at end of file
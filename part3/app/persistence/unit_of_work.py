@@ -0,0 +1,82 @@
+"""Unit-of-work support for the SQLAlchemy repositories.
+
+By default every repository write commits immediately. Inside a unit of work
+the repositories only stage their changes on the session, and a single commit
+(or rollback on failure) is issued when the outermost unit of work ends.
+Work registered with after_commit() waits for that commit and is dropped on
+rollback, so in-process indexes and caches never see uncommitted rows.
+"""
+
+from contextlib import contextmanager
+from typing import Callable
+from app import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+_AFTER_COMMIT_KEY = 'unit_of_work_after_commit'
+
+
+def in_unit_of_work() -> bool:
+    """Return True if the current session is inside a unit of work"""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def begin() -> None:
+    """Enter a (possibly nested) unit of work"""
+    info = db.session.info
+    info[_DEPTH_KEY] = info.get(_DEPTH_KEY, 0) + 1
+
+
+def end(commit: bool = True) -> None:
+    """Leave a unit of work, committing or rolling back when it is the outermost one"""
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    if depth <= 0:
+        return
+    if depth > 1:
+        info[_DEPTH_KEY] = depth - 1
+        return
+    # Reset the depth first so a failing commit is not retried by the caller
+    info[_DEPTH_KEY] = 0
+    callbacks = info.pop(_AFTER_COMMIT_KEY, [])
+    if not commit:
+        db.session.rollback()
+        return
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    for callback in callbacks:
+        callback()
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Run callback once the outermost unit of work commits, or now outside one"""
+    if in_unit_of_work():
+        db.session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work():
+    """Defer repository commits until the block exits, rolling back once on failure"""
+    begin()
+    try:
+        yield
+    except Exception:
+        end(commit=False)
+        raise
+    end(commit=True)
+
+
+def commit() -> None:
+    """Commit the session unless a unit of work will do it later"""
+    if not in_unit_of_work():
+        db.session.commit()
+
+
+def rollback() -> None:
+    """Roll back the session unless a unit of work owns the transaction"""
+    if not in_unit_of_work():
+        db.session.rollback()
@@ -1,20 +1,36 @@
 """User-specific repository implementation for database persistence"""
 
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload, selectinload
+from app.persistence.fulltext import TRIGRAM_FIELDS, TRIGRAM_TABLES, fts5_phrase
 from app.persistence.repository import Repository
+from app.persistence.sqlalchemy_repository import (SQLAlchemyRepository, attach, count_rows,
+                                                   detached_copy, ensure_fulltext, find_rows,
+                                                   iter_rows, rows_exist, search_trigrams,
+                                                   search_trigrams_page)
 from app.models.user import User
+from app.persistence import unit_of_work as uow
+from app.persistence.unit_of_work import commit, rollback
 from app import db
 
 class UserRepository(Repository):
     """User-specific repository for enhanced user database operations"""
+
+    loads_relationships = True
+
+    def __init__(self):
+        """Initialize the user repository"""
+        # (database URL, FTS table) pairs known to exist
+        self._fulltext_checked = set()
     
     def add(self, obj: User) -> None:
         """Add a user to the database"""
         try:
             db.session.add(obj)
-            db.session.commit()
+            commit()
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
     
     def get(self, model_class, obj_id: str) -> Optional[User]:
@@ -36,9 +52,9 @@ class UserRepository(Repository):
         try:
             obj.save()
             db.session.merge(obj)
-            db.session.commit()
+            commit()
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
     
     def delete(self, model_class, obj_id: str) -> bool:
@@ -47,11 +63,11 @@ class UserRepository(Repository):
             user = self.get(User, obj_id)
             if user:
                 db.session.delete(user)
-                db.session.commit()
+                commit()
                 return True
             return False
         except Exception as e:
-            db.session.rollback()
+            rollback()
             return False
     
     def get_by_attribute(self, model_class, **kwargs) -> List[User]:
@@ -67,6 +83,26 @@ class UserRepository(Repository):
         except Exception:
             return []
     
+    def find(self, model_class, equals: dict = None, ranges: dict = None,
+             order_by: str = None, descending: bool = False, limit: int = None,
+             ids: Optional[set] = None, after: Optional[tuple] = None,
+             related: Optional[tuple] = None) -> List[User]:
+        """Get users matching equality filters and ranges with indexed SQL"""
+        return find_rows(User, equals, ranges, order_by, descending, limit, ids, after,
+                         SQLAlchemyRepository.MAX_IN_IDS, related)
+
+    def iter_all(self, model_class, chunk_size: int = 1000) -> Iterator[User]:
+        """Stream every user with a yield_per query instead of building a list"""
+        return iter_rows(User, chunk_size)
+
+    def count(self, model_class, **kwargs) -> int:
+        """Number of users, counted with SELECT COUNT(*)"""
+        return count_rows(User, **kwargs)
+
+    def exists(self, model_class, **kwargs) -> bool:
+        """Check for a matching user with SELECT EXISTS"""
+        return rows_exist(User, **kwargs)
+
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email address (user-specific method)"""
         try:
@@ -82,10 +118,24 @@ class UserRepository(Repository):
             return []
     
     def get_users_by_name(self, first_name: str = None, last_name: str = None) -> List[User]:
-        """Get users by first and/or last name (user-specific method)"""
+        """Get users by first and/or last name substrings (user-specific method)
+
+        Substrings of three or more characters are looked up in the FTS5
+        trigram index; shorter ones fall back to a LIKE scan.
+        """
         try:
             query = db.session.query(User)
-            
+            names = {'first_name': first_name, 'last_name': last_name}
+            names = {column: value for column, value in names.items() if value}
+            fts = TRIGRAM_TABLES['users']
+            if names and all(len(value) >= 3 for value in names.values()) and ensure_fulltext(
+                    self._fulltext_checked, 'users', TRIGRAM_FIELDS['User'], fts, 'trigram'):
+                match = ' AND '.join(f"{column} : {fts5_phrase(value)}"
+                                     for column, value in names.items())
+                return query.filter(text(
+                    f"users.rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :match)"
+                ).bindparams(match=match)).all()
+
             if first_name:
                 query = query.filter(User.first_name.ilike(f'%{first_name}%'))
             if last_name:
@@ -95,6 +145,82 @@ class UserRepository(Repository):
         except Exception:
             return []
     
+    def search_trigrams(self, model_class, query: str) -> list:
+        """Substring and fuzzy name search through the FTS5 trigram table"""
+        return search_trigrams(self, self._fulltext_checked, User, query)
+
+    def search_trigrams_page(self, model_class, query: str, offset: int = 0,
+                             limit: int = None) -> tuple:
+        """One page of name search results and the total, counting every substring match"""
+        return search_trigrams_page(self, self._fulltext_checked, User, query, offset, limit)
+    
+    def add_many(self, objs: Iterable[User]) -> None:
+        """Add several objects in a single transaction (batched INSERTs)"""
+        try:
+            db.session.add_all(list(objs))
+            commit()
+        except Exception as e:
+            rollback()
+            raise e
+    
+    def get_many(self, model_class, obj_ids: Iterable[str]) -> List[User]:
+        """Retrieve the objects matching the given IDs with a single IN query"""
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return []
+        try:
+            found = {obj.id: obj for obj in
+                     db.session.query(User).filter(User.id.in_(ids)).all()}
+        except Exception:
+            return []
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+    
+    def delete_many(self, model_class, obj_ids: Iterable[str]) -> int:
+        """Delete the objects matching the given IDs in a single transaction"""
+        try:
+            objs = self.get_many(model_class, obj_ids)
+            # Delete through the session so ORM cascades still apply
+            for obj in objs:
+                db.session.delete(obj)
+            commit()
+            return len(objs)
+        except Exception as e:
+            rollback()
+            return 0
+    
+    def get_all_eager(self, model_class, relationships: Iterable[str],
+                      obj_ids: Optional[Iterable[str]] = None) -> List[User]:
+        """Retrieve objects with relationships loaded in a fixed number of queries"""
+        options = []
+        for name in relationships:
+            attr = getattr(User, name)
+            # Collections get one extra SELECT ... IN, scalar references a JOIN
+            options.append(selectinload(attr) if attr.property.uselist else joinedload(attr))
+        query = db.session.query(User).options(*options)
+        if obj_ids is None:
+            return query.all()
+        ids = list(dict.fromkeys(obj_ids))
+        if not ids:
+            return []
+        found = {obj.id: obj for obj in query.filter(User.id.in_(ids)).all()}
+        return [found[obj_id] for obj_id in ids if obj_id in found]
+    
+    def detached_copy(self, obj: User) -> User:
+        """Return a detached copy of a user that is safe to keep across requests"""
+        return detached_copy(obj)
+    
+    def attach(self, obj: User) -> User:
+        """Attach a detached copy to the current session without querying"""
+        return attach(obj)
+    
+    def unit_of_work(self):
+        """Group several writes into a single transaction"""
+        return uow.unit_of_work()
+
+    def after_commit(self, callback) -> None:
+        """Run callback after the outermost unit of work commits, dropping it on rollback"""
+        uow.after_commit(callback)
+    
     def save(self, obj: User) -> None:
         """Save (add or update) a user to the database"""
         try:
@@ -105,5 +231,5 @@ class UserRepository(Repository):
             else:
                 self.add(obj)
         except Exception as e:
-            db.session.rollback()
+            rollback()
             raise e
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Coroutine facade for the ASGI entry point.
+
+Read paths await an AsyncRepository and gather independent lookups, so the
+place detail fetches its host, reviews and rating summary concurrently.
+bcrypt runs on the password hasher's pool while the event loop keeps
+serving other requests. Writes that maintain derived state (rating
+summaries, search and analytics indexes) stay on the synchronous facade.
+"""
+
+import asyncio
+from app.persistence.async_repository import AsyncRepository
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.models.place_rating import PlaceRating
+
+
+class AsyncHBnBFacade:
+    """Async facade over an AsyncRepository"""
+
+    def __init__(self, repository: AsyncRepository, user_repository: AsyncRepository = None):
+        self.repo = repository
+        self.user_repo = user_repository or repository
+
+    async def close(self) -> None:
+        await self.repo.close()
+        if self.user_repo is not self.repo:
+            await self.user_repo.close()
+
+    # User operations
+    async def create_user(self, email: str, first_name: str, last_name: str,
+                          password: str = None, is_admin: bool = False) -> User:
+        """Create a new user, hashing the password off the event loop"""
+        if await self.user_repo.exists(User, email=email):
+            raise ValueError(f"User with email {email} already exists")
+        user = User(email, first_name, last_name, None, is_admin)
+        if password is not None:
+            await asyncio.to_thread(user.set_password, password)
+        await self.user_repo.add(user)
+        return user
+
+    async def get_user(self, user_id: str) -> User:
+        """Get a user by ID"""
+        user = await self.user_repo.get(User, user_id)
+        if not user:
+            raise ValueError(f"User with id {user_id} not found")
+        return user
+
+    async def get_user_by_email(self, email: str) -> User:
+        """Get a user by email, or None"""
+        users = await self.user_repo.get_by_attribute(User, email=email)
+        return users[0] if users else None
+
+    async def authenticate_user(self, email: str, password: str) -> User:
+        """Return the user matching the credentials, or None"""
+        user = await self.get_user_by_email(email)
+        if not user or not await asyncio.to_thread(user.check_password, password):
+            return None
+        return user
+
+    # Place operations
+    async def get_place(self, place_id: str) -> Place:
+        """Get a place by ID"""
+        place = await self.repo.get(Place, place_id)
+        if not place:
+            raise ValueError(f"Place with id {place_id} not found")
+        return place
+
+    async def get_place_with_details(self, place_id: str) -> dict:
+        """Get a single place as a dict with host, amenities and reviews.
+
+        Same shape as HBnBFacade.get_place_with_details().
+        """
+        place = await self.get_place(place_id)
+        # Owned associations (amenities) come loaded with the place
+        host, reviews, rating = await asyncio.gather(
+            self.user_repo.get(User, place.host_id),
+            self.repo.get_by_attribute(Review, place_id=place_id),
+            self.repo.get(PlaceRating, place_id))
+        place_dict = place.to_dict()
+        place_dict['host'] = host.to_dict() if host else None
+        place_dict['amenities'] = [amenity.to_dict() for amenity in place.amenities]
+        place_dict['reviews'] = [review.to_dict() for review in reviews]
+        place_dict['rating'] = rating.to_dict() if rating else PlaceRating.empty_dict()
+        return place_dict
+
+    # Review operations
+    async def get_review(self, review_id: str) -> Review:
+        """Get a review by ID"""
+        review = await self.repo.get(Review, review_id)
+        if not review:
+            raise ValueError(f"Review with id {review_id} not found")
+        return review
+
+    async def get_reviews_by_place(self, place_id: str) -> list:
+        """Get all reviews for a place"""
+        return await self.repo.get_by_attribute(Review, place_id=place_id)
+
+    # Amenity operations
+    async def get_amenity(self, amenity_id: str) -> Amenity:
+        """Get an amenity by ID"""
+        amenity = await self.repo.get(Amenity, amenity_id)
+        if not amenity:
+            raise ValueError(f"Amenity with id {amenity_id} not found")
+        return amenity
+
+    async def get_all_amenities(self) -> list:
+        """Get all amenities"""
+        return await self.repo.get_all(Amenity)
@@ -1,9 +1,27 @@
+import atexit
+import os
+from functools import partial
 from app.persistence.repository_manager import RepositoryManager
 from app.persistence.user_repository import UserRepository
+from app.persistence.columnar import ALL_GROUPS, ColumnTable
+from app.persistence.fulltext import PrefixIndex, tokenize
+from app.persistence.indexes import BitmapIndex
+from app.persistence.sketches import AnalyticsSketches
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.models.place_rating import PlaceRating
+from app.utils.cache import TTLCache
+from app.utils.geo import bounding_boxes, haversine_km
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+# Numeric place fields projected into columns for admin statistics
+PLACE_STAT_COLUMNS = ('price_per_night', 'max_guests', 'number_of_rooms',
+                      'number_of_bathrooms', 'latitude', 'longitude')
+CITY_STAT_SORTS = ('places', 'average_price', 'total_guests', 'review_count', 'average_rating')
+# Price quantiles reported from the t-digest sketches
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
 
 class HBnBFacade:
     """Facade for the HBnB application"""
@@ -19,18 +37,79 @@ class HBnBFacade:
             self.user_repo = user_repository
         else:
             # Use UserRepository for user operations if SQLAlchemy is enabled
-            import os
             if os.environ.get('REPOSITORY_TYPE') == 'sqlalchemy':
                 self.user_repo = UserRepository()
             else:
                 self.user_repo = self.repo
 
+        # Users resolved for JWT-authenticated requests, invalidated on writes
+        self.user_cache = TTLCache()
+
+        # Per-amenity bitmaps over places, built from place_amenity on first use
+        self.amenity_index = BitmapIndex()
+        self._amenity_index_ready = False
+
+        # Place and amenity names for autocomplete, built on first use
+        self.place_names = PrefixIndex()
+        self.amenity_names = PrefixIndex()
+        self._autocomplete_ready = False
+
+        # Columnar projections of place and review numbers, built on first use
+        self.place_columns = ColumnTable(PLACE_STAT_COLUMNS)
+        self.review_columns = ColumnTable(('rating',))
+        self._stats_ready = False
+
+        # Streaming price digests and reviewer counters; loaded from SKETCH_FILE
+        # when it exists, otherwise built from the tables on first use
+        self.sketches = AnalyticsSketches()
+        self._sketches_ready = False
+        self.sketch_file = os.environ.get('SKETCH_FILE')
+        if self.sketch_file:
+            self._sketches_ready = self.sketches.load(self.sketch_file)
+            atexit.register(self._save_sketches_at_exit)
+
+    def unit_of_work(self):
+        """Group several repository writes into one transaction"""
+        return self.repo.unit_of_work()
+
+    def _after_commit(self, callback, *args) -> None:
+        """Apply an in-process index update once the enclosing transaction commits.
+
+        Under a request-wide unit of work the request can still roll back after
+        a facade method returns; the update is then dropped with it.
+        """
+        self.repo.after_commit(partial(callback, *args))
+
+    def _invalidate_user(self, user_id: str) -> None:
+        """Drop a cached user now and again when the change commits.
+
+        A load between the two reads the old row, and would otherwise stay cached.
+        """
+        self.user_cache.invalidate(user_id)
+        self.user_repo.after_commit(partial(self.user_cache.invalidate, user_id))
+
+    # Keyset pagination
+    @staticmethod
+    def _check_page_size(limit: int) -> None:
+        """Validate a page size"""
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    def _page(self, repo, model_class, limit: int, after: tuple = None, **equals) -> tuple:
+        """Objects after a (created_at, id) cursor, whether more follow, and the total count.
+
+        One extra row is fetched to tell whether another page exists; the total
+        is a COUNT over the same equality filters.
+        """
+        self._check_page_size(limit)
+        objs = repo.find(model_class, equals=equals, limit=limit + 1, after=after)
+        return objs[:limit], len(objs) > limit, repo.count(model_class, **equals)
+
     # User operations
     def create_user(self, email: str, first_name: str, last_name: str, password: str = None, is_admin: bool = False) -> User:
         """Create a new user"""
         # Check if user with email already exists
-        existing_users = self.user_repo.get_by_attribute(User, email=email)
-        if existing_users:
+        if self.user_repo.exists(User, email=email):
             raise ValueError(f"User with email {email} already exists")
 
         user = User(email, first_name, last_name, password, is_admin)
@@ -44,25 +123,65 @@ class HBnBFacade:
             raise ValueError(f"User with id {user_id} not found")
         return user
 
+    def get_user_cached(self, user_id: str) -> User:
+        """Get a user by ID through the user cache"""
+        # Taken before the load, so an update landing meanwhile is not cached over
+        generation = self.user_cache.generation()
+        cached = self.user_cache.get(user_id)
+        if cached is not None:
+            return self.user_repo.attach(cached)
+        user = self.get_user(user_id)
+        self.user_cache.set(user_id, self.user_repo.detached_copy(user), generation)
+        return user
+
     def get_user_by_email(self, email: str) -> User:
-        """Get user by email"""
+        """Get user by email through the email index"""
+        if isinstance(self.user_repo, UserRepository):
+            return self.user_repo.get_user_by_email(email)
         users = self.user_repo.get_by_attribute(User, email=email)
         if not users:
             return None
         return users[0]
 
+    def authenticate_user(self, email: str, password: str) -> User:
+        """Return the user matching the credentials, or None"""
+        user = self.get_user_by_email(email)
+        if not user or not user.check_password(password):
+            return None
+        return user
+
     def get_all_users(self) -> list:
         """Get all users"""
         return self.user_repo.get_all(User)
 
+    def iter_users(self, chunk_size: int = 1000):
+        """Stream every user, oldest first, without loading them all at once"""
+        return self.user_repo.iter_all(User, chunk_size)
+
+    def get_users_page(self, limit: int = DEFAULT_PAGE_SIZE, after: tuple = None) -> tuple:
+        """One keyset page of users, whether more follow, and the total count"""
+        return self._page(self.user_repo, User, limit, after)
+
+    def search_users_by_name(self, query: str, page: int = 1, per_page: int = 20) -> tuple:
+        """Get one page of (user, score) pairs for a name search, and the total match count.
+
+        Names containing the query rank first, then close spellings by trigram
+        similarity.
+        """
+        query = (query or '').strip()
+        if len(query) < 3:
+            raise ValueError("Search query must be at least 3 characters long")
+        if page < 1 or not 1 <= per_page <= 100:
+            raise ValueError("page must be positive and per_page between 1 and 100")
+        return self.user_repo.search_trigrams_page(User, query, (page - 1) * per_page, per_page)
+
     def update_user(self, user_id: str, **kwargs) -> User:
         """Update a user"""
         user = self.get_user(user_id)
 
         # don't allow email updates if email already exists
         if 'email' in kwargs and kwargs['email'] != user.email:
-            existing = self.user_repo.get_by_attribute(User, email=kwargs['email'])
-            if existing:
+            if self.user_repo.exists(User, email=kwargs['email']):
                 raise ValueError(f"Email {kwargs['email']} already in use")
 
         # don't allow password updates through this method
@@ -74,6 +193,15 @@ class HBnBFacade:
                 setattr(user, key, value)
 
         self.user_repo.update(user)
+        self._invalidate_user(user_id)
+        return user
+
+    def update_user_password(self, user_id: str, password: str) -> User:
+        """Hash and store a new password for a user"""
+        user = self.get_user(user_id)
+        user.set_password(password)
+        self.user_repo.update(user)
+        self._invalidate_user(user_id)
         return user
 
     # Place operations
@@ -88,12 +216,7 @@ class HBnBFacade:
         # validate amenities exist and get amenity objects
         amenities = []
         if 'amenity_ids' in place_data and place_data['amenity_ids']:
-            for amenity_id in place_data['amenity_ids']:
-                try:
-                    amenity = self.get_amenity(amenity_id)
-                    amenities.append(amenity)
-                except ValueError:
-                    raise ValueError(f"Amenity with id {amenity_id} not found")
+            amenities = self.get_amenities(place_data['amenity_ids'])
         
         # Remove amenity_ids from place_data since we'll use relationships
         place_data = {k: v for k, v in place_data.items() if k != 'amenity_ids'}
@@ -105,6 +228,10 @@ class HBnBFacade:
             place.amenities.append(amenity)
         
         self.repo.add(place)
+        self._after_commit(self.amenity_index.set, place.id, [amenity.id for amenity in amenities])
+        self._after_commit(self.place_names.insert, place.id, place.name)
+        self._project_place(place)
+        self._after_commit(self.sketches.add_price, place.city_id, place.price_per_night)
         return place
 
     def get_place(self, place_id: str) -> Place:
@@ -114,45 +241,405 @@ class HBnBFacade:
             raise ValueError(f"Place with id {place_id} not found")
         return place
 
+    def get_places_page(self, limit: int = DEFAULT_PAGE_SIZE, after: tuple = None,
+                        **filters) -> tuple:
+        """One keyset page of places matching listing filters, whether more follow, and the match count.
+
+        filters are the filter_places() criteria other than sort and limit.
+        """
+        self._check_page_size(limit)
+        equals, ranges, ids, related = self._place_criteria(**filters)
+        if ids is not None and not ids:
+            return [], False, 0
+        places = self.repo.find(Place, equals=equals, ranges=ranges, limit=limit + 1,
+                                ids=ids, after=after, related=related)
+        return (places[:limit], len(places) > limit,
+                self._count_places(equals, ranges, ids, related))
+
+    def iter_places(self, chunk_size: int = 1000):
+        """Stream every place, oldest first, without loading them all at once"""
+        return self.repo.iter_all(Place, chunk_size)
+
+    def count_places(self, **filters) -> int:
+        """Number of places matching filter_places() criteria"""
+        return self._count_places(*self._place_criteria(**filters))
+
+    def _count_places(self, equals: dict, ranges: dict, ids: set, related: tuple) -> int:
+        """COUNT(*) (or the in-memory indexes) over places matching _place_criteria()"""
+        if not equals and not ranges and ids is None and related is None:
+            return self.repo.count(Place)
+        return self.repo.count_matching(Place, equals, ranges, ids, related)
+
     def get_all_places(self) -> list:
         """Get all places"""
         return self.repo.get_all(Place)
 
+    def get_places_with_details(self, place_ids: list = None) -> list:
+        """Get places (all, or the given IDs) as dicts with host, amenities and reviews.
+
+        Related objects are fetched with a fixed number of queries regardless of
+        how many places are returned.
+        """
+        places = self.repo.get_all_eager(
+            Place, ('host', 'amenities', 'reviews', 'rating_summary'), place_ids)
+        if self.repo.loads_relationships:
+            hosts = {place.host_id: place.host for place in places if place.host}
+            reviews = {place.id: list(place.reviews) for place in places}
+            ratings = {place.id: place.rating_summary for place in places}
+        else:
+            # Batched path: one get_many for hosts and ratings, indexed review lookups
+            host_ids = {place.host_id for place in places}
+            hosts = {user.id: user for user in self.user_repo.get_many(User, host_ids)}
+            reviews = {place.id: self.get_reviews_by_place(place.id) for place in places}
+            ratings = {summary.id: summary for summary in
+                       self.repo.get_many(PlaceRating, [place.id for place in places])}
+
+        result = []
+        for place in places:
+            place_dict = place.to_dict()
+            host = hosts.get(place.host_id)
+            place_dict['host'] = host.to_dict() if host else None
+            place_dict['amenities'] = [amenity.to_dict() for amenity in place.amenities]
+            place_dict['reviews'] = [review.to_dict() for review in reviews[place.id]]
+            rating = ratings.get(place.id)
+            place_dict['rating'] = rating.to_dict() if rating else PlaceRating.empty_dict()
+            result.append(place_dict)
+        return result
+
+    def get_place_with_details(self, place_id: str) -> dict:
+        """Get a single place as a dict with host, amenities and reviews"""
+        places = self.get_places_with_details([place_id])
+        if not places:
+            raise ValueError(f"Place with id {place_id} not found")
+        return places[0]
+
+    # Public sort keys of the place listing mapped to model attributes
+    PLACE_SORT_FIELDS = {
+        'price': 'price_per_night',
+        'guests': 'max_guests',
+        'rooms': 'number_of_rooms',
+        'name': 'name',
+        'created_at': 'created_at',
+    }
+
+    def filter_places(self, min_price: float = None, max_price: float = None,
+                      min_guests: int = None, min_rooms: int = None, city_id: str = None,
+                      amenity_ids: list = None, match_all_amenities: bool = True,
+                      sort: str = None, limit: int = None) -> list:
+        """Get places matching price/guest/room ranges, a city and amenities, optionally sorted.
+
+        sort is one of PLACE_SORT_FIELDS, prefixed with '-' for descending order.
+        amenity_ids keeps places having all of them (or any with
+        match_all_amenities=False).
+        """
+        order_by, descending = None, False
+        if sort:
+            descending = sort.startswith('-')
+            order_by = self.PLACE_SORT_FIELDS.get(sort.lstrip('-'))
+            if order_by is None:
+                raise ValueError(f"sort must be one of: {', '.join(self.PLACE_SORT_FIELDS)}")
+
+        equals, ranges, ids, related = self._place_criteria(
+            min_price, max_price, min_guests, min_rooms, city_id, amenity_ids, match_all_amenities)
+        if ids is not None and not ids:
+            return []
+        return self.repo.find(Place, equals=equals, ranges=ranges, order_by=order_by,
+                              descending=descending, limit=limit, ids=ids, related=related)
+
+    def _place_criteria(self, min_price: float = None, max_price: float = None,
+                        min_guests: int = None, min_rooms: int = None, city_id: str = None,
+                        amenity_ids: list = None, match_all_amenities: bool = True) -> tuple:
+        """Translate listing filters into repository (equals, ranges, ids, related) arguments.
+
+        The amenity filter becomes an ID set from the bitmap index in memory,
+        and a related criterion (a join on place_amenity) on SQL repositories.
+        """
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price must not be greater than max_price")
+        ranges = {}
+        if min_price is not None or max_price is not None:
+            ranges['price_per_night'] = (min_price, max_price)
+        if min_guests is not None:
+            ranges['max_guests'] = (min_guests, None)
+        if min_rooms is not None:
+            ranges['number_of_rooms'] = (min_rooms, None)
+        equals = {'city_id': city_id} if city_id else {}
+        return (equals, ranges) + self._amenity_criteria(amenity_ids, match_all_amenities)
+
+    def _amenity_criteria(self, amenity_ids: list, match_all: bool) -> tuple:
+        """Repository (ids, related) arguments for an optional amenity filter"""
+        if not amenity_ids:
+            return None, None
+        if self.repo.loads_relationships:
+            return None, ('amenities', amenity_ids, match_all)
+        return self.places_with_amenities(amenity_ids, match_all), None
+
+    # Facets available on place listing and search, and their bucket edges
+    PLACE_FACETS = ('amenities', 'price', 'guests')
+    PRICE_FACET_EDGES = (0, 50, 100, 200, 500)
+    GUEST_FACET_EDGES = (0, 2, 4, 6, 8)
+
+    def get_place_facets(self, facets: list, place_ids: list = None, **filters) -> dict:
+        """Count the places matching filters (and place_ids, if given) per facet.
+
+        Counts come from grouped SQL or the in-memory indexes, without loading
+        the places themselves. Buckets hold values in [min, max).
+        """
+        unknown = set(facets) - set(self.PLACE_FACETS)
+        if unknown:
+            raise ValueError(f"facets must be among: {', '.join(self.PLACE_FACETS)}")
+        equals, ranges, ids, related = self._place_criteria(**filters)
+        if place_ids is not None:
+            ids = set(place_ids) if ids is None else ids & set(place_ids)
+
+        result = {}
+        if 'amenities' in facets:
+            result['amenities'] = self._amenity_facet(equals, ranges, ids, related)
+        if 'price' in facets:
+            result['price'] = self._bucket_facet('price_per_night', self.PRICE_FACET_EDGES,
+                                                 equals, ranges, ids, related)
+        if 'guests' in facets:
+            result['guests'] = self._bucket_facet('max_guests', self.GUEST_FACET_EDGES,
+                                                  equals, ranges, ids, related)
+        return result
+
+    def _amenity_facet(self, equals: dict, ranges: dict, ids: set, related: tuple = None) -> list:
+        """Per-amenity place counts, most common first"""
+        if self.repo.loads_relationships:
+            counts = self.repo.count_related(Place, 'amenities', equals, ranges, ids, related)
+        else:
+            # Intersect each amenity bitmap with the bitmap of the filtered places
+            if not self._amenity_index_ready:
+                self.rebuild_amenity_index()
+            bitmap = None
+            if equals or ranges or ids is not None or related is not None:
+                bitmap = self.amenity_index.bitmap_of(
+                    self.repo.find_ids(Place, equals, ranges, ids, related))
+            counts = {amenity_id: self.amenity_index.count(amenity_id, bitmap)
+                      for amenity_id in self.amenity_index.values()}
+        amenities = self.repo.get_many(Amenity, [key for key, count in counts.items() if count])
+        facet = [{'id': amenity.id, 'name': amenity.name, 'count': counts[amenity.id]}
+                 for amenity in amenities]
+        facet.sort(key=lambda item: (-item['count'], item['name']))
+        return facet
+
+    def _bucket_facet(self, attr: str, edges: tuple, equals: dict, ranges: dict, ids: set,
+                      related: tuple = None) -> list:
+        """Place counts per [min, max) bucket of attr (the last bucket has no max)"""
+        counts = self.repo.count_buckets(Place, attr, edges, equals, ranges, ids, related)
+        bounds = list(edges[1:]) + [None]
+        return [{'min': low, 'max': high, 'count': count}
+                for low, high, count in zip(edges, bounds, counts)]
+
+    def search_places_nearby(self, latitude: float, longitude: float, radius_km: float,
+                             limit: int = None, amenity_ids: list = None,
+                             match_all_amenities: bool = True) -> list:
+        """Get (place, distance_km) pairs within a radius, nearest first"""
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Latitude must be between -90 and 90 and longitude between -180 and 180")
+        if radius_km <= 0:
+            raise ValueError("Radius must be positive")
+
+        has_amenities = self._amenity_filter(amenity_ids, match_all_amenities)
+        results = {}
+        for box in bounding_boxes(latitude, longitude, radius_km):
+            for place in self.repo.find_within_bbox(Place, *box):
+                if not has_amenities(place.id):
+                    continue
+                distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+                if distance <= radius_km:
+                    results[place.id] = (place, distance)
+        ranked = sorted(results.values(), key=lambda pair: pair[1])
+        return ranked[:limit] if limit else ranked
+
+    def search_places_in_bbox(self, min_lat: float, min_lon: float, max_lat: float,
+                              max_lon: float, limit: int = None, amenity_ids: list = None,
+                              match_all_amenities: bool = True) -> list:
+        """Get places inside a bounding box (min_lon > max_lon crosses the antimeridian)"""
+        if min_lat > max_lat:
+            raise ValueError("min_lat must not be greater than max_lat")
+        if min_lon <= max_lon:
+            boxes = [(min_lat, min_lon, max_lat, max_lon)]
+        else:
+            boxes = [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+        has_amenities = self._amenity_filter(amenity_ids, match_all_amenities)
+        places = [place for box in boxes for place in self.repo.find_within_bbox(Place, *box)
+                  if has_amenities(place.id)]
+        return places[:limit] if limit else places
+
+    # Share of the best matching review's score added to a place's text score
+    REVIEW_MATCH_WEIGHT = 0.5
+
+    def search_places_text(self, query: str, limit: int = None, snippets: bool = False,
+                           amenity_ids: list = None, match_all_amenities: bool = True) -> list:
+        """Get (place, score, snippet) triples for a full-text query, most relevant first.
+
+        Places match on their name and description or through one of their
+        review comments; the best review match adds to the place's score.
+        """
+        if not tokenize(query):
+            raise ValueError("Search query must contain at least one word")
+        ids, related = self._amenity_criteria(amenity_ids, match_all_amenities)
+        if ids is not None and not ids:
+            return []
+        return self.repo.search_text_with_children(Place, query, Review, 'place_id',
+                                                   self.REVIEW_MATCH_WEIGHT, limit, snippets,
+                                                   ids, related)
+
     def get_places_by_host(self, host_id: str) -> list:
         """Get all places owned by a specific host"""
         return self.repo.get_by_attribute(Place, host_id=host_id)
 
     def update_place(self, place_id: str, **kwargs) -> Place:
         """Update a place"""
-        place = self.get_place(place_id)
-
-        # validate new amenities if provided and update relationships
-        if 'amenity_ids' in kwargs:
-            # Clear existing amenities
-            place.amenities.clear()
-            
-            # Add new amenities
-            for amenity_id in kwargs['amenity_ids']:
-                try:
-                    amenity = self.get_amenity(amenity_id)
+        # Amenity rewrite and field update are committed together
+        with self.unit_of_work():
+            place = self.get_place(place_id)
+            old_city_price = (place.city_id, place.price_per_night)
+
+            # validate new amenities if provided and update relationships
+            if 'amenity_ids' in kwargs:
+                # Validate all amenities before touching the existing ones
+                amenities = self.get_amenities(kwargs['amenity_ids'])
+                place.amenities.clear()
+                for amenity in amenities:
                     place.amenities.append(amenity)
-                except ValueError:
-                    raise ValueError(f"Amenity with id {amenity_id} not found")
             
-            # Remove amenity_ids from kwargs since it's handled by relationships
-            del kwargs['amenity_ids']
-
-        # validate price if being updated
-        if 'price_per_night' in kwargs and kwargs['price_per_night'] < 0:
-            raise ValueError("Price must be positive")
+                # Remove amenity_ids from kwargs since it's handled by relationships
+                del kwargs['amenity_ids']
+
+            # validate price if being updated
+            if 'price_per_night' in kwargs and kwargs['price_per_night'] < 0:
+                raise ValueError("Price must be positive")
+
+            for key, value in kwargs.items():
+                if hasattr(place, key):
+                    setattr(place, key, value)
+
+            self.repo.update(place)
+        self._after_commit(self.amenity_index.set, place.id,
+                           [amenity.id for amenity in place.amenities])
+        self._after_commit(self.place_names.insert, place.id, place.name)
+        self._project_place(place)
+        if (place.city_id, place.price_per_night) != old_city_price:
+            # The old price stays in its digest until the next rebuild
+            self._after_commit(self.sketches.mark_stale)
+            self._after_commit(self.sketches.add_price, place.city_id, place.price_per_night)
+        return place
 
-        for key, value in kwargs.items():
-            if hasattr(place, key):
-                setattr(place, key, value)
+    def add_place_amenity(self, place_id: str, amenity_id: str) -> Place:
+        """Attach an amenity to a place"""
+        place = self.get_place(place_id)
+        place.add_amenity(self.get_amenity(amenity_id))
+        self.repo.update(place)
+        self._after_commit(self.amenity_index.add, place.id, amenity_id)
+        return place
 
+    def remove_place_amenity(self, place_id: str, amenity_id: str) -> Place:
+        """Detach an amenity from a place"""
+        place = self.get_place(place_id)
+        place.remove_amenity(self.get_amenity(amenity_id))
         self.repo.update(place)
+        self._after_commit(self.amenity_index.discard, place.id, amenity_id)
         return place
 
+    def rebuild_amenity_index(self) -> int:
+        """Rebuild the amenity bitmaps from place_amenity, returning the number of places"""
+        self.amenity_index.load(self.repo.get_relationship_pairs(Place, 'amenities'))
+        self._amenity_index_ready = True
+        return len(self.amenity_index)
+
+    def amenity_bitmap(self, amenity_ids: list, match_all: bool = True) -> int:
+        """Bitmap of places having all (AND) or any (OR) of the amenities"""
+        if not self._amenity_index_ready:
+            self.rebuild_amenity_index()
+        return self.amenity_index.bitmap(amenity_ids, match_all)
+
+    def places_with_amenities(self, amenity_ids: list, match_all: bool = True) -> set:
+        """IDs of places having all (or any) of the amenities, from the bitmap index"""
+        return set(self.amenity_index.keys(self.amenity_bitmap(amenity_ids, match_all)))
+
+    def _amenity_filter(self, amenity_ids: list, match_all: bool):
+        """Predicate on place IDs for an optional amenity filter"""
+        if not amenity_ids:
+            return lambda place_id: True
+        bitmap = self.amenity_bitmap(amenity_ids, match_all)
+        return lambda place_id: self.amenity_index.contains(bitmap, place_id)
+
+    def delete_place(self, place_id: str) -> bool:
+        """Delete a place together with its reviews and rating aggregates"""
+        place = self.get_place(place_id)
+        with self.unit_of_work():
+            reviews = self.get_reviews_by_place(place.id)
+            self.repo.delete_many(Review, [review.id for review in reviews])
+            self.repo.delete(PlaceRating, place.id)
+            deleted = self.repo.delete(Place, place.id)
+        self._after_commit(self.amenity_index.remove, place.id)
+        self._after_commit(self.place_names.remove, place.id)
+        self._after_commit(self.place_columns.remove, place.id)
+        for review in reviews:
+            self._after_commit(self.review_columns.remove, review.id)
+        self._after_commit(self.sketches.mark_stale, 1 + len(reviews))
+        return deleted
+
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user, their places and their reviews, keeping aggregates in sync"""
+        user = self.get_user(user_id)
+        with self.unit_of_work():
+            # Reviews written on other hosts' places must leave their aggregates
+            for review in self.repo.get_by_attribute(Review, user_id=user.id):
+                self._change_rating(review.place_id, PlaceRating.deltas(review.rating, -1))
+                self.repo.delete(Review, review.id)
+                self._after_commit(self.review_columns.remove, review.id)
+                self._after_commit(self.sketches.mark_stale)
+            for place in self.get_places_by_host(user.id):
+                self.delete_place(place.id)
+            deleted = self.user_repo.delete(User, user.id)
+        self._invalidate_user(user_id)
+        return deleted
+
+    # Rating aggregate operations
+    def _get_rating_summary(self, place_id: str) -> PlaceRating:
+        """Get the rating aggregates of a place"""
+        return self.repo.get(PlaceRating, place_id)
+
+    def _change_rating(self, place_id: str, deltas: dict, create: bool = False) -> dict:
+        """Apply counter changes to a place's rating aggregates in one atomic increment"""
+        counts = self.repo.increment(PlaceRating, place_id, deltas, create)
+        if counts is not None:
+            self._after_commit(self.place_names.set_weight, place_id, counts['review_count'])
+        return counts
+
+    def get_place_rating(self, place_id: str) -> dict:
+        """Get count, sum, average and star histogram of a place's reviews"""
+        self.get_place(place_id)
+        summary = self._get_rating_summary(place_id)
+        return summary.to_dict() if summary else PlaceRating.empty_dict()
+
+    def rebuild_place_ratings(self) -> int:
+        """Recompute every place's rating aggregates from the stored reviews"""
+        # Autocomplete ranks places by review count, so reload it on next use
+        self._autocomplete_ready = False
+        with self.unit_of_work():
+            summaries = {summary.id: summary for summary in self.repo.get_all(PlaceRating)}
+            for summary in summaries.values():
+                summary.reset()
+            place_ids = {place_id for place_id, in self.repo.get_values(Place)}
+            # Review counts per (place, rating) come from one GROUP BY
+            for (place_id, rating), count in self.repo.count_grouped(Review, 'place_id', 'rating').items():
+                if place_id not in place_ids:
+                    continue
+                if place_id not in summaries:
+                    summaries[place_id] = PlaceRating(place_id)
+                    self.repo.add(summaries[place_id])
+                summaries[place_id].add_rating(rating, count)
+            for place_id, summary in summaries.items():
+                if place_id not in place_ids or not summary.review_count:
+                    self.repo.delete(PlaceRating, place_id)
+                else:
+                    self.repo.update(summary)
+            return sum(1 for summary in summaries.values() if summary.review_count)
+
     # Review operations
     def create_review(self, place_id: str, user_id: str, rating: int, comment: str) -> Review:
         """Create a new review"""
@@ -161,12 +648,16 @@ class HBnBFacade:
         user = self.get_user(user_id)
 
         # check if user already reviewed this place
-        existing_reviews = self.repo.get_by_attribute(Review, place_id=place_id, user_id=user_id)
-        if existing_reviews:
+        if self.repo.exists(Review, place_id=place_id, user_id=user_id):
             raise ValueError("User has already reviewed this place")
 
         review = Review(place_id, user_id, rating, comment)
-        self.repo.add(review)
+        # The review and the place's rating aggregates are committed together
+        with self.unit_of_work():
+            self.repo.add(review)
+            self._change_rating(place_id, PlaceRating.deltas(review.rating, 1), create=True)
+        self._project_review(review)
+        self._after_commit(self.sketches.add_reviewer, place.host_id, user_id)
         
         # The relationships will automatically be updated by SQLAlchemy
 
@@ -187,9 +678,21 @@ class HBnBFacade:
         """Get all reviews for a place"""
         return self.repo.get_by_attribute(Review, place_id=place_id)
 
+    def iter_reviews(self, chunk_size: int = 1000):
+        """Stream every review, oldest first, without loading them all at once"""
+        return self.repo.iter_all(Review, chunk_size)
+
+    def get_reviews_page(self, limit: int = DEFAULT_PAGE_SIZE, after: tuple = None,
+                         place_id: str = None) -> tuple:
+        """One keyset page of reviews (all, or of one place), whether more follow, and the total"""
+        if place_id is None:
+            return self._page(self.repo, Review, limit, after)
+        return self._page(self.repo, Review, limit, after, place_id=place_id)
+
     def update_review(self, review_id: str, **kwargs) -> Review:
         """Update a review"""
         review = self.get_review(review_id)
+        old_rating = review.rating
 
         # only allow updating rating and comment
         allowed_updates = ['rating', 'comment']
@@ -197,11 +700,20 @@ class HBnBFacade:
             if key not in allowed_updates:
                 del kwargs[key]
 
-        for key, value in kwargs.items():
-            if hasattr(review, key):
-                setattr(review, key, value)
+        with self.unit_of_work():
+            for key, value in kwargs.items():
+                if hasattr(review, key):
+                    setattr(review, key, value)
+
+            if review.rating != old_rating:
+                moved = {'review_count': 0, 'rating_sum': review.rating - old_rating,
+                         f'stars_{old_rating}': -1, f'stars_{review.rating}': 1}
+                if self._change_rating(review.place_id, moved) is None:
+                    self._change_rating(review.place_id, PlaceRating.deltas(review.rating, 1),
+                                        create=True)
 
-        self.repo.update(review)
+            self.repo.update(review)
+        self._project_review(review)
         return review
 
     def delete_review(self, review_id: str) -> bool:
@@ -209,18 +721,25 @@ class HBnBFacade:
         review = self.get_review(review_id)
 
         # SQLAlchemy relationships will automatically handle cleanup with cascade delete
-        return self.repo.delete(Review, review_id)
+        with self.unit_of_work():
+            deleted = self.repo.delete(Review, review_id)
+            if deleted:
+                self._change_rating(review.place_id, PlaceRating.deltas(review.rating, -1))
+        if deleted:
+            self._after_commit(self.review_columns.remove, review_id)
+            self._after_commit(self.sketches.mark_stale)
+        return deleted
 
     # Amenity operations
     def create_amenity(self, name: str) -> Amenity:
         """Create a new amenity"""
         # Check if amenity with name already exists
-        existing_amenities = self.repo.get_by_attribute(Amenity, name=name)
-        if existing_amenities:
+        if self.repo.exists(Amenity, name=name):
             raise ValueError(f"Amenity with name '{name}' already exists")
 
         amenity = Amenity(name)
         self.repo.add(amenity)
+        self._after_commit(self.amenity_names.insert, amenity.id, amenity.name)
         return amenity
 
     def get_amenity(self, amenity_id: str) -> Amenity:
@@ -230,18 +749,34 @@ class HBnBFacade:
             raise ValueError(f"Amenity with id {amenity_id} not found")
         return amenity
 
+    def get_amenities(self, amenity_ids: list) -> list:
+        """Get several amenities by ID with one batched lookup"""
+        amenities = self.repo.get_many(Amenity, amenity_ids)
+        found = {amenity.id for amenity in amenities}
+        for amenity_id in amenity_ids:
+            if amenity_id not in found:
+                raise ValueError(f"Amenity with id {amenity_id} not found")
+        return amenities
+
     def get_all_amenities(self) -> list:
         """Get all amenities"""
         return self.repo.get_all(Amenity)
 
+    def iter_amenities(self, chunk_size: int = 1000):
+        """Stream every amenity, oldest first, without loading them all at once"""
+        return self.repo.iter_all(Amenity, chunk_size)
+
+    def get_amenities_page(self, limit: int = DEFAULT_PAGE_SIZE, after: tuple = None) -> tuple:
+        """One keyset page of amenities, whether more follow, and the total count"""
+        return self._page(self.repo, Amenity, limit, after)
+
     def update_amenity(self, amenity_id: str, **kwargs) -> Amenity:
         """Update an amenity"""
         amenity = self.get_amenity(amenity_id)
 
         # check if new name already exists
         if 'name' in kwargs and kwargs['name'] != amenity.name:
-            existing = self.repo.get_by_attribute(Amenity, name=kwargs['name'])
-            if existing:
+            if self.repo.exists(Amenity, name=kwargs['name']):
                 raise ValueError(f"Amenity with name '{kwargs['name']}' already exists")
 
         for key, value in kwargs.items():
@@ -249,4 +784,195 @@ class HBnBFacade:
                 setattr(amenity, key, value)
 
         self.repo.update(amenity)
+        self._after_commit(self.amenity_names.insert, amenity.id, amenity.name)
         return amenity
+
+    # Autocomplete operations
+    def rebuild_autocomplete(self) -> int:
+        """Reload the place and amenity name indexes, returning the number of names"""
+        review_counts = dict(self.repo.get_values(PlaceRating, 'review_count'))
+        self.place_names.load((place_id, name, review_counts.get(place_id))
+                              for place_id, name in self.repo.get_values(Place, 'name'))
+        self.amenity_names.load((amenity_id, name, 0)
+                                for amenity_id, name in self.repo.get_values(Amenity, 'name'))
+        self._autocomplete_ready = True
+        return len(self.place_names) + len(self.amenity_names)
+
+    def autocomplete_places(self, prefix: str, limit: int = 10) -> list:
+        """Places with a name word starting with prefix, most reviewed first"""
+        self._check_autocomplete(prefix, limit)
+        if not self._autocomplete_ready:
+            self.rebuild_autocomplete()
+        return [{'id': place_id, 'name': name,
+                 'review_count': self.place_names.weight(place_id)}
+                for place_id, name in self.place_names.search(prefix, limit)]
+
+    def autocomplete_amenities(self, prefix: str, limit: int = 10) -> list:
+        """Amenities with a name word starting with prefix, most used first"""
+        self._check_autocomplete(prefix, limit)
+        if not self._autocomplete_ready:
+            self.rebuild_autocomplete()
+        if not self._amenity_index_ready:
+            self.rebuild_amenity_index()
+        matches = self.amenity_names.search(prefix, limit, weight=self.amenity_index.count)
+        return [{'id': amenity_id, 'name': name,
+                 'place_count': self.amenity_index.count(amenity_id)}
+                for amenity_id, name in matches]
+
+    @staticmethod
+    def _check_autocomplete(prefix: str, limit: int) -> None:
+        """Validate autocomplete arguments"""
+        if not tokenize(prefix):
+            raise ValueError("prefix must contain at least one letter or digit")
+        if not 1 <= limit <= 50:
+            raise ValueError("limit must be between 1 and 50")
+
+    # Analytics operations
+    def rebuild_stats(self) -> int:
+        """Reload the columnar place and review projections, returning the number of rows"""
+        self.place_columns.clear()
+        self.review_columns.clear()
+        for place_id, city_id, *values in self.repo.get_values(Place, 'city_id', *PLACE_STAT_COLUMNS):
+            self.place_columns.upsert(place_id, dict(zip(PLACE_STAT_COLUMNS, values)), city_id)
+        for review_id, place_id, rating in self.repo.get_values(Review, 'place_id', 'rating'):
+            self.review_columns.upsert(review_id, {'rating': rating}, place_id)
+        self._stats_ready = True
+        return len(self.place_columns) + len(self.review_columns)
+
+    def _project_place(self, place: Place) -> None:
+        """Write a place's numeric fields into the columnar projection once committed"""
+        self._after_commit(
+            self.place_columns.upsert, place.id,
+            {column: getattr(place, column) for column in PLACE_STAT_COLUMNS}, place.city_id)
+
+    def _project_review(self, review: Review) -> None:
+        """Write a review's rating into the columnar projection once committed"""
+        self._after_commit(self.review_columns.upsert, review.id, {'rating': review.rating},
+                           review.place_id)
+
+    def _check_stats(self) -> None:
+        """Load the projections on first use"""
+        if not self._stats_ready:
+            self.rebuild_stats()
+
+    def get_stats_overview(self) -> dict:
+        """Place counts, capacity totals, price quantiles and the rating distribution"""
+        self._check_stats()
+        places = self.place_columns
+        return {
+            'places': len(places),
+            'cities': len(places.group_sums('price_per_night')),
+            'capacity': {'guests': int(places.summary('max_guests')['sum']),
+                         'rooms': int(places.summary('number_of_rooms')['sum']),
+                         'bathrooms': int(places.summary('number_of_bathrooms')['sum'])},
+            'price': self.get_price_stats(),
+            'ratings': self.get_rating_stats(),
+            'engine': 'numpy' if places.vectorized else 'python'
+        }
+
+    def get_price_stats(self, quantiles=(0.5, 0.9, 0.99), city_id: str = None) -> dict:
+        """Summary and quantiles of price_per_night, over all places or one city"""
+        quantiles = list(quantiles)
+        if not quantiles or len(quantiles) > 20 or not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError("quantiles must be 1 to 20 values between 0 and 1")
+        self._check_stats()
+        group = ALL_GROUPS if city_id is None else city_id
+        stats = self.place_columns.summary('price_per_night', group)
+        values = self.place_columns.quantiles('price_per_night', quantiles, group)
+        stats['quantiles'] = {f"p{q * 100:g}": value for q, value in zip(quantiles, values)}
+        return stats
+
+    def get_city_stats(self, sort: str = 'places', limit: int = 100) -> list:
+        """Per-city place count, average price, capacity and ratings, largest first"""
+        if sort not in CITY_STAT_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(CITY_STAT_SORTS)}")
+        self._check_page_size(limit)
+        self._check_stats()
+        places = self.place_columns
+        prices = places.group_sums('price_per_night')
+        guests = places.group_sums('max_guests')
+        rooms = places.group_sums('number_of_rooms')
+        ratings = self.review_columns.group_sums('rating', regroup=places.group_of)
+        cities = []
+        for city_id, price in prices.items():
+            rating = ratings.get(city_id, {'count': 0, 'sum': 0.0})
+            cities.append({
+                'city_id': city_id,
+                'places': price['count'],
+                'average_price': price['sum'] / price['count'],
+                'total_guests': int(guests.get(city_id, {}).get('sum', 0)),
+                'total_rooms': int(rooms.get(city_id, {}).get('sum', 0)),
+                'review_count': rating['count'],
+                'average_rating': rating['sum'] / rating['count'] if rating['count'] else None
+            })
+        cities.sort(key=lambda city: (city[sort] is not None, city[sort] or 0), reverse=True)
+        return cities[:limit]
+
+    def get_rating_stats(self) -> dict:
+        """Review count, average rating and star histogram over every review"""
+        self._check_stats()
+        summary = self.review_columns.summary('rating')
+        counts = self.review_columns.value_counts('rating')
+        return {'count': summary['count'], 'average': summary['mean'],
+                'histogram': {str(stars): counts.get(float(stars), 0) for stars in range(1, 6)}}
+
+    # Sketch operations
+    def rebuild_sketches(self) -> int:
+        """Rebuild the price digests and reviewer counters from the tables, returning the row count"""
+        self.sketches.clear()
+        hosts = {}
+        for place_id, city_id, price, host_id in self.repo.get_values(
+                Place, 'city_id', 'price_per_night', 'host_id'):
+            self.sketches.add_price(city_id, price)
+            hosts[place_id] = host_id
+        for _, place_id, user_id in self.repo.get_values(Review, 'place_id', 'user_id'):
+            if place_id in hosts:
+                self.sketches.add_reviewer(hosts[place_id], user_id)
+        self._sketches_ready = True
+        return self.sketches.added
+
+    def _check_sketches(self) -> None:
+        """Build the sketches on first use, and rebuild them once deletions drift too far"""
+        if not self._sketches_ready or self.sketches.needs_rebuild():
+            self.rebuild_sketches()
+
+    def save_sketches(self, path: str = None) -> int:
+        """Write the sketches to path (default SKETCH_FILE), returning the size in bytes"""
+        path = path or self.sketch_file
+        if not path:
+            raise ValueError("SKETCH_FILE is not configured")
+        return self.sketches.save(path)
+
+    def _save_sketches_at_exit(self) -> None:
+        # Never persist sketches that were not built: the next start would trust them
+        if self._sketches_ready:
+            try:
+                self.save_sketches()
+            except OSError:
+                pass
+
+    def get_price_sketch(self, city_id: str = None, limit: int = 100) -> dict:
+        """Approximate p50/p90/p99 prices overall and per city, most places first"""
+        self._check_page_size(limit)
+        self._check_sketches()
+        if city_id is not None:
+            city_ids = [city_id]
+        else:
+            city_ids = sorted(self.sketches.prices, key=lambda city: len(self.sketches.prices[city]),
+                              reverse=True)[:limit]
+        return {
+            'overall': self.sketches.price_quantiles(SKETCH_QUANTILES, all_cities=True),
+            'cities': [dict(self.sketches.price_quantiles(SKETCH_QUANTILES, city), city_id=city)
+                       for city in city_ids]
+        }
+
+    def get_reviewer_counts(self, host_id: str = None, limit: int = 100) -> list:
+        """Approximate distinct reviewers per host, largest first"""
+        self._check_page_size(limit)
+        self._check_sketches()
+        if host_id is not None:
+            return [{'host_id': host_id, 'distinct_reviewers': self.sketches.distinct_reviewers(host_id)}]
+        counts = [{'host_id': host, 'distinct_reviewers': self.sketches.distinct_reviewers(host)}
+                  for host in self.sketches.reviewers]
+        counts.sort(key=lambda row: row['distinct_reviewers'], reverse=True)
+        return counts[:limit]
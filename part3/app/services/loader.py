@@ -0,0 +1,84 @@
+"""Request-scoped batching loader for related entity lookups.
+
+Handlers queue the ids they are going to need, and the loader resolves every
+pending id of an entity type with a single get_many (one IN query on the
+SQLAlchemy backend). Results are memoized for the rest of the request.
+"""
+
+from typing import Dict, Iterable, Optional, Type
+from flask import g, has_app_context
+from app.models.base_model import BaseModel
+from app.models.user import User
+
+
+class BatchLoader:
+    """Collects ids per model class and resolves them in batches"""
+
+    def __init__(self, facade):
+        self._facade = facade
+        self._cache: Dict[Type[BaseModel], Dict[str, Optional[BaseModel]]] = {}
+        self._pending: Dict[Type[BaseModel], Dict[str, None]] = {}
+
+    def _repository(self, model_class: Type[BaseModel]):
+        """Users live in the user repository, everything else in the main one"""
+        if model_class is User:
+            return self._facade.user_repo
+        return self._facade.repo
+
+    def queue(self, model_class: Type[BaseModel], obj_ids: Iterable[str]) -> None:
+        """Register ids to be fetched with the next batch of this model class"""
+        cache = self._cache.setdefault(model_class, {})
+        pending = self._pending.setdefault(model_class, {})
+        for obj_id in obj_ids:
+            if obj_id is not None and obj_id not in cache:
+                pending[obj_id] = None
+
+    def _dispatch(self, model_class: Type[BaseModel]) -> None:
+        """Resolve every pending id of a model class with one batched lookup"""
+        pending = self._pending.pop(model_class, None)
+        if not pending:
+            return
+        cache = self._cache.setdefault(model_class, {})
+        found = self._repository(model_class).get_many(model_class, pending)
+        for obj in found:
+            cache[obj.id] = obj
+        for obj_id in pending:
+            cache.setdefault(obj_id, None)
+
+    def load(self, model_class: Type[BaseModel], obj_id: str) -> Optional[BaseModel]:
+        """Return one object (or None), flushing the pending batch if needed"""
+        self.queue(model_class, [obj_id])
+        self._dispatch(model_class)
+        return self._cache[model_class].get(obj_id)
+
+    def load_many(self, model_class: Type[BaseModel],
+                  obj_ids: Iterable[str]) -> Dict[str, Optional[BaseModel]]:
+        """Return a mapping of id to object (or None) for the given ids"""
+        obj_ids = list(obj_ids)
+        self.queue(model_class, obj_ids)
+        self._dispatch(model_class)
+        cache = self._cache[model_class]
+        return {obj_id: cache.get(obj_id) for obj_id in obj_ids}
+
+    def prime(self, obj: BaseModel) -> None:
+        """Store an already loaded object so later lookups skip the repository"""
+        self._cache.setdefault(type(obj), {})[obj.id] = obj
+
+    def clear(self, model_class: Type[BaseModel] = None, obj_id: str = None) -> None:
+        """Forget cached objects (all, one model class, or a single id)"""
+        if model_class is None:
+            self._cache.clear()
+        elif obj_id is None:
+            self._cache.pop(model_class, None)
+        else:
+            self._cache.get(model_class, {}).pop(obj_id, None)
+
+
+def get_loader() -> BatchLoader:
+    """Return the loader of the current request, creating it on first use"""
+    from app.services import facade
+    if not has_app_context():
+        return BatchLoader(facade)
+    if 'batch_loader' not in g:
+        g.batch_loader = BatchLoader(facade)
+    return g.batch_loader
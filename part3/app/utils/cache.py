@@ -0,0 +1,106 @@
+"""Small thread-safe LRU cache with per-entry time-to-live"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds.
+
+    A caller filling a miss takes generation() before loading the value and
+    passes it to set(); if the key was invalidated in between, the loaded
+    value may be stale and set() drops it.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        # Bumped by every invalidation; key -> value of its last invalidation
+        self._clock = 0
+        self._invalidated = OrderedDict()
+        # Newest invalidation no longer tracked per key
+        self._forgotten = 0
+        self.configure(maxsize, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        """Change the size bound and/or time-to-live, dropping current entries"""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = int(maxsize)
+            if ttl is not None:
+                self.ttl = float(ttl)
+            self._drop_all()
+
+    def get(self, key):
+        """Return the cached value, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def generation(self):
+        """Token to pass to set() for a value about to be loaded"""
+        with self._lock:
+            return self._clock
+
+    def set(self, key, value, generation=None):
+        """Store a value, evicting the least recently used entry if full.
+
+        With a generation from generation(), the value is dropped if key was
+        invalidated since that token was taken.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._forgotten) > generation:
+                return
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """Drop a single entry and turn away values loaded before this call"""
+        with self._lock:
+            self._data.pop(key, None)
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            # Keys dropped from this record count as invalidated at their
+            # last invalidation, so an in-flight set() errs on not caching
+            while len(self._invalidated) > max(self.maxsize, 1):
+                self._forgotten = self._invalidated.popitem(last=False)[1]
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._drop_all()
+
+    def _drop_all(self):
+        """Drop every entry and turn away values loaded before now"""
+        self._data.clear()
+        self._clock += 1
+        self._invalidated.clear()
+        self._forgotten = self._clock
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,40 @@
+"""Geographic helpers for location-based place search"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(lat, lon, radius_km):
+    """Boxes (min_lat, min_lon, max_lat, max_lon) covering a circle.
+
+    Returns two boxes when the circle crosses the antimeridian, so every box
+    satisfies min_lon <= max_lon. Uses the same sphere as haversine_km, and
+    the widest longitude span of the circle (reached poleward of its centre).
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    d_lat = math.degrees(angle)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle contains a pole: every longitude is in range
+        return [(max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)]
+
+    ratio = math.sin(angle) / math.cos(math.radians(lat))
+    if ratio >= 1:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    d_lon = math.degrees(math.asin(ratio))
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        return [(min_lat, min_lon + 360, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
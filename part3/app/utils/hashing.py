@@ -0,0 +1,138 @@
+"""Off-thread bcrypt hashing and verification.
+
+bcrypt is deliberately slow, so running it inside the request thread pins a
+worker for the whole hash. PasswordHasher hands the work to a bounded thread
+or process pool and waits for it with a timeout, rejecting new work when too
+much is already queued.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+class PasswordHashingUnavailable(RuntimeError):
+    """Raised when the hashing pool is saturated or a hash timed out"""
+
+
+class PasswordHasher:
+    """Runs Flask-Bcrypt hashing and checks on a bounded executor"""
+
+    EXECUTORS = ('thread', 'process', 'inline')
+
+    def __init__(self, bcrypt_ext, app=None):
+        self._bcrypt = bcrypt_ext
+        self._executor = None
+        self._mode = 'inline'
+        self._workers = 1
+        self._max_queue = 0
+        self._timeout = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._reset_metrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the pool from the PASSWORD_HASHER_* settings"""
+        mode = app.config.get('PASSWORD_HASHER_EXECUTOR', 'thread')
+        if mode not in self.EXECUTORS:
+            raise ValueError(f"PASSWORD_HASHER_EXECUTOR must be one of {self.EXECUTORS}")
+        self.shutdown()
+        self._mode = mode
+        self._workers = app.config.get('PASSWORD_HASHER_WORKERS') or os.cpu_count() or 1
+        self._max_queue = app.config.get('PASSWORD_HASHER_MAX_QUEUE', 64)
+        self._timeout = app.config.get('PASSWORD_HASHER_TIMEOUT', 10.0)
+        if mode == 'thread':
+            self._executor = ThreadPoolExecutor(max_workers=self._workers,
+                                                thread_name_prefix='bcrypt')
+        elif mode == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        self._reset_metrics()
+
+    def shutdown(self):
+        """Stop the executor (pending work is allowed to finish)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _reset_metrics(self):
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _record_latency(self, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._completed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+
+    def _run(self, func, *args):
+        """Run func on the executor (or inline) and wait for the result"""
+        started = time.perf_counter()
+        if self._executor is None:
+            with self._lock:
+                self._submitted += 1
+            try:
+                return func(*args)
+            finally:
+                self._record_latency(started)
+
+        with self._lock:
+            if self._in_flight >= self._workers + self._max_queue:
+                self._rejected += 1
+                raise PasswordHashingUnavailable("Password hashing queue is full, try again later")
+            self._in_flight += 1
+            self._submitted += 1
+
+        def done(finished):
+            with self._lock:
+                self._in_flight -= 1
+            if not finished.cancelled():
+                self._record_latency(started)
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(done)
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise PasswordHashingUnavailable("Password hashing timed out, try again later")
+
+    def generate_password_hash(self, password):
+        """Hash a password and return it as a string"""
+        return self._run(self._bcrypt.generate_password_hash, password).decode('utf-8')
+
+    def check_password_hash(self, pw_hash, password):
+        """Check a password against a stored hash"""
+        return self._run(self._bcrypt.check_password_hash, pw_hash, password)
+
+    def metrics(self):
+        """Queue depth, throughput counters and hash latency of the pool"""
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self._completed
+            average = self._latency_total / completed if completed else 0.0
+            return {
+                'executor': self._mode,
+                'workers': self._workers,
+                'max_queue': self._max_queue,
+                'timeout_seconds': self._timeout,
+                'in_flight': in_flight,
+                'queue_length': max(0, in_flight - self._workers),
+                'submitted': self._submitted,
+                'completed': completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+                'avg_latency_ms': round(average * 1000, 3),
+                'max_latency_ms': round(self._latency_max * 1000, 3),
+                'log_rounds': self._bcrypt._log_rounds
+            }
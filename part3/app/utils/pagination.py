@@ -0,0 +1,53 @@
+"""Keyset (cursor) pagination helpers for the list endpoints"""
+
+import base64
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(obj) -> str:
+    """Opaque cursor pointing just after obj in (created_at, id) order"""
+    raw = f"{obj.created_at.isoformat()}|{obj.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Turn a cursor back into the (created_at, id) pair it points after"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, obj_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), obj_id
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def parse_page_args(args) -> tuple:
+    """Read 'limit' and 'cursor' from the query string as (limit, after)"""
+    try:
+        limit = int(args.get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be a valid int")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = args.get('cursor')
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def _page_url(**params) -> str:
+    """URL of the current request with some query parameters replaced (None drops one)"""
+    args = request.args.to_dict()
+    args.update(params)
+    query = urlencode({key: value for key, value in args.items() if value is not None})
+    return f"{request.base_url}?{query}" if query else request.base_url
+
+
+def page_headers(items: list, more: bool, total: int) -> dict:
+    """X-Total-Count and Link (first, next) headers for one page of results"""
+    links = [f'<{_page_url(cursor=None)}>; rel="first"']
+    if more and items:
+        links.append(f'<{_page_url(cursor=encode_cursor(items[-1]))}>; rel="next"')
+    return {'X-Total-Count': str(total), 'Link': ', '.join(links)}
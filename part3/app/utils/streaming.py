@@ -0,0 +1,64 @@
+"""Chunked JSON array and NDJSON responses for streaming list endpoints"""
+
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+from flask import Response, request, stream_with_context
+from flask_restx import marshal
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+
+# Objects serialized per chunk written to the response
+STREAM_CHUNK_SIZE = 500
+
+
+def stream_format() -> Optional[str]:
+    """Mimetype of the streamed listing the request asks for, or None for a normal page.
+
+    'Accept: application/x-ndjson' selects NDJSON, '?stream=true' a chunked
+    JSON array.
+    """
+    if request.accept_mimetypes.best_match([JSON, NDJSON]) == NDJSON:
+        return NDJSON
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return JSON
+    return None
+
+
+def _chunks(objs: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(objs)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _encode(objs: Iterable, serialize: Callable, model, mimetype: str,
+            chunk_size: int) -> Iterator[str]:
+    """Serialize, marshal and encode objects one chunk at a time"""
+    if mimetype != NDJSON:
+        yield '['
+    first = True
+    for chunk in _chunks(objs, chunk_size):
+        rows = [json.dumps(row) for row in marshal(serialize(chunk), model)]
+        if mimetype == NDJSON:
+            yield ''.join(row + '\n' for row in rows)
+        else:
+            yield ('' if first else ',') + ','.join(rows)
+            first = False
+    if mimetype != NDJSON:
+        yield ']'
+
+
+def streamed_response(objs: Iterable, serialize: Callable, model, mimetype: str,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Response:
+    """Stream objs as a JSON array or NDJSON without building the whole list.
+
+    serialize turns a list of objects into a list of dicts, which are then
+    marshalled with model like a regular response.
+    """
+    return Response(stream_with_context(_encode(objs, serialize, model, mimetype, chunk_size)),
+                    mimetype=mimetype)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.asgi import create_asgi_app
+
+# Serve with any ASGI server, e.g. `uvicorn asgi:app --workers 4`
+app = create_asgi_app(os.getenv('FLASK_ENV', 'development'))
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
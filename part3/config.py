@@ -10,25 +10,67 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_ALGORITHM = 'HS256'
+    # Cache of users resolved from JWTs (entries, seconds); size 0 disables it
+    JWT_USER_CACHE_SIZE = int(os.environ.get('JWT_USER_CACHE_SIZE', 1024))
+    JWT_USER_CACHE_TTL = float(os.environ.get('JWT_USER_CACHE_TTL', 300))
+    
+    # Password hashing configuration
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASHER_EXECUTOR = os.environ.get('PASSWORD_HASHER_EXECUTOR', 'thread')  # thread, process or inline
+    PASSWORD_HASHER_WORKERS = int(os.environ.get('PASSWORD_HASHER_WORKERS', 0)) or None  # None = CPU count
+    PASSWORD_HASHER_MAX_QUEUE = int(os.environ.get('PASSWORD_HASHER_MAX_QUEUE', 64))
+    PASSWORD_HASHER_TIMEOUT = float(os.environ.get('PASSWORD_HASHER_TIMEOUT', 10))
     
     # SQLAlchemy Configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    # Wrap each request in a single unit of work (one commit per request)
+    UNIT_OF_WORK_PER_REQUEST = os.environ.get('UNIT_OF_WORK_PER_REQUEST', '').lower() in ('1', 'true', 'yes')
+    # Connection pool options passed to create_engine(); pool sizing is ignored
+    # for in-memory SQLite, which always uses a single static connection
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),  # seconds
+    }
+    # PRAGMAs run on every new SQLite connection (ignored by other databases)
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),  # readers no longer block the writer
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),  # fsync at checkpoints, not every commit
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -65536)),  # negative = KiB, i.e. 64 MiB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bytes
+        'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms to wait for a lock
+    }
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///hbnb_dev.db')
     SQLALCHEMY_ECHO = True  # Enable SQL query logging in development
+    SQLALCHEMY_ENGINE_OPTIONS = dict(Config.SQLALCHEMY_ENGINE_OPTIONS,
+                                     pool_size=int(os.environ.get('DB_POOL_SIZE', 5)))
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///hbnb_prod.db')
     SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = dict(Config.SQLALCHEMY_ENGINE_OPTIONS,
+                                     pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+                                     max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)))
+
+class TestingConfig(Config):
+    """Testing and benchmarking configuration"""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
+    # Minimum bcrypt cost so tests and benchmarks are not dominated by hashing
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 4))
+    # Test databases are throwaway: skip fsync entirely
+    SQLITE_PRAGMAS = dict(Config.SQLITE_PRAGMAS, synchronous=os.environ.get('SQLITE_SYNCHRONOUS', 'OFF'))
 
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Compare requests/sec of the place detail endpoint on the WSGI (Flask) and
+ASGI (async facade) paths
+
+Both applications are called in-process, the WSGI one from a pool of worker
+threads and the ASGI one from asyncio tasks, so the numbers exclude the HTTP
+server. The sqlalchemy repository needs
+aiosqlite for the ASGI side; --latency-ms adds a delay to every SQL statement
+to stand in for a database across the network.
+
+Usage: python scripts/benchmark_asgi.py [--repository in_memory|sqlalchemy]
+                                        [--places 200] [--requests 5000] [--concurrency 64]
+                                        [--wsgi-threads 8] [--latency-ms 0]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seconds slept per SQL statement, switched on once the data is seeded
+LATENCY = [0.0]
+
+def _delay(statement):
+    if LATENCY[0]:
+        time.sleep(LATENCY[0])
+
+@event.listens_for(Engine, 'connect')
+def add_statement_latency(dbapi_connection, connection_record):
+    """Sleep in SQLite's trace callback, on the thread running the statement.
+
+    That is the WSGI worker, or the aiosqlite connection thread, so the
+    event loop keeps running while an async query waits.
+    """
+    if hasattr(dbapi_connection, 'run_async'):
+        dbapi_connection.run_async(lambda connection: connection.set_trace_callback(_delay))
+    else:
+        dbapi_connection.set_trace_callback(_delay)
+
+def seed(flask_app, places):
+    """Create places with a host, amenities and reviews; return their IDs"""
+    from app import db
+    from app.services import facade
+
+    with flask_app.app_context():
+        db.create_all()
+        host = facade.create_user("bench.host@example.com", "Bench", "Host")
+        guests = [facade.create_user(f"bench.guest{i}@example.com", "Bench", "Guest") for i in range(5)]
+        amenities = [facade.create_amenity(name) for name in ("Wifi", "Kitchen", "Parking")]
+        place_ids = []
+        for i in range(places):
+            place = facade.create_place(
+                name=f"Bench Place {i}", description="A place to measure", address=f"{i} Bench St",
+                city_id=f"city-{i % 20}", latitude=45.0, longitude=5.0, host_id=host.id,
+                number_of_rooms=2, number_of_bathrooms=1, price_per_night=50 + i % 200, max_guests=4,
+                amenity_ids=[amenity.id for amenity in amenities[:1 + i % 3]])
+            for guest in guests[:i % 5]:
+                facade.create_review(place.id, guest.id, 1 + i % 5, "Benchmarked")
+            place_ids.append(place.id)
+        return place_ids
+
+def wsgi_environ(path):
+    return {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+            'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            'wsgi.run_once': False}
+
+def bench_wsgi(flask_app, paths, threads):
+    """Seconds to serve every path with a pool of worker threads"""
+    def call(path):
+        statuses = []
+        body = flask_app.wsgi_app(wsgi_environ(path), lambda status, headers: statuses.append(status))
+        b''.join(body)
+        assert statuses[0].startswith('200'), statuses
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, paths))
+    return time.perf_counter() - start
+
+async def bench_asgi(asgi_app, paths, concurrency):
+    """Seconds to serve every path with concurrency tasks in flight"""
+    queue = list(reversed(paths))
+
+    async def worker():
+        while queue:
+            path = queue.pop()
+            messages = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                messages.append(message)
+
+            await asgi_app({'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+                            'headers': []}, receive, send)
+            assert messages[0]['status'] == 200, messages[0]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repository', choices=('in_memory', 'sqlalchemy'), default='in_memory')
+    parser.add_argument('--places', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help="requests in flight on the ASGI side")
+    parser.add_argument('--wsgi-threads', type=int, default=8,
+                        help="worker threads of the WSGI side, as in a threaded WSGI server")
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help="simulated round trip per SQL statement (sqlalchemy only)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='hbnb-bench-')
+    os.environ['REPOSITORY_TYPE'] = args.repository
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    from app.asgi import create_asgi_app
+
+    # One pooled connection per query in flight (the place detail runs three at once)
+    engine_options = ({'pool_size': 3 * args.concurrency, 'max_overflow': 0}
+                      if args.repository == 'sqlalchemy' else {})
+    asgi_app = create_asgi_app('testing', **engine_options)
+    place_ids = seed(asgi_app.flask_app, args.places)
+    LATENCY[0] = args.latency_ms / 1000
+    rng = random.Random(1)
+    paths = [f"/api/v1/places/{rng.choice(place_ids)}" for _ in range(args.requests)]
+
+    print("=" * 50)
+    print(f"Place detail, {args.repository} repository, {args.requests:,} requests, "
+          f"{args.wsgi_threads} WSGI threads, {args.concurrency} ASGI requests in flight"
+          + (f", {args.latency_ms:g} ms per statement" if args.latency_ms else ""))
+    print("=" * 50)
+    # One warm-up pass each so lazy indexes and connection pools are ready
+    results = {}
+    bench_wsgi(asgi_app.flask_app, paths[:50], args.wsgi_threads)
+    results['WSGI'] = bench_wsgi(asgi_app.flask_app, paths, args.wsgi_threads)
+
+    async def run_asgi():
+        try:
+            await bench_asgi(asgi_app, paths[:50], args.concurrency)
+            return await bench_asgi(asgi_app, paths, args.concurrency)
+        finally:
+            await asgi_app.facade.close()
+    results['ASGI'] = asyncio.run(run_asgi())
+    for name, elapsed in results.items():
+        print(f"{name:6} {args.requests / elapsed:10.0f} req/s  ({elapsed:.2f}s)")
+    print(f"ASGI/WSGI throughput: {results['WSGI'] / results['ASGI']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare the memory used per place by InMemoryRepository (mapped models) and
+CompactInMemoryRepository (__slots__ records)
+
+Usage: python scripts/benchmark_inmemory_memory.py [--places 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def measure(repo_class, count, with_indexes):
+    """Bytes retained per place after storing count places"""
+    from app.models.place import Place
+
+    repo = repo_class()
+    repo._storage['Place'] = {}
+    objects = repo._storage['Place']
+    host_id = '00000000-0000-4000-8000-000000000000'
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for i in range(count):
+        place = Place(f"Place {i}", "A quiet room near the station", f"{i} Benchmark Street",
+                      f"city-{i % 500}", 48.0 + (i % 1000) / 1000, 2.0 + (i % 997) / 1000,
+                      host_id, 1 + i % 5, 1 + i % 3, 50 + i % 400, 2 + i % 6)
+        if with_indexes:
+            repo.add(place)
+        else:
+            objects[place.id] = place
+    del place
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+    del repo, objects
+    gc.collect()
+    return retained / count, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--places', type=int, default=1_000_000)
+    parser.add_argument('--with-indexes', action='store_true',
+                        help="add through repo.add() so the secondary indexes are included")
+    args = parser.parse_args()
+
+    from app.persistence.compact_repository import CompactInMemoryRepository
+    from app.persistence.repository import InMemoryRepository
+
+    print("=" * 50)
+    print(f"In-memory storage for {args.places:,} places"
+          + (" (with indexes)" if args.with_indexes else ""))
+    print("=" * 50)
+    results = {}
+    for repo_class in (InMemoryRepository, CompactInMemoryRepository):
+        per_place, elapsed = measure(repo_class, args.places, args.with_indexes)
+        results[repo_class] = per_place
+        print(f"{repo_class.__name__:28} {per_place:8.0f} B/place "
+              f"{per_place * args.places / 2**20:9.1f} MiB  ({elapsed:.1f}s)")
+    ratio = results[InMemoryRepository] / results[CompactInMemoryRepository]
+    print(f"Records use {ratio:.1f}x less memory per place")
+
+if __name__ == "__main__":
+    main()
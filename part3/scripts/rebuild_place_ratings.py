@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-place rating aggregates (count, sum, average, star histogram)
+from the reviews already stored in the database
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def rebuild_place_ratings():
+    """Recompute every place's rating aggregates"""
+
+    # Set environment to use SQLAlchemy
+    os.environ['REPOSITORY_TYPE'] = 'sqlalchemy'
+
+    from app import create_app, db
+    from app.services.facade import HBnBFacade
+
+    app = create_app(os.getenv('FLASK_ENV', 'development'))
+
+    with app.app_context():
+        try:
+            # Make sure the aggregates table exists on older databases
+            db.create_all()
+
+            print("Rebuilding place rating aggregates...")
+            count = HBnBFacade().rebuild_place_ratings()
+            print(f"✅ Rebuilt rating aggregates for {count} places")
+        except Exception as e:
+            print(f"❌ Error rebuilding rating aggregates: {e}")
+            return False
+
+    return True
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("HBnB Place Rating Rebuild")
+    print("=" * 50)
+
+    if not rebuild_place_ratings():
+        sys.exit(1)
@@ -3,6 +3,7 @@
 -- Based on SQLAlchemy models: User, Place, Review, Amenity, and their relationships
 
 -- Drop tables if they exist (in reverse order due to foreign key constraints)
+DROP TABLE IF EXISTS place_ratings;
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
@@ -23,6 +24,7 @@ CREATE TABLE users (
 
 -- Create index on email for faster lookups
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX idx_users_created ON users(created_at, id);
 
 -- Create Amenities table
 CREATE TABLE amenities (
@@ -34,6 +36,7 @@ CREATE TABLE amenities (
 
 -- Create index on amenity name for faster lookups
 CREATE INDEX idx_amenities_name ON amenities(name);
+CREATE INDEX idx_amenities_created ON amenities(created_at, id);
 
 -- Create Places table
 CREATE TABLE places (
@@ -68,6 +71,10 @@ CREATE TABLE places (
 CREATE INDEX idx_places_host_id ON places(host_id);
 CREATE INDEX idx_places_city_id ON places(city_id);
 CREATE INDEX idx_places_price ON places(price_per_night);
+CREATE INDEX idx_places_max_guests ON places(max_guests);
+CREATE INDEX idx_places_rooms ON places(number_of_rooms);
+CREATE INDEX idx_places_city_price ON places(city_id, price_per_night);
+CREATE INDEX idx_places_created ON places(created_at, id);
 
 -- Create Reviews table
 CREATE TABLE reviews (
@@ -94,6 +101,8 @@ CREATE TABLE reviews (
 CREATE INDEX idx_reviews_place_id ON reviews(place_id);
 CREATE INDEX idx_reviews_user_id ON reviews(user_id);
 CREATE INDEX idx_reviews_rating ON reviews(rating);
+CREATE INDEX idx_reviews_created ON reviews(created_at, id);
+CREATE INDEX idx_reviews_place_created ON reviews(place_id, created_at, id);
 
 -- Create Place-Amenity association table (Many-to-Many relationship)
 CREATE TABLE place_amenity (
@@ -112,6 +121,23 @@ CREATE TABLE place_amenity (
 CREATE INDEX idx_place_amenity_place_id ON place_amenity(place_id);
 CREATE INDEX idx_place_amenity_amenity_id ON place_amenity(amenity_id);
 
+-- Create Place Ratings table (incrementally maintained review aggregates, one row per place)
+CREATE TABLE place_ratings (
+    id VARCHAR(36) PRIMARY KEY,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    stars_1 INTEGER NOT NULL DEFAULT 0,
+    stars_2 INTEGER NOT NULL DEFAULT 0,
+    stars_3 INTEGER NOT NULL DEFAULT 0,
+    stars_4 INTEGER NOT NULL DEFAULT 0,
+    stars_5 INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    
+    -- Foreign key constraints (id is the summarized place's id)
+    CONSTRAINT fk_place_ratings_place FOREIGN KEY (id) REFERENCES places(id) ON DELETE CASCADE
+);
+
 -- Display schema creation status
 SELECT 'HBnB Database Schema Created Successfully!' AS status;
-SELECT 'Tables created: users, amenities, places, reviews, place_amenity' AS tables;
\ No newline at end of file
+SELECT 'Tables created: users, amenities, places, reviews, place_amenity, place_ratings' AS tables;
\ No newline at end of file
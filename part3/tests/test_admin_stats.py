@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar analytics projection and admin statistics endpoints
+"""
+
+import os
+import statistics
+import sys
+import uuid
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.persistence import columnar
+from app.persistence.columnar import ColumnTable
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+ENGINES = (True, False) if columnar.np is not None else (False,)
+
+def test_column_table():
+    """Test aggregates, quantiles and group sums on both engines"""
+    print("Testing ColumnTable...")
+    prices = [40, 55, 70, 90, 120, 150, 300]
+    for vectorized in ENGINES:
+        table = ColumnTable(('price', 'guests'), capacity=2, vectorized=vectorized)
+        for i, price in enumerate(prices):
+            table.upsert(f"p{i}", {'price': price, 'guests': 2 + i % 3}, 'lyon' if i % 2 else 'nice')
+        table.upsert("p7", {'price': None, 'guests': 4}, 'nice')
+        assert len(table) == 8
+
+        summary = table.summary('price')
+        assert summary['count'] == 7 and summary['sum'] == sum(prices)
+        assert summary['min'] == 40 and summary['max'] == 300
+        assert table.quantiles('price', [0.5]) == [90.0]
+        assert table.quantiles('price', [0.25, 0.75]) == [62.5, 135.0]
+        assert table.summary('price', 'lyon')['count'] == 3
+        assert table.quantiles('price', [0.5], 'paris') == [None]
+
+        sums = table.group_sums('price')
+        assert sums == {'nice': {'count': 4, 'sum': 40 + 70 + 120 + 300},
+                        'lyon': {'count': 3, 'sum': 55 + 90 + 150}}
+        merged = table.group_sums('guests', regroup=lambda city: 'france')
+        assert merged == {'france': {'count': 8, 'sum': sum(2 + i % 3 for i in range(7)) + 4}}
+
+        # Freed rows are reused and no longer counted
+        table.remove("p6")
+        table.upsert("p8", {'price': 60}, 'paris')
+        assert table.summary('price')['max'] == 150 and len(table) == 8
+        assert table.value_counts('guests') == {2.0: 2, 3.0: 2, 4.0: 3}
+        assert table.group_of("p8") == 'paris' and table.group_of("p6") is None
+    print("✅ ColumnTable aggregates work")
+
+def _seed(facade, city):
+    """Create places in a city and reviews on them"""
+    host = facade.create_user(f"host.{city}@example.com", "Stat", "Host")
+    guests = [facade.create_user(f"guest{i}.{city}@example.com", "Stat", "Guest") for i in range(3)]
+    places = [facade.create_place(
+        name=f"Stat Place {i}", description="", address=f"{i} Stats Ave", city_id=city,
+        latitude=45.0, longitude=5.0, host_id=host.id, number_of_rooms=i + 1,
+        number_of_bathrooms=1, price_per_night=price, max_guests=2 * (i + 1)
+    ) for i, price in enumerate((80, 100, 240))]
+    for guest, rating in zip(guests, (5, 4, 2)):
+        facade.create_review(places[0].id, guest.id, rating, "Numbers")
+    return host, guests, places
+
+def _check_facade_stats(facade):
+    """Run the same statistics checks against any facade"""
+    host, guests, places = _seed(facade, "grenoble")
+    overview = facade.get_stats_overview()
+    assert overview['places'] == 3 and overview['cities'] == 1
+    assert overview['capacity'] == {'guests': 12, 'rooms': 6, 'bathrooms': 3}
+    assert overview['price']['quantiles']['p50'] == 100
+    assert overview['ratings'] == {'count': 3, 'average': 11 / 3,
+                                   'histogram': {'1': 0, '2': 1, '3': 0, '4': 1, '5': 1}}
+
+    # Writes update the projection incrementally
+    _seed(facade, "annecy")
+    facade.update_place(places[2].id, price_per_night=120)
+    review = facade.get_reviews_by_place(places[0].id)[-1]
+    facade.update_review(review.id, rating=3)
+    prices = [80, 100, 120, 80, 100, 240]
+    stats = facade.get_price_stats([0.5, 0.9])
+    assert stats['count'] == 6 and stats['mean'] == statistics.mean(prices)
+    assert stats['quantiles'] == {'p50': 100.0, 'p90': 180.0}
+    assert facade.get_price_stats([0.5], city_id="grenoble")['quantiles'] == {'p50': 100.0}
+
+    cities = facade.get_city_stats(sort='average_price')
+    assert [city['city_id'] for city in cities] == ["annecy", "grenoble"]
+    assert cities[1] == {'city_id': "grenoble", 'places': 3, 'average_price': 100.0,
+                         'total_guests': 12, 'total_rooms': 6, 'review_count': 3,
+                         'average_rating': 4.0}
+
+    facade.delete_place(places[0].id)
+    assert facade.get_rating_stats()['count'] == 3
+    facade.delete_user(host.id)
+    assert facade.get_stats_overview()['places'] == 3
+    assert facade.rebuild_stats() == 3 + 3
+    for bad in ([], [1.5]):
+        try:
+            facade.get_price_stats(bad)
+            assert False, "Invalid quantiles should be rejected"
+        except ValueError:
+            pass
+
+def test_in_memory_stats():
+    """Test the statistics facade on the in-memory repository"""
+    print("\nTesting in-memory statistics...")
+    repo = InMemoryRepository()
+    _check_facade_stats(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory statistics work")
+
+def test_sqlalchemy_stats():
+    """Test the statistics facade on the SQLAlchemy repositories"""
+    print("\nTesting SQLAlchemy statistics...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _check_facade_stats(HBnBFacade(repository=SQLAlchemyRepository(),
+                                       user_repository=UserRepository()))
+    print("✅ SQLAlchemy statistics work")
+
+def test_stats_endpoints():
+    """Test the /api/v1/admin/stats endpoints"""
+    print("\nTesting admin statistics endpoints...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        db.create_all()
+        suffix = uuid.uuid4().hex[:8]
+        admin = facade.create_user(f"stats.{suffix}@example.com", "Stat", "Admin", is_admin=True)
+        _seed(facade, f"city-{suffix}")
+        admin_headers = {'Authorization': f'Bearer {create_access_token(identity=admin.id, additional_claims={"is_admin": True})}'}
+        member_headers = {'Authorization': f'Bearer {create_access_token(identity=admin.id)}'}
+
+        response = client.get('/api/v1/admin/stats', headers=admin_headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['places'] >= 3 and body['engine'] in ('numpy', 'python')
+
+        response = client.get(f'/api/v1/admin/stats/prices?quantiles=0.5&city_id=city-{suffix}',
+                              headers=admin_headers)
+        assert response.get_json()['quantiles'] == {'p50': 100.0}
+        response = client.get('/api/v1/admin/stats/cities?sort=review_count&limit=1', headers=admin_headers)
+        assert response.status_code == 200 and len(response.get_json()) == 1
+        assert client.get('/api/v1/admin/stats/ratings', headers=admin_headers).get_json()['count'] >= 3
+
+        assert client.get('/api/v1/admin/stats/prices?quantiles=2', headers=admin_headers).status_code == 400
+        assert client.get('/api/v1/admin/stats/cities?sort=name', headers=admin_headers).status_code == 400
+        assert client.get('/api/v1/admin/stats', headers=member_headers).status_code == 403
+    print("✅ Admin statistics endpoints work")
+
+if __name__ == "__main__":
+    test_column_table()
+    test_in_memory_stats()
+    test_sqlalchemy_stats()
+    test_stats_endpoints()
+    print("\n🎉 All admin statistics tests passed!")
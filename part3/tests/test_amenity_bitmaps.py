@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-amenity bitmap index used by place filters
+"""
+
+import os
+import sys
+import time
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.place import Place
+from app.persistence.indexes import BitmapIndex
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def _populate(facade):
+    host = facade.create_user("bitmaphost@example.com", "Bitmap", "Host")
+    amenities = {name: facade.create_amenity(name).id for name in ("WiFi", "Pool", "Parking")}
+    layout = {
+        "Both": ["WiFi", "Pool"],
+        "WiFi only": ["WiFi"],
+        "Pool only": ["Pool"],
+        "Nothing": [],
+    }
+    places = {}
+    for name, amenity_names in layout.items():
+        places[name] = facade.create_place(
+            name=name, description="", address=name, city_id="paris",
+            latitude=48.85, longitude=2.35, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=100, max_guests=2,
+            amenity_ids=[amenities[a] for a in amenity_names]
+        )
+    return amenities, places
+
+def _names(places):
+    return sorted(place.name for place in places)
+
+def _check_bitmaps(facade, fresh_facade):
+    """Run the same amenity filter checks against any facade"""
+    amenities, places = _populate(facade)
+    wifi, pool, parking = amenities["WiFi"], amenities["Pool"], amenities["Parking"]
+
+    assert _names(facade.filter_places(amenity_ids=[wifi, pool])) == ["Both"]
+    assert _names(facade.filter_places(amenity_ids=[wifi, pool], match_all_amenities=False)) == \
+        ["Both", "Pool only", "WiFi only"]
+    assert facade.filter_places(amenity_ids=[parking]) == []
+
+    # Incremental maintenance
+    facade.add_place_amenity(places["Nothing"].id, parking)
+    assert _names(facade.filter_places(amenity_ids=[parking])) == ["Nothing"]
+    facade.remove_place_amenity(places["Both"].id, pool)
+    facade.update_place(places["WiFi only"].id, amenity_ids=[wifi, pool])
+    assert _names(facade.filter_places(amenity_ids=[wifi, pool])) == ["WiFi only"]
+    facade.delete_place(places["WiFi only"].id)
+    assert facade.filter_places(amenity_ids=[wifi, pool]) == []
+
+    # Radius search honours the same filter
+    ranked = facade.search_places_nearby(48.85, 2.35, 5, amenity_ids=[pool])
+    assert [place.name for place, _ in ranked] == ["Pool only"]
+
+    # A facade started later builds the same bitmaps from place_amenity
+    assert fresh_facade.places_with_amenities([wifi]) == {places["Both"].id}
+    assert fresh_facade.places_with_amenities([parking]) == {places["Nothing"].id}
+
+def test_bitmap_index():
+    """Test AND/OR matching and ordinal reuse"""
+    print("Testing bitmap index...")
+    index = BitmapIndex()
+    index.set("p1", ["wifi", "pool"])
+    index.set("p2", ["wifi"])
+    index.set("p3", ["pool"])
+    assert index.match(["wifi", "pool"]) == ["p1"]
+    assert sorted(index.match(["wifi", "pool"], match_all=False)) == ["p1", "p2", "p3"]
+    assert index.count("wifi") == 2
+    assert index.count("wifi", index.bitmap(["pool"])) == 1
+
+    index.remove("p1")
+    index.set("p4", ["pool"])
+    assert len(index) == 3
+    assert sorted(index.match(["pool"])) == ["p3", "p4"]
+    assert index.contains(index.bitmap(["pool"]), "p4")
+    assert not index.contains(index.bitmap(["wifi"]), "p4")
+    assert index.match(["sauna"]) == []
+    print("✅ Bitmap index works")
+
+def test_bitmap_bulk_build():
+    """Test that building and probing large bitmaps stays linear"""
+    print("\nTesting bulk bitmap builds...")
+    places = [f"p{n}" for n in range(200000)]
+    pairs = [(place, "wifi") for place in places] + \
+        [(place, "pool") for place in places[::2]]
+    start = time.perf_counter()
+    index = BitmapIndex()
+    index.load(pairs)
+    bitmap = index.bitmap_of(places[::3])
+    hits = sum(1 for place in places if index.contains(bitmap, place))
+    elapsed = time.perf_counter() - start
+    assert len(index) == 200000 and index.count("wifi") == 200000 and index.count("pool") == 100000
+    assert hits == len(places[::3]) and index.count("pool", bitmap) == len(places[::6])
+    assert index.match(["wifi", "pool"])[:2] == ["p0", "p2"]
+    # Setting one bit at a time, and shifting per probe, took over 2s here
+    assert elapsed < 1.5, f"bulk build took {elapsed:.2f}s"
+    print(f"✅ 300k bits loaded and probed in {elapsed:.2f}s")
+
+def test_in_memory_amenity_bitmaps():
+    """Test amenity filters on the in-memory backend"""
+    print("\nTesting in-memory amenity bitmaps...")
+    repo = InMemoryRepository()
+    _check_bitmaps(HBnBFacade(repository=repo, user_repository=repo),
+                   HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory amenity bitmaps work")
+
+def test_sqlalchemy_amenity_bitmaps():
+    """Test amenity filters built from the place_amenity table"""
+    print("\nTesting SQLAlchemy amenity bitmaps...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _check_bitmaps(HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository()),
+                       HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository()))
+    print("✅ SQLAlchemy amenity bitmaps work")
+
+def _check_related_filter(repo, facade):
+    """Check find() with a related criterion against the bitmap filter"""
+    amenities, places = _populate(facade)
+    wifi, pool = amenities["WiFi"], amenities["Pool"]
+    for match_all, expected in ((True, ["Both"]), (False, ["Both", "Pool only", "WiFi only"])):
+        related = ('amenities', [wifi, pool], match_all)
+        assert _names(repo.find(Place, related=related)) == expected
+        assert repo.find_ids(Place, related=related) == facade.places_with_amenities([wifi, pool], match_all)
+    first = repo.find(Place, limit=1, related=('amenities', [pool], True))
+    rest = repo.find(Place, related=('amenities', [pool], True),
+                     after=(first[0].created_at, first[0].id))
+    assert _names(first + rest) == ["Both", "Pool only"] and len(first) == 1
+
+def test_related_filter():
+    """Test find() related criteria in memory and as one SQL query with its LIMIT"""
+    print("\nTesting related filters...")
+    repo = InMemoryRepository()
+    _check_related_filter(repo, HBnBFacade(repository=repo, user_repository=repo))
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        repo = SQLAlchemyRepository()
+        repo.MAX_IN_IDS = 1  # ID lists would now be post-filtered in Python
+        facade = HBnBFacade(repository=repo, user_repository=UserRepository())
+        _check_related_filter(repo, facade)
+
+        amenity_ids = [amenity.id for amenity in facade.get_all_amenities() if amenity.name != "Parking"]
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            page = facade.filter_places(amenity_ids=amenity_ids, match_all_amenities=False, limit=2)
+            assert len(page) == 2 and len(statements) == 1
+            assert 'place_amenity' in statements[0] and 'LIMIT' in statements[0]
+
+            # The page total is a COUNT(*) with the same predicates
+            del statements[:]
+            assert facade.count_places(amenity_ids=amenity_ids, match_all_amenities=False) == 3
+            assert len(statements) == 1 and 'count(' in statements[0]
+
+            # Facets group the filtered rows once instead of once per ID chunk
+            del statements[:]
+            facets = facade.get_place_facets(['amenities', 'price'], amenity_ids=amenity_ids,
+                                             match_all_amenities=False)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        assert {item['name']: item['count'] for item in facets['amenities']} == {"WiFi": 2, "Pool": 2}
+        assert sum(bucket['count'] for bucket in facets['price']) == 3
+        # count_related, the amenity names and count_buckets
+        assert len(statements) == 3
+    print("✅ Related filters run in the database")
+
+if __name__ == "__main__":
+    test_bitmap_index()
+    test_bitmap_bulk_build()
+    test_in_memory_amenity_bitmaps()
+    test_sqlalchemy_amenity_bitmaps()
+    test_related_filter()
+    print("\n🎉 All amenity bitmap tests passed!")
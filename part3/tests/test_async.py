@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test script for the async repositories, the async facade and the ASGI entry point
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.asgi import WSGIBridge, create_asgi_app
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import async_repository
+from app.persistence.async_repository import (AsyncRepositoryAdapter, AsyncSQLAlchemyRepository,
+                                              async_database_url)
+from app.persistence.repository import InMemoryRepository
+from app.services.async_facade import AsyncHBnBFacade
+from app.services.facade import HBnBFacade
+
+def _seed(facade, suffix):
+    """A place with a host, two amenities and two reviews"""
+    host = facade.create_user(f"async.host.{suffix}@example.com", "Async", "Host", password="secret123")
+    amenities = [facade.create_amenity(name) for name in ("Wifi", "Sauna")]
+    place = facade.create_place(
+        name="Async Loft", description="Awaited", address="1 Loop St", city_id="lyon",
+        latitude=45.7, longitude=4.8, host_id=host.id, number_of_rooms=2, number_of_bathrooms=1,
+        price_per_night=120, max_guests=4, amenity_ids=[amenity.id for amenity in amenities])
+    for i in range(2):
+        guest = facade.create_user(f"async.guest{i}.{suffix}@example.com", "Async", "Guest")
+        facade.create_review(place.id, guest.id, 4 + i, "Fast")
+    return host, place
+
+def test_async_database_url():
+    """Test the rewrite of synchronous URLs to async drivers"""
+    print("Testing async database URLs...")
+    assert async_database_url('sqlite:///hbnb.db') == 'sqlite+aiosqlite:///hbnb.db'
+    assert async_database_url('sqlite+aiosqlite:///:memory:') == 'sqlite+aiosqlite:///:memory:'
+    assert async_database_url('postgresql://u:p@db/hbnb') == 'postgresql+asyncpg://u:p@db/hbnb'
+    print("✅ URLs use the async drivers")
+
+def test_async_facade_in_memory():
+    """Test the async facade over the in-memory repository against the sync facade"""
+    print("\nTesting the async facade on the in-memory repository...")
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host, place = _seed(facade, "memory")
+    async_facade = AsyncHBnBFacade(AsyncRepositoryAdapter(repo))
+
+    async def run():
+        details = await async_facade.get_place_with_details(place.id)
+        assert details == facade.get_place_with_details(place.id)
+        user = await async_facade.create_user("async.new@example.com", "Async", "New", "secret123")
+        assert user.password_hash and repo.get(User, user.id) is user
+        assert (await async_facade.authenticate_user("async.new@example.com", "secret123")) is user
+        assert await async_facade.authenticate_user("async.new@example.com", "wrong-password") is None
+        try:
+            await async_facade.get_place("missing")
+            assert False, "Missing places should raise"
+        except ValueError:
+            pass
+        return details
+
+    details = asyncio.run(run())
+    assert len(details['amenities']) == 2 and details['rating']['count'] == 2
+    print("✅ Async facade matches the sync facade")
+
+def test_async_sqlalchemy_repository():
+    """Test the aiosqlite repository, including concurrent calls"""
+    print("\nTesting AsyncSQLAlchemyRepository...")
+    if async_repository.aiosqlite is None:
+        print("⚠️  aiosqlite is not installed, skipping")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        repo = AsyncSQLAlchemyRepository(f"sqlite:///{os.path.join(directory, 'async.db')}")
+
+        async def run():
+            await repo.create_all()
+            host = User("async.sql@example.com", "Async", "Sql")
+            amenities = [Amenity("Wifi"), Amenity("Pool")]
+            await repo.add_many([host] + amenities)
+            place = Place("Async Place", "", "2 Loop St", "lyon", 45.0, 5.0, host.id, 1, 1, 80, 2)
+            place.amenities = amenities
+            await repo.add(place)
+
+            # Detached results keep columns and owned associations
+            stored = await repo.get(Place, place.id)
+            assert sorted(stored.to_dict()['amenity_ids']) == sorted(amenity.id for amenity in amenities)
+            related = await repo.get_related(Place, place.id, 'amenities')
+            assert {amenity.name for amenity in related} == {"Wifi", "Pool"}
+            users, counted, found = await asyncio.gather(
+                repo.get_by_attribute(User, email="async.sql@example.com"),
+                repo.count(Amenity), repo.exists(Place, city_id="lyon"))
+            assert [user.id for user in users] == [host.id] and counted == 2 and found
+
+            stored.price_per_night = 95
+            await repo.update(stored)
+            assert (await repo.get(Place, place.id)).price_per_night == 95
+            ids = [amenity.id for amenity in amenities]
+            assert [a.id for a in await repo.get_many(Amenity, reversed(ids))] == ids[::-1]
+            assert await repo.delete(Place, place.id) and not await repo.delete(Place, place.id)
+            assert await repo.delete_many(Amenity, ids + ["missing"]) == 2
+            await repo.close()
+
+        asyncio.run(run())
+    print("✅ aiosqlite repository works")
+
+async def _call(app, method, path, body=None, query=b''):
+    """Send one HTTP request through an ASGI app and return (status, body)"""
+    messages = []
+    payload = json.dumps(body).encode() if body is not None else b''
+    requests = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client stays connected
+
+    async def send(message):
+        messages.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path, 'query_string': query,
+               'headers': [(b'content-type', b'application/json')]}, receive, send)
+    return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+def test_asgi_app():
+    """Test async routes and the Flask fallback of the ASGI application"""
+    print("\nTesting the ASGI application...")
+    from app.services import facade
+    # Both sides must see the same data whatever REPOSITORY_TYPE other tests set
+    repo = InMemoryRepository()
+    with patch.dict(os.environ), patch.object(facade, 'repo', repo), \
+            patch.object(facade, 'user_repo', repo):
+        os.environ.pop('REPOSITORY_TYPE', None)
+        app = create_asgi_app('testing')
+        _, place = _seed(facade, "asgi")
+        client = app.flask_app.test_client()
+        _check_asgi_routes(app, client, place)
+    print("✅ ASGI application serves async and Flask routes")
+
+def _check_asgi_routes(app, client, place):
+    """Compare async routes with Flask and exercise the fallback"""
+
+    async def run():
+        status, body = await _call(app, 'GET', f'/api/v1/places/{place.id}')
+        assert status == 200
+        assert json.loads(body) == client.get(f'/api/v1/places/{place.id}').get_json()
+        assert (await _call(app, 'GET', '/api/v1/places/missing'))[0] == 404
+
+        # Routes without an async handler are served by Flask
+        status, body = await _call(app, 'GET', '/api/v1/amenities/')
+        assert status == 200 and json.loads(body) == client.get('/api/v1/amenities/').get_json()
+        status, body = await _call(app, 'GET', '/api/v1/places/search', query=b'q=loft')
+        assert status == 200 and json.loads(body)[0]['id'] == place.id
+
+        status, body = await _call(app, 'POST', '/api/v1/auth/login',
+                                   {'email': "async.host.asgi@example.com", 'password': "secret123"})
+        assert status == 200 and json.loads(body)['user']['email'] == "async.host.asgi@example.com"
+        assert (await _call(app, 'POST', '/api/v1/auth/login',
+                            {'email': "async.host.asgi@example.com", 'password': "nope123"}))[0] == 401
+
+    asyncio.run(run())
+
+def _streaming_app(produced, closed, chunks=None):
+    """WSGI app yielding numbered chunks (forever without a count)"""
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        def body():
+            try:
+                n = 0
+                while chunks is None or n < chunks:
+                    produced.append(n)
+                    yield str(n).encode()
+                    n += 1
+            finally:
+                closed.set()
+        return body()
+    return app
+
+def test_wsgi_bridge_streaming():
+    """Test backpressure and disconnect handling of the WSGI bridge"""
+    print("\nTesting WSGI bridge backpressure and disconnects...")
+    scope = {'type': 'http', 'method': 'GET', 'path': '/stream', 'headers': []}
+
+    async def slow_client():
+        produced, closed, ahead = [], threading.Event(), []
+        bridge = WSGIBridge(_streaming_app(produced, closed, chunks=40), max_queued_chunks=2)
+        received = []
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message['body']:
+                received.append(message['body'])
+                ahead.append(len(produced) - len(received))
+                await asyncio.sleep(0.002)
+
+        await bridge(scope, b'', send)
+        assert received == [str(n).encode() for n in range(40)] and closed.is_set()
+        # queued chunks, plus one waiting to be put and one being produced
+        assert max(ahead) <= 4, max(ahead)
+
+    async def disconnecting_client():
+        produced, closed = [], threading.Event()
+        bridge = WSGIBridge(_streaming_app(produced, closed), max_queued_chunks=2)
+        gone, sent = asyncio.Event(), []
+
+        async def receive():
+            await gone.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            if len(sent) == 5:
+                gone.set()
+
+        await asyncio.wait_for(bridge(scope, b'', send, receive), 5)
+        assert closed.is_set() and len(produced) < 20
+        assert not any(message.get('more_body') is False for message in sent)
+
+    asyncio.run(slow_client())
+    asyncio.run(disconnecting_client())
+    print("✅ A slow client throttles the WSGI app and a disconnect closes it")
+
+if __name__ == "__main__":
+    test_async_database_url()
+    test_async_facade_in_memory()
+    test_async_sqlalchemy_repository()
+    test_asgi_app()
+    test_wsgi_bridge_streaming()
+    print("\n🎉 All async tests passed!")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for place and amenity name autocomplete
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.persistence.fulltext import PrefixIndex
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+PLACE_NAMES = ["Seaside Villa", "Villa Rosa", "Villefranche Studio", "City Loft"]
+
+def _populate(facade):
+    host = facade.create_user("autohost@example.com", "Auto", "Host")
+    guests = [facade.create_user(f"autoguest{i}@example.com", "Auto", "Guest") for i in range(2)]
+    pool = facade.create_amenity("Swimming Pool")
+    facade.create_amenity("Pool Table")
+    places = {}
+    for name in PLACE_NAMES:
+        places[name] = facade.create_place(
+            name=name, description="", address=name, city_id="nice",
+            latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=100, max_guests=2,
+            amenity_ids=[pool.id] if name != "City Loft" else []
+        )
+    for guest in guests:
+        facade.create_review(places["Villa Rosa"].id, guest.id, 4, "Nice")
+    return places, guests
+
+def _names(suggestions):
+    return [suggestion['name'] for suggestion in suggestions]
+
+def _check_autocomplete(facade):
+    """Run the same autocomplete checks against any facade"""
+    places, guests = _populate(facade)
+
+    # Any word can match and the most reviewed place comes first
+    assert _names(facade.autocomplete_places("vill")) == ["Villa Rosa", "Seaside Villa", "Villefranche Studio"]
+    assert facade.autocomplete_places("villa")[0]['review_count'] == 2
+    assert _names(facade.autocomplete_places("VILLA R")) == ["Villa Rosa"]
+    assert _names(facade.autocomplete_places("vill", limit=1)) == ["Villa Rosa"]
+    assert facade.autocomplete_places("castle") == []
+
+    # The index follows creates, renames, reviews and deletes
+    facade.update_place(places["City Loft"].id, name="Villa Loft")
+    assert "Villa Loft" in _names(facade.autocomplete_places("vill"))
+    assert facade.autocomplete_places("city") == []
+    review = facade.get_reviews_by_place(places["Villa Rosa"].id)[0]
+    facade.delete_review(review.id)
+    assert facade.autocomplete_places("villa rosa")[0]['review_count'] == 1
+    facade.delete_place(places["Seaside Villa"].id)
+    assert "Seaside Villa" not in _names(facade.autocomplete_places("vill"))
+
+    # Amenities are ranked by the number of places using them
+    suggestions = facade.autocomplete_amenities("pool")
+    assert _names(suggestions) == ["Swimming Pool", "Pool Table"]
+    assert suggestions[0]['place_count'] == 2
+    facade.create_amenity("Poolside Bar")
+    assert "Poolside Bar" in _names(facade.autocomplete_amenities("pool"))
+
+    # A rebuild from the repository gives the same answers
+    expected = facade.autocomplete_places("vill")
+    facade.rebuild_autocomplete()
+    assert facade.autocomplete_places("vill") == expected
+
+    for bad in ({'prefix': ''}, {'prefix': '!!'}, {'prefix': 'v', 'limit': 0}):
+        try:
+            facade.autocomplete_places(**bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+
+def test_prefix_index():
+    """Test the sorted prefix array directly"""
+    print("Testing PrefixIndex...")
+
+    index = PrefixIndex()
+    index.insert("a", "Café Olé", weight=1)
+    index.insert("b", "Cafeteria", weight=3)
+    index.insert("c", "Old Cafe")
+    assert index.search("cafe") == [("b", "Cafeteria"), ("a", "Café Olé"), ("c", "Old Cafe")]
+    assert index.search("ole") == [("a", "Café Olé")]
+    index.insert("b", "Diner")
+    assert index.weight("b") == 3
+    assert [key for key, _ in index.search("cafe")] == ["a", "c"]
+    index.set_weight("c", 5)
+    assert index.search("caf", limit=1) == [("c", "Old Cafe")]
+    index.remove("c")
+    assert len(index) == 2 and index.search("old") == []
+
+    # A bulk load matches the same names inserted one by one
+    loaded = PrefixIndex()
+    loaded.load([("a", "Café Olé", 1), ("b", "Cafeteria", 3), ("c", "Old Cafe", None)])
+    assert loaded.search("cafe") == [("b", "Cafeteria"), ("a", "Café Olé"), ("c", "Old Cafe")]
+    loaded.insert("d", "Olive Grove")
+    loaded.remove("a")
+    assert loaded.search("ol") == [("c", "Old Cafe"), ("d", "Olive Grove")] and len(loaded) == 3
+
+    print("✅ PrefixIndex works")
+
+def test_in_memory_autocomplete():
+    """Test autocomplete on the in-memory repository"""
+    print("\nTesting in-memory autocomplete...")
+    repo = InMemoryRepository()
+    _check_autocomplete(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory autocomplete works")
+
+def test_sqlalchemy_autocomplete():
+    """Test autocomplete on the SQLAlchemy repositories"""
+    print("\nTesting SQLAlchemy autocomplete...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        _check_autocomplete(facade)
+    print("✅ SQLAlchemy autocomplete works")
+
+def test_autocomplete_endpoints():
+    """Test GET /api/v1/places/autocomplete and /api/v1/amenities/autocomplete"""
+    print("\nTesting autocomplete endpoints...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        for resource in ('places', 'amenities'):
+            response = client.get(f'/api/v1/{resource}/autocomplete?prefix=a&limit=5')
+            assert response.status_code == 200
+            assert len(response.get_json()) <= 5
+            assert client.get(f'/api/v1/{resource}/autocomplete').status_code == 400
+            assert client.get(f'/api/v1/{resource}/autocomplete?prefix=a&limit=99').status_code == 400
+    print("✅ Autocomplete endpoints work")
+
+if __name__ == "__main__":
+    test_prefix_index()
+    test_in_memory_autocomplete()
+    test_sqlalchemy_autocomplete()
+    test_autocomplete_endpoints()
+    print("\n🎉 All autocomplete tests passed!")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the request-scoped batching loader
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+from app.services.loader import BatchLoader
+
+class CountingRepository(InMemoryRepository):
+    """In-memory repository recording get_many calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def get_many(self, model_class, obj_ids):
+        obj_ids = list(obj_ids)
+        self.batches.append((model_class.__name__, obj_ids))
+        return super().get_many(model_class, obj_ids)
+
+def test_loader_batches_and_memoizes():
+    """Test that queued ids are resolved in one batch and then cached"""
+    print("Testing batch loader...")
+
+    repo = CountingRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    users = [facade.create_user(f"loader{i}@example.com", "Load", "Er") for i in range(3)]
+    wifi = facade.create_amenity("Loader WiFi")
+
+    loader = BatchLoader(facade)
+    loader.queue(User, [u.id for u in users] + [users[0].id, "missing-id"])
+    assert loader.load(User, users[1].id) is users[1]
+    assert len(repo.batches) == 1, "All queued users should load in one batch"
+    assert sorted(repo.batches[0][1]) == sorted([u.id for u in users] + ["missing-id"])
+
+    # Cached results (including misses) do not hit the repository again
+    assert loader.load(User, users[2].id) is users[2]
+    assert loader.load(User, "missing-id") is None
+    assert len(repo.batches) == 1
+
+    # Each model class is batched separately
+    assert loader.load_many(Amenity, [wifi.id]) == {wifi.id: wifi}
+    assert repo.batches[-1] == ('Amenity', [wifi.id])
+
+    loader.clear(User, users[2].id)
+    loader.load(User, users[2].id)
+    assert repo.batches[-1] == ('User', [users[2].id])
+
+    print("✅ Batch loader resolves ids in batches and memoizes them")
+
+if __name__ == "__main__":
+    test_loader_batches_and_memoizes()
+    print("\n🎉 All batch loader tests passed!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for batch repository operations (add_many / get_many / delete_many)
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def _check_bulk_amenities(repo):
+    """Run the same batch checks against any repository"""
+    amenities = [Amenity(f"Bulk amenity {i}") for i in range(5)]
+    repo.add_many(amenities)
+
+    ids = [a.id for a in amenities]
+    fetched = repo.get_many(Amenity, [ids[3], "missing-id", ids[0], ids[3]])
+    assert [a.id for a in fetched] == [ids[3], ids[0]], "get_many should keep request order"
+
+    assert repo.delete_many(Amenity, ids[:2] + ["missing-id"]) == 2
+    assert repo.get_many(Amenity, ids[:2]) == []
+    assert len(repo.get_many(Amenity, ids)) == 3
+
+def test_in_memory_bulk_operations():
+    """Test batch operations on the in-memory repository"""
+    print("Testing in-memory batch operations...")
+    _check_bulk_amenities(InMemoryRepository())
+    print("✅ In-memory batch operations work")
+
+def test_sqlalchemy_bulk_operations():
+    """Test batch operations on the SQLAlchemy repositories"""
+    print("\nTesting SQLAlchemy batch operations...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        _check_bulk_amenities(SQLAlchemyRepository())
+
+        user_repo = UserRepository()
+        users = [User(f"bulk{i}@example.com", "Bulk", "User") for i in range(3)]
+        user_repo.add_many(users)
+        assert len(user_repo.get_many(User, [u.id for u in users])) == 3
+        assert user_repo.delete_many(User, [users[0].id]) == 1
+
+    print("✅ SQLAlchemy batch operations work")
+
+def test_facade_amenity_validation():
+    """Test that the facade validates amenity ids in one batch"""
+    print("\nTesting facade amenity validation...")
+
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = facade.create_user("bulkhost@example.com", "Bulk", "Host")
+    wifi = facade.create_amenity("WiFi")
+
+    place_data = dict(name="Loft", description="", address="1 Main St", city_id="c1",
+                      latitude=1.0, longitude=2.0, host_id=host.id, number_of_rooms=1,
+                      number_of_bathrooms=1, price_per_night=50, max_guests=2)
+    try:
+        facade.create_place(amenity_ids=[wifi.id, "missing-id"], **place_data)
+        assert False, "Unknown amenity should be rejected"
+    except ValueError as e:
+        assert "missing-id" in str(e)
+
+    place = facade.create_place(amenity_ids=[wifi.id], **place_data)
+    assert [a.id for a in place.amenities] == [wifi.id]
+
+    try:
+        facade.update_place(place.id, amenity_ids=["missing-id"])
+        assert False, "Unknown amenity should be rejected"
+    except ValueError:
+        pass
+    assert [a.id for a in place.amenities] == [wifi.id], "Failed update must keep amenities"
+
+    print("✅ Facade amenity validation works")
+
+if __name__ == "__main__":
+    test_in_memory_bulk_operations()
+    test_sqlalchemy_bulk_operations()
+    test_facade_amenity_validation()
+    print("\n🎉 All batch operation tests passed!")
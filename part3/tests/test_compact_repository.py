@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the __slots__ record storage of the in-memory repository
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.compact_repository import CompactInMemoryRepository
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+def _place(host_id, i=0):
+    """Build a place without storing it"""
+    return Place(f"Slot Loft {i}", "Compact", "1 Record St", "paris", 48.85, 2.35,
+                 host_id, 2, 1, 100 + i % 50, 4)
+
+def test_records_round_trip():
+    """Test that models are stored as records and read back as equal models"""
+    print("Testing record round trip...")
+    repo = CompactInMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = facade.create_user("slots@example.com", "Slo", "Ts")
+    wifi = facade.create_amenity("Wifi")
+    place = facade.create_place(
+        name="Slot Loft", description="Compact", address="1 Record St", city_id="paris",
+        latitude=48.85, longitude=2.35, host_id=host.id, number_of_rooms=2,
+        number_of_bathrooms=1, price_per_night=120, max_guests=4, amenity_ids=[wifi.id]
+    )
+    facade.create_review(place.id, facade.create_user("guest@example.com", "G", "U").id, 4, "Tidy")
+
+    record = repo._storage['Place'].records[place.id]
+    assert type(record).__name__ == 'PlaceRecord' and not hasattr(record, '__dict__')
+    assert record.amenities == (wifi.id,) and record.host_id is repo._storage['User'].records[host.id].id
+
+    loaded = facade.get_place(place.id)
+    assert loaded is not place and loaded.to_dict() == place.to_dict()
+    assert [a.name for a in loaded.amenities] == ["Wifi"]
+    assert facade.get_user_by_email("slots@example.com").to_dict() == host.to_dict()
+    assert facade.get_place_rating(place.id)['count'] == 1
+    assert [p.id for p in facade.filter_places(max_price=150)] == [place.id]
+    assert facade.search_places_text("loft")[0][0].id == place.id
+    print("✅ Records round-trip through the facade")
+
+def test_writes_go_through_update():
+    """Test that reads are detached copies and update() stores changes"""
+    print("\nTesting update semantics...")
+    repo = CompactInMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = facade.create_user("owner@example.com", "Own", "Er")
+    pool = facade.create_amenity("Pool")
+    place = facade.create_place(
+        name="Copy House", description="", address="2 Copy St", city_id="nice",
+        latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+        number_of_bathrooms=1, price_per_night=80, max_guests=2
+    )
+
+    copy = repo.get(Place, place.id)
+    copy.price_per_night = 999
+    assert repo.get(Place, place.id).price_per_night == 80
+
+    facade.update_place(place.id, price_per_night=90, amenity_ids=[pool.id])
+    stored = repo.get(Place, place.id)
+    assert stored.price_per_night == 90 and [a.id for a in stored.amenities] == [pool.id]
+    assert repo.get_by_attribute(Place, host_id=host.id)[0].price_per_night == 90
+    facade.delete_place(place.id)
+    assert repo.get(Place, place.id) is None and repo.count(Place) == 0
+    print("✅ Changes are stored by update() only")
+
+def _retained_bytes(repo, host_id, count):
+    """Bytes the object storage of repo keeps for count places (indexes excluded)"""
+    repo._storage['Place'] = {}
+    objects = repo._storage['Place']
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        place = _place(host_id, i)
+        objects[place.id] = place
+    del place
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+def test_records_use_less_memory():
+    """Test that records take well under half the memory of mapped models"""
+    print("\nComparing memory per place...")
+    host = User("memory@example.com", "Mem", "Ory")
+    full = _retained_bytes(InMemoryRepository(), host.id, 2000) / 2000
+    compact = _retained_bytes(CompactInMemoryRepository(), host.id, 2000) / 2000
+    print(f"   mapped models: {full:.0f} B/place, records: {compact:.0f} B/place")
+    assert compact < full / 2
+    print("✅ Records are compact")
+
+if __name__ == "__main__":
+    test_records_round_trip()
+    test_writes_go_through_update()
+    test_records_use_less_memory()
+    print("\n🎉 All compact repository tests passed!")
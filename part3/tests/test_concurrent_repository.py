@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Stress test for the thread-safe in-memory repository
+"""
+
+import os
+import sys
+import threading
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.services.facade import HBnBFacade
+
+THREADS = 16
+ROUNDS = 150
+
+def _hammer(repo, worker, errors, start):
+    """Mix writes and reads on shared and thread-private objects"""
+    start.wait()
+    try:
+        for i in range(ROUNDS):
+            user = User(f"w{worker}-{i}@example.com", "Stress", f"Worker{worker}")
+            repo.add(user)
+            assert repo.get(User, user.id) is user
+            assert repo.get_by_attribute(User, email=user.email) == [user]
+            user.last_name = f"Renamed{worker}"
+            repo.update(user)
+
+            repo.find(User, equals={'first_name': 'Stress'}, limit=5)
+            repo.count(User, first_name='Stress')
+            if i % 10 == 0:
+                # Iterating a snapshot must never see a dict change size
+                assert all(obj.id for obj in repo.get_all(User))
+                repo.search_trigrams(User, f"Worker{worker}")
+
+            if i % 3 == 0:
+                assert repo.delete(User, user.id)
+                assert repo.get(User, user.id) is None
+                assert repo.get_by_attribute(User, email=user.email) == []
+            if i % 50 == 0:
+                repo.add_many([Amenity(f"A{worker}-{i}-{n}") for n in range(5)])
+                list(repo.iter_all(Amenity, chunk_size=7))
+    except Exception as e:  # surfaced in the main thread
+        errors.append(e)
+
+def test_concurrent_stress():
+    """Hammer one repository from many threads, then check it is consistent"""
+    print("Stress testing ConcurrentInMemoryRepository...")
+    repo = ConcurrentInMemoryRepository()
+    errors, start = [], threading.Barrier(THREADS)
+    threads = [threading.Thread(target=_hammer, args=(repo, worker, errors, start))
+               for worker in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors[:3]
+
+    # Storage and every index agree once the writers are done
+    users = repo.get_all(User)
+    expected = THREADS * (ROUNDS - len(range(0, ROUNDS, 3)))
+    assert len(users) == expected == repo.count(User)
+    for user in users:
+        assert repo.get_by_attribute(User, email=user.email) == [user]
+    assert len(repo.find(User)) == expected
+    assert len(repo.find_ids(User, equals={'first_name': 'Stress'})) == expected
+    assert len(list(repo.iter_all(Amenity))) == repo.count(Amenity) == THREADS * 3 * 5
+    print("✅ Concurrent repository stayed consistent under load")
+
+def test_writes_update_in_place():
+    """Test that writes change the object dict in place instead of copying it"""
+    print("\nTesting in-place writes...")
+    repo = ConcurrentInMemoryRepository()
+    repo.add_many([Amenity(f"Bulk {i}") for i in range(1000)])
+    objects = repo._storage['Amenity']
+    extra = Amenity("Extra")
+    repo.add(extra)
+    extra.name = "Renamed Extra"
+    repo.update(extra)
+    assert repo.delete_many(Amenity, [extra.id, "missing"]) == 1
+    assert repo._storage['Amenity'] is objects and len(objects) == 1000
+    snapshot = repo.get_all(Amenity)
+    repo.add(Amenity("After"))
+    assert len(snapshot) == 1000 and repo.count(Amenity) == 1001
+    print("✅ Writes do not copy the object dict")
+
+def test_concurrent_repository_facade():
+    """Run ordinary facade operations on the concurrent repository"""
+    print("\nTesting the facade on ConcurrentInMemoryRepository...")
+    repo = ConcurrentInMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = facade.create_user("concurrenthost@example.com", "Con", "Current")
+    place = facade.create_place(
+        name="Threaded Loft", description="", address="1 Lock St", city_id="nice",
+        latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+        number_of_bathrooms=1, price_per_night=80, max_guests=2
+    )
+    assert [p.id for p in facade.filter_places(max_price=100)] == [place.id]
+    assert facade.search_places_text("loft")[0][0] is place
+    facade.delete_user(host.id)
+    assert facade.get_all_places() == [] and facade.get_all_users() == []
+    print("✅ Facade works on the concurrent repository")
+
+if __name__ == "__main__":
+    test_concurrent_stress()
+    test_writes_update_in_place()
+    test_concurrent_repository_facade()
+    print("\n🎉 All concurrent repository tests passed!")
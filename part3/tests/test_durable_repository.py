@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Test script for the snapshot + append-only log persistence of the in-memory repository
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.durable_repository import DurableInMemoryRepository
+from app.services.facade import HBnBFacade
+
+def _reopen(repo):
+    """Close a repository and load a new one from the same directory"""
+    repo.close()
+    return DurableInMemoryRepository(repo.directory)
+
+def _seed(facade):
+    """Create a small linked data set through the facade"""
+    host = facade.create_user("durable@example.com", "Dura", "Ble")
+    guest = facade.create_user("guest@example.com", "Gue", "St")
+    wifi = facade.create_amenity("Wifi")
+    pool = facade.create_amenity("Pool")
+    place = facade.create_place(
+        name="Persistent Villa", description="Survives restarts", address="1 Log Rd",
+        city_id="lyon", latitude=45.76, longitude=4.83, host_id=host.id, number_of_rooms=3,
+        number_of_bathrooms=2, price_per_night=150, max_guests=6, amenity_ids=[wifi.id, pool.id]
+    )
+    facade.create_review(place.id, guest.id, 5, "Lovely")
+    return host, guest, place
+
+def test_log_replay():
+    """Test that writes survive a restart through the log alone"""
+    print("Testing log replay...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        facade = HBnBFacade(repository=repo, user_repository=repo)
+        host, guest, place = _seed(facade)
+        facade.update_place(place.id, price_per_night=175)
+        doomed = facade.create_amenity("Sauna")
+        assert repo.delete(Amenity, doomed.id)
+        before = {cls.__name__: sorted(obj.to_dict()['id'] for obj in repo.get_all(cls))
+                  for cls in (User, Amenity, Place)}
+
+        repo = _reopen(repo)
+        assert repo.replayed_records > 0
+        facade = HBnBFacade(repository=repo, user_repository=repo)
+        after = {cls.__name__: sorted(obj.to_dict()['id'] for obj in repo.get_all(cls))
+                 for cls in (User, Amenity, Place)}
+        assert before == after
+        loaded = facade.get_place(place.id)
+        assert loaded.price_per_night == 175
+        assert sorted(a.name for a in loaded.amenities) == ["Pool", "Wifi"]
+        assert all(a.places == [loaded] for a in loaded.amenities)
+        assert facade.get_user_by_email("durable@example.com").id == host.id
+        assert [p.id for p in facade.filter_places(max_price=200)] == [place.id]
+        assert facade.search_places_text("villa")[0][0].id == place.id
+        assert len(facade.get_reviews_by_place(place.id)) == 1
+        repo.close()
+    print("✅ Log replay restores objects, relationships and indexes")
+
+def test_snapshot_and_tail():
+    """Test compaction into a snapshot followed by a log tail"""
+    print("\nTesting snapshot compaction...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        facade = HBnBFacade(repository=repo, user_repository=repo)
+        _, _, place = _seed(facade)
+        assert repo.snapshot() == sum(len(objects) for objects in repo._storage.values())
+        assert os.path.getsize(os.path.join(directory, repo.LOG_FILE)) == 0
+        facade.create_amenity("After Snapshot")
+
+        repo = _reopen(repo)
+        assert repo.replayed_records == 1
+        assert sorted(a.name for a in repo.get_all(Amenity)) == ["After Snapshot", "Pool", "Wifi"]
+        assert len(repo.get(Place, place.id).amenities) == 2
+        repo.close()
+
+        # Compaction also runs on its own after snapshot_every log records,
+        # counting the replayed tail, on a background thread
+        repo = DurableInMemoryRepository(directory, snapshot_every=5)
+        for i in range(4):
+            repo.add(Amenity(f"Auto {i}"))
+        assert os.path.getsize(os.path.join(directory, repo.LOG_FILE)) == 0
+        repo.add(Amenity("During Compaction"))
+        assert repo.wait_for_compaction() and repo.compaction_error is None
+        assert not os.path.exists(os.path.join(directory, repo.PREVIOUS_LOG_FILE))
+        repo = _reopen(repo)
+        assert repo.replayed_records == 1 and len(repo.get_all(Amenity)) == 8
+        repo.close()
+    print("✅ Snapshots compact the log and reload with the tail")
+
+def test_interrupted_compaction():
+    """Test that a log moved aside by an unfinished compaction is replayed"""
+    print("\nTesting recovery from an interrupted compaction...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        facade = HBnBFacade(repository=repo, user_repository=repo)
+        _, _, place = _seed(facade)
+        repo._rotate_log()  # crash before the snapshot is written
+        facade.update_place(place.id, price_per_night=90)
+        repo.close()
+        assert os.path.exists(os.path.join(directory, repo.PREVIOUS_LOG_FILE))
+
+        repo = DurableInMemoryRepository(directory)
+        assert not os.path.exists(os.path.join(directory, repo.PREVIOUS_LOG_FILE))
+        assert repo.get(Place, place.id).price_per_night == 90
+        assert len(repo.get(Place, place.id).amenities) == 2
+        repo = _reopen(repo)
+        assert repo.replayed_records == 0 and repo.get(Place, place.id).price_per_night == 90
+        repo.close()
+    print("✅ An interrupted compaction is finished on startup")
+
+def test_torn_log_tail():
+    """Test that a partially written last record is discarded"""
+    print("\nTesting recovery from a torn log record...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        repo.add(Amenity("Kept"))
+        repo.close()
+        log_path = os.path.join(directory, repo.LOG_FILE)
+        good_size = os.path.getsize(log_path)
+        with open(log_path, 'ab') as f:
+            f.write(b'\x40\x00\x00\x00partial')
+
+        repo = DurableInMemoryRepository(directory)
+        assert [a.name for a in repo.get_all(Amenity)] == ["Kept"]
+        assert os.path.getsize(log_path) == good_size
+        repo.add(Amenity("Appended"))
+        repo = _reopen(repo)
+        assert sorted(a.name for a in repo.get_all(Amenity)) == ["Appended", "Kept"]
+        repo.close()
+    print("✅ Torn log tail is truncated and writes resume")
+
+def test_corrupt_files_rejected():
+    """Test that damage anywhere but the tail of the log fails loudly"""
+    print("\nTesting corrupt snapshot and log detection...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        repo.add_many([Amenity(f"Kept {i}") for i in range(3)])
+        repo.snapshot()
+        repo.add(Amenity("Logged"))
+        repo.add(Amenity("Logged Too"))
+        repo.close()
+        snapshot_path = os.path.join(directory, repo.SNAPSHOT_FILE)
+        log_path = os.path.join(directory, repo.LOG_FILE)
+        with open(snapshot_path, 'rb') as f:
+            snapshot = f.read()
+        with open(log_path, 'rb') as f:
+            log = f.read()
+
+        damaged = {
+            snapshot_path: [snapshot[:-3], snapshot[:-3] + b'\xff\xff\xff'],
+            log_path: [b'\x00' * 9 + log[9:]],
+        }
+        for path, variants in damaged.items():
+            original = snapshot if path == snapshot_path else log
+            for content in variants:
+                with open(path, 'wb') as f:
+                    f.write(content)
+                try:
+                    DurableInMemoryRepository(directory).close()
+                    assert False, f"damaged {os.path.basename(path)} should be rejected"
+                except ValueError:
+                    pass
+            with open(path, 'wb') as f:
+                f.write(original)
+
+        # Zero fill after the last complete log record is a torn tail
+        with open(log_path, 'ab') as f:
+            f.write(b'\x00' * 32)
+        repo = DurableInMemoryRepository(directory)
+        assert len(repo.get_all(Amenity)) == 5 and os.path.getsize(log_path) == len(log)
+        repo.close()
+    print("✅ Corrupt snapshots and log records raise, torn tails do not")
+
+def test_load_skips_validation():
+    """Test that loading bypasses model __init__ validation"""
+    print("\nTesting that loading skips __init__...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory)
+        repo.add_many([Amenity(f"Bulk {i}") for i in range(20000)])
+        repo.snapshot()
+        repo.close()
+
+        original_init = Amenity.__init__
+        def fail(self, *args, **kwargs):
+            raise AssertionError("__init__ must not run on load")
+        Amenity.__init__ = fail
+        try:
+            start = time.perf_counter()
+            repo = DurableInMemoryRepository(directory)
+            elapsed = time.perf_counter() - start
+        finally:
+            Amenity.__init__ = original_init
+        assert repo.loaded_objects == 20000
+        assert repo.get_by_attribute(Amenity, name="Bulk 7")[0].name == "Bulk 7"
+        # The sorted (created_at, id) index is rebuilt in one pass
+        expected = sorted(repo.get_all(Amenity), key=lambda a: (a.created_at, a.id))
+        page = repo.find(Amenity, limit=3)
+        assert page == expected[:3]
+        assert repo.find(Amenity, limit=2, after=(page[-1].created_at, page[-1].id)) == expected[3:5]
+        print(f"   loaded 20000 amenities in {elapsed:.2f}s")
+        repo.close()
+    print("✅ Snapshot load skips model validation")
+
+def test_concurrent_writes_and_compaction():
+    """Test that writers on several threads and compactions keep one consistent log"""
+    print("\nTesting concurrent writes...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory, snapshot_every=50)
+        errors = []
+
+        def write(worker):
+            try:
+                for i in range(200):
+                    amenity = Amenity(f"Worker {worker} #{i}")
+                    repo.add(amenity)
+                    if i % 3 == 0:
+                        repo.delete(Amenity, amenity.id)
+                    if i % 40 == 0:
+                        repo.sync()
+            except Exception as error:  # noqa: BLE001 - reported by the main thread
+                errors.append(error)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors
+        assert repo.wait_for_compaction() and repo.compaction_error is None
+        expected = sorted(a.name for a in repo.get_all(Amenity))
+        assert len(expected) == 4 * (200 - 67)
+
+        repo = _reopen(repo)
+        assert sorted(a.name for a in repo.get_all(Amenity)) == expected
+        repo.close()
+    print("✅ Concurrent writes and compactions reload every surviving object")
+
+def test_idle_write_fsynced():
+    """Test that a write followed by no other write is fsynced within fsync_interval"""
+    print("\nTesting fsync of an idle write...")
+    with tempfile.TemporaryDirectory() as directory:
+        repo = DurableInMemoryRepository(directory, fsync_batch=100, fsync_interval=0.05)
+        repo.sync()
+        repo.add(Amenity("Lonely"))
+        assert repo._unsynced == 1
+        deadline = time.monotonic() + 2
+        while repo._unsynced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert repo._unsynced == 0
+        repo.close()
+    print("✅ The fsync timer covers writes followed by idle time")
+
+if __name__ == "__main__":
+    test_log_replay()
+    test_snapshot_and_tail()
+    test_interrupted_compaction()
+    test_torn_log_tail()
+    test_corrupt_files_rejected()
+    test_load_skips_validation()
+    test_concurrent_writes_and_compaction()
+    test_idle_write_fsynced()
+    print("\n🎉 All durable repository tests passed!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for engine pool options, SQLite PRAGMAs and the admin engine endpoint
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine
+from app import create_app, db
+from app.persistence.engine import check_pragmas, engine_options, engine_settings, install_sqlite_pragmas
+from config import DevelopmentConfig, ProductionConfig
+
+def test_engine_options_and_pragma_checks():
+    """Test pool option filtering and PRAGMA validation"""
+    print("Testing engine options and PRAGMA checks...")
+    options = {'pool_size': 5, 'max_overflow': 10, 'pool_pre_ping': True}
+    assert engine_options('sqlite:///:memory:', options) == {'pool_pre_ping': True}
+    assert engine_options('sqlite:///hbnb.db', options) == options
+    assert engine_options('postgresql://u:p@db/hbnb', None) == {}
+    assert ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['max_overflow'] == 20
+
+    assert list(check_pragmas({'busy_timeout': 100, 'journal_mode': 'WAL', 'mmap_size': None})) == \
+        ['journal_mode', 'busy_timeout']
+    for pragmas in ({'foreign_keys': 'ON'}, {'journal_mode': 'WAL; DROP TABLE users'}):
+        try:
+            check_pragmas(pragmas)
+            assert False, f"{pragmas} should be rejected"
+        except ValueError:
+            pass
+    assert not install_sqlite_pragmas(create_engine('sqlite://'), {})
+    print("✅ Options are filtered and PRAGMAs validated")
+
+def test_sqlite_pragmas_applied():
+    """Test that every pooled connection of a file database gets the PRAGMAs"""
+    print("\nTesting SQLite PRAGMAs...")
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'tuned.db')}"
+        engine = create_engine(url, **engine_options(url, DevelopmentConfig.SQLALCHEMY_ENGINE_OPTIONS))
+        assert install_sqlite_pragmas(engine, DevelopmentConfig.SQLITE_PRAGMAS)
+        settings = engine_settings(engine, DevelopmentConfig.SQLITE_PRAGMAS)
+        pragmas = {name: value['effective'] for name, value in settings['pragmas'].items()}
+        assert pragmas['journal_mode'] == 'wal' and pragmas['synchronous'] == 'NORMAL'
+        assert pragmas['temp_store'] == 'MEMORY'
+        assert pragmas['cache_size'] == DevelopmentConfig.SQLITE_PRAGMAS['cache_size']
+        assert pragmas['busy_timeout'] == DevelopmentConfig.SQLITE_PRAGMAS['busy_timeout']
+        assert settings['pool']['class'] == 'QueuePool' and settings['pool']['pre_ping']
+        assert settings['pool']['size'] == DevelopmentConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+
+        # A second pooled connection is tuned as well
+        with engine.connect() as first, engine.connect() as second:
+            for connection in (first, second):
+                assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert os.path.exists(os.path.join(directory, 'tuned.db-wal'))
+        engine.dispose()
+    print("✅ File databases run in WAL mode with the configured PRAGMAs")
+
+def test_engine_endpoint():
+    """Test the /api/v1/admin/engine endpoint"""
+    print("\nTesting the engine settings endpoint...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        db.create_all()
+        suffix = uuid.uuid4().hex[:8]
+        admin = facade.create_user(f"engine.{suffix}@example.com", "Engine", "Admin", is_admin=True)
+        member = facade.create_user(f"engine.member.{suffix}@example.com", "Engine", "Member")
+        token = create_access_token(identity=admin.id, additional_claims={'is_admin': True})
+
+        response = client.get('/api/v1/admin/engine', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200
+        settings = response.get_json()
+        assert settings['dialect'] == 'sqlite' and settings['pool']['recycle'] == 1800
+        assert settings['pragmas']['journal_mode'] == {'configured': 'WAL', 'effective': 'wal'}
+        assert settings['engine_options']['pool_size'] == 5 and settings['repository']
+        headers = {'Authorization': f'Bearer {create_access_token(identity=member.id)}'}
+        assert client.get('/api/v1/admin/engine', headers=headers).status_code == 403
+        assert client.get('/api/v1/admin/engine').status_code == 401
+    print("✅ Engine endpoint reports the effective settings")
+
+if __name__ == "__main__":
+    test_engine_options_and_pragma_checks()
+    test_sqlite_pragmas_applied()
+    test_engine_endpoint()
+    print("\n🎉 All engine settings tests passed!")
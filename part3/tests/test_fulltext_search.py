@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for full-text place search (FTS5 and the in-memory inverted index)
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.fulltext import InvertedIndex, fts5_query, snippet, tokenize
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+# (name, description)
+LISTINGS = [
+    ("Seaside Villa", "Large villa with a private pool and a view of the sea"),
+    ("City Loft", "Bright loft close to the museums, pool table in the lounge"),
+    ("Mountain Chalet", "Cosy chalet near the ski lifts"),
+]
+
+def _populate(facade):
+    host = facade.create_user("texthost@example.com", "Text", "Host")
+    guest = facade.create_user("textguest@example.com", "Text", "Guest")
+    places = {}
+    for name, description in LISTINGS:
+        places[name] = facade.create_place(
+            name=name, description=description, address=name, city_id="nice",
+            latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=100, max_guests=2
+        )
+    facade.create_review(places["Mountain Chalet"].id, guest.id, 5,
+                         "Wonderful fondue evening, the sauna was great")
+    return places
+
+def _names(results):
+    return [place.name for place, _, _ in results]
+
+def _check_search(facade):
+    """Run the same full-text checks against any facade"""
+    places = _populate(facade)
+
+    # Name matches outrank description-only matches
+    assert _names(facade.search_places_text("villa")) == ["Seaside Villa"]
+    assert _names(facade.search_places_text("pool"))[0] in ("Seaside Villa", "City Loft")
+    assert set(_names(facade.search_places_text("pool"))) == {"Seaside Villa", "City Loft"}
+    assert _names(facade.search_places_text("private pool")) == ["Seaside Villa"]
+    assert _names(facade.search_places_text("SEASIDE villa", limit=1)) == ["Seaside Villa"]
+
+    # Review comments lead to their place
+    results = facade.search_places_text("fondue", snippets=True)
+    assert _names(results) == ["Mountain Chalet"]
+    assert "<mark>fondue</mark>" in results[0][2]
+
+    results = facade.search_places_text("ski", snippets=True)
+    assert "<mark>ski</mark>" in results[0][2]
+    assert facade.search_places_text("ski")[0][2] is None
+
+    # A matching review adds to its place's own score
+    before = dict((place.name, score) for place, score, _ in facade.search_places_text("pool"))
+    guest = facade.get_user_by_email("textguest@example.com")
+    facade.create_review(places["City Loft"].id, guest.id, 4, "The pool table was a hit")
+    ranked = facade.search_places_text("pool", snippets=True)
+    after = dict((place.name, score) for place, score, _ in ranked)
+    assert after["City Loft"] > before["City Loft"] and len(ranked) == 2
+    assert all("<mark>pool</mark>" in excerpt for _, _, excerpt in ranked)
+
+    # Amenity filters apply before the limit
+    runner_up = ranked[1][0]
+    sauna = facade.create_amenity("Sauna")
+    facade.update_place(runner_up.id, amenity_ids=[sauna.id])
+    assert _names(facade.search_places_text("pool", limit=1, amenity_ids=[sauna.id])) == [runner_up.name]
+
+    # Operators in user input are treated as plain words
+    assert facade.search_places_text('villa OR "chalet') == []
+    assert facade.search_places_text("submarine") == []
+
+    # Writes keep the index in sync
+    facade.update_place(places["City Loft"].id, name="Harbour Loft")
+    assert _names(facade.search_places_text("harbour")) == ["Harbour Loft"]
+    assert facade.search_places_text("city") == []
+    facade.delete_place(places["Mountain Chalet"].id)
+    assert facade.search_places_text("fondue") == []
+
+    try:
+        facade.search_places_text("  !! ")
+        assert False, "an empty query should be rejected"
+    except ValueError:
+        pass
+
+def test_fulltext_helpers():
+    """Test tokenization, query quoting, snippets and BM25 ranking"""
+    print("Testing full-text helpers...")
+    assert tokenize("Café, crème-brûlée!") == ["cafe", "creme", "brulee"]
+    assert fts5_query('wifi "pool" NEAR') == '"wifi" "pool" "near"'
+    assert snippet("A quiet room with a pool", {"pool"}) == "A quiet room with a <mark>pool</mark>"
+    long_text = " ".join(f"w{i}" for i in range(40)) + " target"
+    assert snippet(long_text, {"target"}).startswith("…")
+
+    index = InvertedIndex({'name': 5.0, 'description': 1.0})
+    index.insert("a", {'name': "Pool house", 'description': "garden"})
+    index.insert("b", {'name': "Garden flat", 'description': "shared pool"})
+    assert [key for key, _ in index.search("pool")] == ["a", "b"]
+    assert {key for key, _ in index.search("garden pool")} == {"a", "b"}
+    index.remove("a")
+    assert [key for key, _ in index.search("pool")] == ["b"]
+    assert index.search("house") == []
+    print("✅ Full-text helpers work")
+
+def test_in_memory_fulltext_search():
+    """Test text search on the in-memory inverted index"""
+    print("\nTesting in-memory full-text search...")
+    repo = InMemoryRepository()
+    _check_search(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory full-text search works")
+
+def test_sqlalchemy_fulltext_search():
+    """Test text search on the SQLite FTS5 tables"""
+    print("\nTesting SQLAlchemy full-text search...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        _check_search(facade)
+
+        # The FTS5 tables are populated by triggers, not by the repository
+        count = db.session.execute(text("SELECT COUNT(*) FROM places_fts")).scalar()
+        assert count == len(LISTINGS) - 1
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT rowid FROM places_fts WHERE places_fts MATCH 'villa'"
+        )).all()
+        assert any("VIRTUAL TABLE" in row[-1] for row in plan)
+    print("✅ SQLAlchemy full-text search works")
+
+def test_fulltext_search_endpoint():
+    """Test q= on GET /api/v1/places/search"""
+    print("\nTesting full-text search endpoint...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        response = client.get('/api/v1/places/search?q=villa&snippets=true&limit=5')
+        assert response.status_code == 200
+        for place in response.get_json():
+            assert place['score'] is not None and 'snippet' in place
+        response = client.get('/api/v1/places/search?q=villa&lat=0&lon=0&radius_km=1')
+        assert response.status_code == 200
+        assert client.get('/api/v1/places/search?q=%21%21').status_code == 400
+        assert client.get('/api/v1/places/search').status_code == 400
+    print("✅ Full-text search endpoint works")
+
+if __name__ == "__main__":
+    test_fulltext_helpers()
+    test_in_memory_fulltext_search()
+    test_sqlalchemy_fulltext_search()
+    test_fulltext_search_endpoint()
+    print("\n🎉 All full-text search tests passed!")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for InMemoryRepository secondary indexes
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.persistence.repository import InMemoryRepository
+from app.models.user import User
+from app.models.review import Review
+from app.models.amenity import Amenity
+
+def test_single_column_index():
+    """Test lookups through a single-column index"""
+    print("Testing single-column index...")
+
+    repo = InMemoryRepository()
+    alice = User("alice@example.com", "Alice", "Smith")
+    bob = User("bob@example.com", "Bob", "Jones")
+    repo.add(alice)
+    repo.add(bob)
+
+    assert repo.get_by_attribute(User, email="bob@example.com") == [bob]
+    assert repo.get_by_attribute(User, email="nobody@example.com") == []
+    assert ('email',) in repo._indexes['User']
+
+    print("✅ Single-column index lookups work")
+
+def test_composite_index_and_filtering():
+    """Test composite index lookups and extra filters on top of an index"""
+    print("\nTesting composite index...")
+
+    repo = InMemoryRepository()
+    r1 = Review("place-1", "user-1", 5, "Great")
+    r2 = Review("place-1", "user-2", 3, "Okay")
+    r3 = Review("place-2", "user-1", 4, "Nice")
+    for review in (r1, r2, r3):
+        repo.add(review)
+
+    assert repo._find_index('Review', {'place_id', 'user_id'}) == ('place_id', 'user_id')
+    assert repo.get_by_attribute(Review, place_id="place-1", user_id="user-2") == [r2]
+    assert repo.get_by_attribute(Review, place_id="place-1") == [r1, r2]
+    assert repo.get_by_attribute(Review, place_id="place-1", rating=5) == [r1]
+
+    print("✅ Composite index lookups work")
+
+def test_index_maintenance():
+    """Test that indexes follow updates and deletes"""
+    print("\nTesting index maintenance...")
+
+    repo = InMemoryRepository()
+    amenity = Amenity("WiFi")
+    repo.add(amenity)
+
+    amenity.name = "Fast WiFi"
+    repo.update(amenity)
+    assert repo.get_by_attribute(Amenity, name="WiFi") == []
+    assert repo.get_by_attribute(Amenity, name="Fast WiFi") == [amenity]
+
+    assert repo.delete(Amenity, amenity.id)
+    assert repo.get_by_attribute(Amenity, name="Fast WiFi") == []
+    assert repo._indexes['Amenity'][('name',)] == {}
+
+    print("✅ Indexes are maintained on update and delete")
+
+def test_declare_index_on_existing_data():
+    """Test declaring a new index after objects were stored"""
+    print("\nTesting index declaration on existing data...")
+
+    repo = InMemoryRepository()
+    user = User("carol@example.com", "Carol", "White")
+    repo.add(user)
+
+    repo.declare_index(User, 'last_name')
+    assert repo._indexes['User'][('last_name',)] == {("White",): {user.id: None}}
+    assert repo.get_by_attribute(User, last_name="White") == [user]
+
+    print("✅ Declared index is populated from existing objects")
+
+if __name__ == "__main__":
+    test_single_column_index()
+    test_composite_index_and_filtering()
+    test_index_maintenance()
+    test_declare_index_on_existing_data()
+    print("\n🎉 All index tests passed!")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for indexed login lookups
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def test_in_memory_authenticate():
+    """Test authentication through the in-memory email index"""
+    print("Testing in-memory login lookup...")
+
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    user = facade.create_user("login@example.com", "Log", "In", "secret123")
+
+    assert facade.authenticate_user("login@example.com", "secret123") is user
+    assert facade.authenticate_user("login@example.com", "wrong-pass") is None
+    assert facade.authenticate_user("nobody@example.com", "secret123") is None
+
+    print("✅ In-memory login uses the email index")
+
+def test_sqlalchemy_authenticate_single_select():
+    """Test that a SQL login, response included, runs one indexed SELECT"""
+    print("\nTesting SQLAlchemy login lookup...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        facade.create_user("sqllogin@example.com", "Sql", "Login", "secret123")
+        db.session.expunge_all()
+
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            user = facade.authenticate_user("sqllogin@example.com", "secret123")
+            # The login response reads only columns loaded by that query
+            response = user.to_dict()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        assert response['first_name'] == "Sql" and response['last_name'] == "Login"
+        assert response['created_at'] and response['updated_at']
+        assert len(statements) == 1, statements
+        assert "password_hash" in statements[0] and "WHERE users.email" in statements[0]
+        assert facade.authenticate_user("sqllogin@example.com", "wrong-pass") is None
+
+    print("✅ SQLAlchemy login answers with one SELECT")
+
+if __name__ == "__main__":
+    test_in_memory_authenticate()
+    test_sqlalchemy_authenticate_single_select()
+    print("\n🎉 All login lookup tests passed!")
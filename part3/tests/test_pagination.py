@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination, count() and exists()
+"""
+
+import os
+import re
+import sys
+import uuid
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+from app.utils.pagination import decode_cursor, encode_cursor
+
+def _populate(facade):
+    # Amenities share created_at in pairs so the id breaks the ties
+    stamps = [datetime(2024, 1, 1 + i // 2) for i in range(7)]
+    for i, stamp in enumerate(stamps):
+        amenity = Amenity(f"Amenity {i}")
+        amenity.created_at = stamp
+        facade.repo.add(amenity)
+    host = facade.create_user("pagehost@example.com", "Page", "Host")
+    guest = facade.create_user("pageguest@example.com", "Page", "Guest")
+    place = facade.create_place(
+        name="Paged", description="", address="1 Page St", city_id="nice",
+        latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+        number_of_bathrooms=1, price_per_night=100, max_guests=2
+    )
+    facade.create_review(place.id, guest.id, 5, "Great")
+    return host, guest, place
+
+def _walk(fetch, limit):
+    """Follow pages until the last one, returning every object seen"""
+    seen, after = [], None
+    while True:
+        page, more, total = fetch(limit, after)
+        seen.extend(page)
+        if not more:
+            return seen, total
+        after = (page[-1].created_at, page[-1].id)
+
+def _check_pagination(facade):
+    """Run the same pagination checks against any facade"""
+    host, guest, place = _populate(facade)
+
+    everything = sorted(facade.get_all_amenities(), key=lambda a: (a.created_at, a.id))
+    for limit in (1, 2, 3, 7, 50):
+        seen, total = _walk(facade.get_amenities_page, limit)
+        assert [a.id for a in seen] == [a.id for a in everything], limit
+        assert total == 7
+
+    users, more, total = facade.get_users_page(1)
+    assert len(users) == 1 and more and total == 2
+    reviews, more, total = facade.get_reviews_page(10, place_id=place.id)
+    assert len(reviews) == 1 and not more and total == 1
+    assert facade.get_reviews_page(10, place_id="missing") == ([], False, 0)
+    places, more, total = facade.get_places_page(10, min_price=50)
+    assert [p.id for p in places] == [place.id] and total == 1
+    assert facade.get_places_page(10, min_price=500)[2] == 0
+
+    # count() and exists() on both repositories
+    assert facade.repo.count(Amenity) == 7
+    assert facade.repo.count(Amenity, name="Amenity 3") == 1
+    assert facade.repo.exists(Review, place_id=place.id, user_id=guest.id)
+    assert not facade.repo.exists(Review, place_id=place.id, user_id=host.id)
+    assert facade.user_repo.count(User) == 2
+    assert facade.user_repo.exists(User, email="pagehost@example.com")
+    assert not facade.user_repo.exists(User, email="nobody@example.com")
+
+    try:
+        facade.get_users_page(0)
+        assert False, "limit 0 should be rejected"
+    except ValueError:
+        pass
+
+def test_cursor_encoding():
+    """Test that cursors round-trip and reject garbage"""
+    print("Testing cursor encoding...")
+    amenity = Amenity("Cursor")
+    assert decode_cursor(encode_cursor(amenity)) == (amenity.created_at, amenity.id)
+    for bad in ("%%%", "bm90LWEtY3Vyc29y"):
+        try:
+            decode_cursor(bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+    print("✅ Cursor encoding works")
+
+def test_in_memory_pagination():
+    """Test keyset pagination on the in-memory repository"""
+    print("\nTesting in-memory pagination...")
+    repo = InMemoryRepository()
+    _check_pagination(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory pagination works")
+
+def test_sqlalchemy_pagination():
+    """Test keyset pagination on the SQLAlchemy repositories"""
+    print("\nTesting SQLAlchemy pagination...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _check_pagination(HBnBFacade(repository=SQLAlchemyRepository(),
+                                     user_repository=UserRepository()))
+    print("✅ SQLAlchemy pagination works")
+
+def test_pagination_endpoints():
+    """Test limit, cursor, Link and X-Total-Count on the list endpoints"""
+    print("\nTesting paginated list endpoints...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        for i in range(3):
+            facade.create_amenity(f"Paged {uuid.uuid4().hex[:8]}")
+
+        seen, url = [], '/api/v1/amenities/?limit=2'
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            seen.extend(amenity['id'] for amenity in response.get_json())
+            total = int(response.headers['X-Total-Count'])
+            found = re.search(r'<([^>]+)>; rel="next"', response.headers['Link'])
+            url = found.group(1) if found else None
+        assert len(seen) == len(set(seen)) == total
+
+        for path in ('/api/v1/users/', '/api/v1/places/', '/api/v1/reviews/'):
+            response = client.get(f'{path}?limit=1')
+            assert response.status_code == 200 and len(response.get_json()) <= 1
+            assert 'X-Total-Count' in response.headers
+            assert client.get(f'{path}?cursor=garbage').status_code == 400
+            assert client.get(f'{path}?limit=0').status_code == 400
+        cursor = encode_cursor(Amenity("Cursor"))
+        assert client.get(f'/api/v1/places/?sort=price&cursor={cursor}').status_code == 400
+    print("✅ Paginated list endpoints work")
+
+if __name__ == "__main__":
+    test_cursor_encoding()
+    test_in_memory_pagination()
+    test_sqlalchemy_pagination()
+    test_pagination_endpoints()
+    print("\n🎉 All pagination tests passed!")
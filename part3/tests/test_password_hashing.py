@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the off-thread bcrypt hashing pool
+"""
+
+import os
+import sys
+import threading
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask import Flask
+from flask_bcrypt import Bcrypt
+from app.utils.hashing import PasswordHasher, PasswordHashingUnavailable
+
+def _make_hasher(**settings):
+    """Build a hasher configured like create_app would"""
+    app = Flask(__name__)
+    app.config.update(BCRYPT_LOG_ROUNDS=4, PASSWORD_HASHER_EXECUTOR='thread',
+                      PASSWORD_HASHER_WORKERS=2, PASSWORD_HASHER_MAX_QUEUE=4,
+                      PASSWORD_HASHER_TIMEOUT=5.0)
+    app.config.update(settings)
+    bcrypt = Bcrypt(app)
+    return PasswordHasher(bcrypt, app), bcrypt
+
+def test_hash_and_check_on_pool():
+    """Test hashing and verification on the thread pool"""
+    print("Testing pooled hashing...")
+
+    hasher, _ = _make_hasher()
+    pw_hash = hasher.generate_password_hash("secret123")
+    assert pw_hash.startswith("$2b$04$"), "BCRYPT_LOG_ROUNDS should be honoured"
+    assert hasher.check_password_hash(pw_hash, "secret123")
+    assert not hasher.check_password_hash(pw_hash, "wrong")
+
+    metrics = hasher.metrics()
+    assert metrics['executor'] == 'thread'
+    assert metrics['submitted'] == 3 and metrics['completed'] == 3
+    assert metrics['in_flight'] == 0 and metrics['avg_latency_ms'] > 0
+    hasher.shutdown()
+
+    print("✅ Pooled hashing works and records metrics")
+
+def test_bounded_queue_rejects_work():
+    """Test that a saturated pool rejects work instead of queueing forever"""
+    print("\nTesting bounded queue...")
+
+    hasher, bcrypt = _make_hasher(PASSWORD_HASHER_WORKERS=1, PASSWORD_HASHER_MAX_QUEUE=0)
+    release = threading.Event()
+    original = bcrypt.generate_password_hash
+    bcrypt.generate_password_hash = lambda password: (release.wait(), original(password))[1]
+
+    worker = threading.Thread(target=hasher.generate_password_hash, args=("secret123",))
+    worker.start()
+    while hasher.metrics()['in_flight'] == 0:
+        pass
+    try:
+        hasher.generate_password_hash("secret456")
+        assert False, "Saturated pool should reject work"
+    except PasswordHashingUnavailable:
+        pass
+    release.set()
+    worker.join()
+
+    assert hasher.metrics()['rejected'] == 1
+    hasher.shutdown()
+
+    print("✅ Saturated pool rejects new work")
+
+def test_timeout():
+    """Test that callers stop waiting after the configured timeout"""
+    print("\nTesting hashing timeout...")
+
+    hasher, bcrypt = _make_hasher(PASSWORD_HASHER_TIMEOUT=0.05)
+    release = threading.Event()
+    original = bcrypt.generate_password_hash
+    bcrypt.generate_password_hash = lambda password: (release.wait(), original(password))[1]
+    try:
+        hasher.generate_password_hash("secret123")
+        assert False, "Slow hash should time out"
+    except PasswordHashingUnavailable:
+        pass
+    release.set()
+    assert hasher.metrics()['timeouts'] == 1
+    hasher.shutdown()
+
+    print("✅ Hashing timeout is enforced")
+
+if __name__ == "__main__":
+    test_hash_and_check_on_pool()
+    test_bounded_queue_rejects_work()
+    test_timeout()
+    print("\n🎉 All password hashing tests passed!")
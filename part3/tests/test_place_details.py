@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for eager-loaded place listings (no N+1 queries)
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def _populate(facade, count):
+    """Create a host, a guest, amenities and `count` reviewed places"""
+    host = facade.create_user("detailhost@example.com", "Host", "User")
+    guest = facade.create_user("detailguest@example.com", "Guest", "User")
+    wifi = facade.create_amenity("Detail WiFi")
+    pool = facade.create_amenity("Detail Pool")
+    for i in range(count):
+        place = facade.create_place(
+            name=f"Place {i}", description="", address=f"{i} Main St", city_id="c1",
+            latitude=10.0, longitude=20.0, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=100 + i, max_guests=2,
+            amenity_ids=[wifi.id, pool.id]
+        )
+        facade.create_review(place.id, guest.id, 4, f"Review {i}")
+    return host
+
+def _check_details(places, host, count):
+    """Check that every place carries its host, amenities and reviews"""
+    assert len(places) == count
+    for place in places:
+        assert place['host']['id'] == host.id
+        assert sorted(a['name'] for a in place['amenities']) == ["Detail Pool", "Detail WiFi"]
+        assert len(place['reviews']) == 1
+
+def test_in_memory_place_details():
+    """Test the batched in-memory path"""
+    print("Testing in-memory place details...")
+
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = _populate(facade, 5)
+    _check_details(facade.get_places_with_details(), host, 5)
+
+    try:
+        facade.get_place_with_details("missing-id")
+        assert False, "Missing place should raise"
+    except ValueError:
+        pass
+
+    print("✅ In-memory place details are complete")
+
+def test_sqlalchemy_place_details_query_count():
+    """Test that the SQLAlchemy path uses a fixed number of queries"""
+    print("\nTesting SQLAlchemy place details query count...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        host = _populate(facade, 10)
+        db.session.expire_all()
+
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            places = facade.get_places_with_details()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+
+        _check_details(places, host, 10)
+        assert len(statements) <= 3, f"Expected at most 3 queries, got {len(statements)}"
+
+    print(f"✅ Loaded 10 places with {len(statements)} queries")
+
+if __name__ == "__main__":
+    test_in_memory_place_details()
+    test_sqlalchemy_place_details_query_count()
+    print("\n🎉 All place details tests passed!")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for faceted counts on place listing and search
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.persistence.indexes import SortedIndex
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+# (name, city_id, price, guests, amenities)
+LISTINGS = [
+    ("Studio", "paris", 40.0, 1, ["WiFi"]),
+    ("Loft", "paris", 120.0, 4, ["WiFi", "Pool"]),
+    ("Villa", "nice", 650.0, 10, ["WiFi", "Pool"]),
+    ("Cabin", "nice", 90.0, 3, []),
+]
+
+def _populate(facade):
+    host = facade.create_user("facethost@example.com", "Facet", "Host")
+    amenities = {name: facade.create_amenity(name).id for name in ("WiFi", "Pool", "Sauna")}
+    for name, city_id, price, guests, amenity_names in LISTINGS:
+        facade.create_place(
+            name=name, description="", address=name, city_id=city_id,
+            latitude=43.7, longitude=7.26, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=price, max_guests=guests,
+            amenity_ids=[amenities[a] for a in amenity_names]
+        )
+    return amenities
+
+def _counts(buckets):
+    return [bucket['count'] for bucket in buckets]
+
+def _check_facets(facade):
+    """Run the same facet checks against any facade"""
+    amenities = _populate(facade)
+
+    facets = facade.get_place_facets(['amenities', 'price', 'guests'])
+    assert [(a['name'], a['count']) for a in facets['amenities']] == [("WiFi", 3), ("Pool", 2)]
+    # Price edges 0, 50, 100, 200, 500; guest edges 0, 2, 4, 6, 8
+    assert _counts(facets['price']) == [1, 1, 1, 0, 1]
+    assert facets['price'][-1] == {'min': 500, 'max': None, 'count': 1}
+    assert _counts(facets['guests']) == [1, 1, 1, 0, 1]
+
+    # Facets follow the current filter
+    facets = facade.get_place_facets(['amenities', 'price'], city_id="paris")
+    assert [(a['name'], a['count']) for a in facets['amenities']] == [("WiFi", 2), ("Pool", 1)]
+    assert _counts(facets['price']) == [1, 0, 1, 0, 0]
+    facets = facade.get_place_facets(['guests'], min_price=100, amenity_ids=[amenities["Pool"]])
+    assert _counts(facets['guests']) == [0, 0, 1, 0, 1]
+    facets = facade.get_place_facets(['amenities', 'price'], amenity_ids=[amenities["Sauna"]])
+    assert facets['amenities'] == [] and sum(_counts(facets['price'])) == 0
+
+    # Restricting to search results
+    nice = [p.id for p in facade.filter_places(city_id="nice")]
+    assert _counts(facade.get_place_facets(['price'], place_ids=nice)['price']) == [0, 1, 0, 0, 1]
+
+    try:
+        facade.get_place_facets(['colour'])
+        assert False, "unknown facets should be rejected"
+    except ValueError:
+        pass
+
+def test_sorted_index_histogram():
+    """Test bucket counts read from a sorted index"""
+    print("Testing sorted index histogram...")
+    index = SortedIndex()
+    for key, value in [("a", 10), ("b", 50), ("c", 50), ("d", 99), ("e", 500)]:
+        index.insert(key, value)
+    assert index.histogram((0, 50, 100)) == [1, 3, 1]
+    assert index.histogram((20, 100), keys=["a", "b", "e", "zz"]) == [1, 1]
+    print("✅ Sorted index histogram works")
+
+def test_in_memory_place_facets():
+    """Test facets counted from the in-memory indexes"""
+    print("\nTesting in-memory place facets...")
+    repo = InMemoryRepository()
+    _check_facets(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory place facets work")
+
+def test_sqlalchemy_place_facets():
+    """Test facets computed with grouped SQL, including chunked ID filters"""
+    print("\nTesting SQLAlchemy place facets...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        repo = SQLAlchemyRepository()
+        _check_facets(HBnBFacade(repository=repo, user_repository=UserRepository()))
+
+        repo.MAX_IN_IDS = 1
+        facade = HBnBFacade(repository=repo, user_repository=UserRepository())
+        ids = [place.id for place in facade.get_all_places()]
+        facets = facade.get_place_facets(['amenities', 'guests'], place_ids=ids)
+        assert [a['count'] for a in facets['amenities']] == [3, 2]
+        assert _counts(facets['guests']) == [1, 1, 1, 0, 1]
+    print("✅ SQLAlchemy place facets work")
+
+def test_place_facets_endpoint():
+    """Test the facets option on listing and search"""
+    print("\nTesting place facets endpoint...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        response = client.get('/api/v1/places/?facets=price,guests&limit=1')
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body['places']) <= 1
+        assert 'amenities' not in body['facets'] and len(body['facets']['price']) == 5
+        response = client.get('/api/v1/places/search?lat=43.7&lon=7.26&radius_km=1&facets=amenities')
+        assert response.status_code == 200 and 'amenities' in response.get_json()['facets']
+        assert client.get('/api/v1/places/?facets=colour').status_code == 400
+    print("✅ Place facets endpoint works")
+
+if __name__ == "__main__":
+    test_sorted_index_histogram()
+    test_in_memory_place_facets()
+    test_sqlalchemy_place_facets()
+    test_place_facets_endpoint()
+    print("\n🎉 All place facet tests passed!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for place listing range filters and sorting
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.indexes import SortedIndex
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+# (name, city_id, price, guests, rooms)
+LISTINGS = [
+    ("Studio", "paris", 60.0, 2, 1),
+    ("Loft", "paris", 120.0, 4, 2),
+    ("Villa", "nice", 300.0, 8, 4),
+    ("Cabin", "nice", 90.0, 4, 2),
+    ("Flat", "lyon", 120.0, 3, 2),
+]
+
+def _populate(facade):
+    host = facade.create_user("filterhost@example.com", "Filter", "Host")
+    places = {}
+    for name, city_id, price, guests, rooms in LISTINGS:
+        places[name] = facade.create_place(
+            name=name, description="", address=name, city_id=city_id,
+            latitude=45.0, longitude=5.0, host_id=host.id, number_of_rooms=rooms,
+            number_of_bathrooms=1, price_per_night=price, max_guests=guests
+        )
+    return places
+
+def _names(places):
+    return [place.name for place in places]
+
+def _check_filters(facade):
+    """Run the same filter checks against any facade"""
+    places = _populate(facade)
+
+    # Loft and Flat tie on price, so only check the price order
+    prices = [place.price_per_night for place in facade.filter_places(sort='price')]
+    assert prices == [60.0, 90.0, 120.0, 120.0, 300.0]
+    assert _names(facade.filter_places(sort='-price', limit=2))[0] == "Villa"
+    assert set(_names(facade.filter_places(min_price=90, max_price=120))) == {"Cabin", "Loft", "Flat"}
+    assert set(_names(facade.filter_places(min_guests=4, city_id="nice"))) == {"Villa", "Cabin"}
+    assert _names(facade.filter_places(city_id="paris", sort='-guests')) == ["Loft", "Studio"]
+    assert _names(facade.filter_places(min_rooms=2, max_price=100)) == ["Cabin"]
+    assert facade.filter_places(min_price=1000) == []
+
+    # Indexes follow updates and deletes
+    facade.update_place(places["Villa"].id, price_per_night=50.0)
+    assert _names(facade.filter_places(sort='price', limit=1)) == ["Villa"]
+    facade.delete_place(places["Villa"].id)
+    assert "Villa" not in _names(facade.filter_places(max_price=100))
+
+    for bad in ({'sort': 'colour'}, {'min_price': 10, 'max_price': 5}):
+        try:
+            facade.filter_places(**bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+
+def test_sorted_index():
+    """Test bisect range scans on the sorted index"""
+    print("Testing sorted index...")
+    index = SortedIndex()
+    for key, value in [("a", 10), ("b", 20), ("c", 20), ("d", 30)]:
+        index.insert(key, value)
+    assert list(index.range(20, 20)) == ["b", "c"]
+    assert list(index.range(15)) == ["b", "c", "d"]
+    assert list(index.range(high=20, descending=True)) == ["c", "b", "a"]
+    assert index.count(11, 29) == 2
+    index.insert("a", 25)
+    index.remove("c")
+    index.insert("e", None)
+    assert list(index.range()) == ["b", "a", "d"]
+    print("✅ Sorted index works")
+
+def test_in_memory_place_filters():
+    """Test place filters on the in-memory hash and sorted indexes"""
+    print("\nTesting in-memory place filters...")
+    repo = InMemoryRepository()
+    _check_filters(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory place filters work")
+
+def test_sqlalchemy_place_filters():
+    """Test place filters with indexed SQL"""
+    print("\nTesting SQLAlchemy place filters...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        _check_filters(facade)
+
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM places WHERE price_per_night BETWEEN 50 AND 100"
+        )).all()
+        assert any("idx_places_price" in row[-1] for row in plan), "price filter should use its index"
+    print("✅ SQLAlchemy place filters work")
+
+def test_place_filters_endpoint():
+    """Test filter parameters on GET /api/v1/places/"""
+    print("\nTesting place listing filters endpoint...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        response = client.get('/api/v1/places/?min_price=abc')
+        assert response.status_code == 400
+        response = client.get('/api/v1/places/?sort=colour')
+        assert response.status_code == 400
+        response = client.get('/api/v1/places/?min_price=0&sort=-price&limit=3')
+        assert response.status_code == 200
+        prices = [place['price_per_night'] for place in response.get_json()]
+        assert len(prices) <= 3 and prices == sorted(prices, reverse=True)
+    print("✅ Place listing filters endpoint works")
+
+if __name__ == "__main__":
+    test_sorted_index()
+    test_in_memory_place_filters()
+    test_sqlalchemy_place_filters()
+    test_place_filters_endpoint()
+    print("\n🎉 All place filter tests passed!")
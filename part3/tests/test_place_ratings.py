@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for incrementally maintained place rating aggregates
+"""
+
+import os
+import sys
+import threading
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.place_rating import PlaceRating
+from app.persistence.concurrent_repository import ConcurrentInMemoryRepository
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def _create_place(facade, host, name):
+    return facade.create_place(
+        name=name, description="", address="1 Main St", city_id="c1",
+        latitude=1.0, longitude=2.0, host_id=host.id, number_of_rooms=1,
+        number_of_bathrooms=1, price_per_night=80, max_guests=2
+    )
+
+def _check_aggregates(facade):
+    """Run the same aggregate checks against any facade"""
+    host = facade.create_user("ratinghost@example.com", "Host", "User")
+    guests = [facade.create_user(f"rater{i}@example.com", "Rater", "User") for i in range(3)]
+    place = _create_place(facade, host, "Rated Place")
+    other = _create_place(facade, host, "Other Place")
+
+    assert facade.get_place_rating(place.id) == PlaceRating.empty_dict()
+
+    r1 = facade.create_review(place.id, guests[0].id, 5, "Excellent")
+    facade.create_review(place.id, guests[1].id, 3, "Fine")
+    facade.create_review(other.id, guests[2].id, 4, "Good")
+    rating = facade.get_place_rating(place.id)
+    assert rating['count'] == 2 and rating['sum'] == 8 and rating['average'] == 4.0
+    assert rating['histogram'] == {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1}
+
+    facade.update_review(r1.id, rating=1)
+    rating = facade.get_place_rating(place.id)
+    assert rating['sum'] == 4 and rating['histogram']['1'] == 1 and rating['histogram']['5'] == 0
+
+    facade.delete_review(r1.id)
+    assert facade.get_place_rating(place.id)['count'] == 1
+
+    details = facade.get_place_with_details(place.id)
+    assert details['rating']['average'] == 3.0
+
+    # Deleting a reviewer removes their reviews from the aggregates
+    facade.delete_user(guests[1].id)
+    assert facade.get_place_rating(place.id)['count'] == 0
+    assert facade.get_place_rating(other.id)['count'] == 1
+
+    # Rebuilding from scratch gives the same result
+    assert facade.rebuild_place_ratings() == 1
+    assert facade.get_place_rating(other.id)['histogram']['4'] == 1
+
+    # Deleting the host removes their places and aggregates
+    facade.delete_user(host.id)
+    assert facade.repo.get(PlaceRating, other.id) is None
+    assert facade.get_all_reviews() == []
+
+def test_in_memory_place_ratings():
+    """Test rating aggregates on the in-memory backend"""
+    print("Testing in-memory rating aggregates...")
+    repo = InMemoryRepository()
+    _check_aggregates(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory rating aggregates stay in sync")
+
+def test_sqlalchemy_place_ratings():
+    """Test rating aggregates on the SQLAlchemy backend"""
+    print("\nTesting SQLAlchemy rating aggregates...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _check_aggregates(HBnBFacade(repository=SQLAlchemyRepository(),
+                                     user_repository=UserRepository()))
+    print("✅ SQLAlchemy rating aggregates stay in sync")
+
+def test_concurrent_increments():
+    """Test that rating increments from several threads are all counted"""
+    print("\nTesting concurrent rating increments...")
+    repo = ConcurrentInMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    host = facade.create_user("incrementhost@example.com", "Host", "User")
+    place = _create_place(facade, host, "Busy Place")
+    assert repo.increment(PlaceRating, place.id, PlaceRating.deltas(5, 1)) is None
+
+    def rate():
+        for _ in range(500):
+            repo.increment(PlaceRating, place.id, PlaceRating.deltas(4, 1), create=True)
+
+    threads = [threading.Thread(target=rate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rating = facade.get_place_rating(place.id)
+    assert rating['count'] == 2000 and rating['sum'] == 8000 and rating['histogram']['4'] == 2000
+    print("✅ No increment is lost")
+
+def test_sqlalchemy_atomic_rating_updates():
+    """Test that SQL aggregates change through UPDATE ... SET column = column + delta"""
+    print("\nTesting atomic SQL rating updates...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        host = facade.create_user("atomichost@example.com", "Host", "User")
+        guests = [facade.create_user(f"atomic{i}@example.com", "Rater", "User") for i in range(2)]
+        place = _create_place(facade, host, "Atomic Place")
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            review = facade.create_review(place.id, guests[0].id, 5, "Great")
+            facade.create_review(place.id, guests[1].id, 2, "Meh")
+            facade.update_review(review.id, rating=3)
+            writes = [s for s in statements if 'place_ratings' in s and 'SELECT' not in s]
+            assert writes and all(s.startswith(('INSERT OR IGNORE', 'INSERT INTO place_ratings',
+                                                'UPDATE place_ratings')) for s in writes)
+            assert all('place_ratings.review_count +' in s for s in writes if s.startswith('UPDATE'))
+
+            # The rebuild reads the reviews once, already grouped
+            del statements[:]
+            assert facade.rebuild_place_ratings() == 1
+            reads = [s for s in statements if 'FROM reviews' in s]
+            assert len(reads) == 1 and 'GROUP BY' in reads[0]
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        rating = facade.get_place_rating(place.id)
+        assert rating['count'] == 2 and rating['sum'] == 5
+        assert rating['histogram'] == {'1': 0, '2': 1, '3': 1, '4': 0, '5': 0}
+    print("✅ SQL rating aggregates are updated in place")
+
+if __name__ == "__main__":
+    test_in_memory_place_ratings()
+    test_sqlalchemy_place_ratings()
+    test_concurrent_increments()
+    test_sqlalchemy_atomic_rating_updates()
+    print("\n🎉 All rating aggregate tests passed!")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for location-based place search (radius and bounding box)
+"""
+
+import math
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.repository import InMemoryRepository
+from app.persistence.spatial import GridIndex
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+from app.utils.geo import EARTH_RADIUS_KM, bounding_boxes, haversine_km
+
+# (name, latitude, longitude)
+CITIES = [
+    ("Paris", 48.8566, 2.3522),
+    ("Versailles", 48.8049, 2.1204),
+    ("London", 51.5074, -0.1278),
+    ("Fiji East", -17.0, 179.9),
+    ("Fiji West", -17.0, -179.9),
+]
+
+def _populate(facade):
+    host = facade.create_user("geohost@example.com", "Geo", "Host")
+    places = {}
+    for name, lat, lon in CITIES:
+        places[name] = facade.create_place(
+            name=name, description="", address=name, city_id=name.lower(),
+            latitude=lat, longitude=lon, host_id=host.id, number_of_rooms=1,
+            number_of_bathrooms=1, price_per_night=100, max_guests=2
+        )
+    return places
+
+def _check_search(facade):
+    """Run the same search checks against any facade"""
+    places = _populate(facade)
+
+    ranked = facade.search_places_nearby(48.8566, 2.3522, 30)
+    assert [p.name for p, _ in ranked] == ["Paris", "Versailles"]
+    assert ranked[0][1] < 0.01 and 15 < ranked[1][1] < 20
+
+    assert len(facade.search_places_nearby(48.8566, 2.3522, 500)) == 3
+    assert [p.name for p, _ in facade.search_places_nearby(48.8566, 2.3522, 500, limit=1)] == ["Paris"]
+
+    # Searching across the antimeridian finds places on both sides
+    names = {p.name for p, _ in facade.search_places_nearby(-17.0, 180.0, 50)}
+    assert names == {"Fiji East", "Fiji West"}
+    names = {p.name for p in facade.search_places_in_bbox(-18, 179, -16, -179)}
+    assert names == {"Fiji East", "Fiji West"}
+
+    names = {p.name for p in facade.search_places_in_bbox(48, 0, 52, 3)}
+    assert names == {"Paris", "Versailles"}
+
+    # The index follows coordinate updates
+    facade.update_place(places["London"].id, latitude=48.85, longitude=2.35)
+    assert len(facade.search_places_nearby(48.8566, 2.3522, 30)) == 3
+    assert facade.search_places_in_bbox(51, -1, 52, 0) == []
+
+def _destination(lat, lon, bearing, distance_km):
+    """Point reached from (lat, lon) after distance_km on a bearing"""
+    angle = distance_km / EARTH_RADIUS_KM
+    phi, theta = math.radians(lat), math.radians(bearing)
+    phi2 = math.asin(math.sin(phi) * math.cos(angle) + math.cos(phi) * math.sin(angle) * math.cos(theta))
+    d_lambda = math.atan2(math.sin(theta) * math.sin(angle) * math.cos(phi),
+                          math.cos(angle) - math.sin(phi) * math.sin(phi2))
+    return math.degrees(phi2), (lon + math.degrees(d_lambda) + 540) % 360 - 180
+
+def test_geo_helpers():
+    """Test haversine distances and bounding boxes"""
+    print("Testing geo helpers...")
+
+    assert 340 < haversine_km(48.8566, 2.3522, 51.5074, -0.1278) < 345
+    assert len(bounding_boxes(0, 179.9, 50)) == 2
+    assert bounding_boxes(89.9, 0, 50)[0][1:4:2] == (-180.0, 180.0)
+
+    # Points just inside the circle, in every direction, fall inside a box
+    for lat, lon in ((0, 0), (60, 10), (-75, 179.5)):
+        for bearing in range(0, 360, 5):
+            point_lat, point_lon = _destination(lat, lon, bearing, 99.9)
+            assert haversine_km(lat, lon, point_lat, point_lon) <= 100
+            assert any(box[0] <= point_lat <= box[2] and box[1] <= point_lon <= box[3]
+                       for box in bounding_boxes(lat, lon, 100)), (lat, lon, bearing)
+
+    grid = GridIndex(cell_size=1.0)
+    grid.insert("a", 10.5, 10.5)
+    grid.insert("b", 20.5, 20.5)
+    assert list(grid.query(10, 10, 11, 11)) == ["a"]
+    grid.insert("a", 20.2, 20.2)
+    assert sorted(grid.query(20, 20, 21, 21)) == ["a", "b"]
+    grid.remove("b")
+    assert list(grid.query(-90, -180, 90, 180)) == ["a"]
+
+    print("✅ Geo helpers work")
+
+def test_in_memory_place_search():
+    """Test spatial search on the in-memory grid index"""
+    print("\nTesting in-memory place search...")
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    _check_search(facade)
+
+    # A place 99.96 km away is found by a 100 km search
+    edge = facade.create_place(
+        name="Edge", description="", address="Equator", city_id="edge", latitude=0.899,
+        longitude=0, host_id=facade.get_user_by_email("geohost@example.com").id,
+        number_of_rooms=1, number_of_bathrooms=1, price_per_night=100, max_guests=2)
+    assert [p.id for p, _ in facade.search_places_nearby(0, 0, 100)] == [edge.id]
+    print("✅ In-memory spatial search works")
+
+def test_sqlalchemy_place_search():
+    """Test spatial search on the SQLite R*Tree"""
+    print("\nTesting SQLAlchemy place search...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        _check_search(facade)
+
+        rows = db.session.execute(text("SELECT COUNT(*) FROM place_rtree")).scalar()
+        assert rows == len(CITIES), "R*Tree should hold one row per place"
+        host = facade.get_user_by_email("geohost@example.com")
+        facade.delete_user(host.id)
+        assert db.session.execute(text("SELECT COUNT(*) FROM place_rtree")).scalar() == 0
+    print("✅ SQLAlchemy spatial search works")
+
+if __name__ == "__main__":
+    test_geo_helpers()
+    test_in_memory_place_search()
+    test_sqlalchemy_place_search()
+    print("\n🎉 All place search tests passed!")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for the t-digest / HyperLogLog sketches and their admin endpoints
+"""
+
+import os
+import random
+import sys
+import tempfile
+import uuid
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sketches import AnalyticsSketches, HyperLogLog, TDigest
+from app.services.facade import HBnBFacade
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    position = q * (len(ordered) - 1)
+    below = int(position)
+    above = min(below + 1, len(ordered) - 1)
+    return ordered[below] + (ordered[above] - ordered[below]) * (position - below)
+
+def test_tdigest_accuracy():
+    """Test t-digest quantiles against exact ones, before and after serialization"""
+    print("Testing t-digest...")
+    rng = random.Random(7)
+    prices = [rng.lognormvariate(4.5, 0.7) for _ in range(50000)]
+    digest = TDigest()
+    for price in prices:
+        digest.add(price)
+    restored, _ = TDigest.from_bytes(digest.to_bytes())
+    for q in (0.5, 0.9, 0.99):
+        exact = _exact_quantile(prices, q)
+        assert abs(digest.quantile(q) - exact) / exact < 0.02, (q, digest.quantile(q), exact)
+        assert restored.quantile(q) == digest.quantile(q)
+    assert len(digest.to_bytes()) < 4096 and len(restored) == 50000
+
+    small = TDigest()
+    for price in (80, 100, 240):
+        small.add(price)
+    assert small.quantile(0.5) == 100 and small.quantile(0) == 80 and small.quantile(1) == 240
+    assert TDigest().quantile(0.5) is None
+    print("✅ t-digest quantiles are within 2%")
+
+def test_hyperloglog_accuracy():
+    """Test HyperLogLog estimates, sparse and dense, and merging"""
+    print("\nTesting HyperLogLog...")
+    small = HyperLogLog()
+    for i in range(40):
+        small.add(f"user-{i % 20}")
+    assert small.estimate() == 20 and len(small.to_bytes()) < 100
+
+    large, other = HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        (large if i % 2 else other).add(f"user-{i}")
+    large.merge(other)
+    assert abs(large.estimate() - 20000) / 20000 < 0.1  # about 3 standard errors
+    restored, _ = HyperLogLog.from_bytes(large.to_bytes())
+    assert restored.estimate() == large.estimate() and len(large.to_bytes()) < 1100
+    print("✅ HyperLogLog counts are within 10%")
+
+def test_sketch_store_drift_and_round_trip():
+    """Test drift tracking and whole-store serialization"""
+    print("\nTesting AnalyticsSketches...")
+    sketches = AnalyticsSketches(max_drift=0.1)
+    for i in range(20):
+        sketches.add_price("lyon" if i % 2 else None, 50 + i)
+    sketches.add_reviewer("host-1", "user-1")
+    sketches.mark_stale(2)
+    assert not sketches.needs_rebuild()
+    sketches.mark_stale()
+    assert sketches.needs_rebuild()
+
+    copy = AnalyticsSketches()
+    copy.load_bytes(sketches.to_bytes())
+    assert copy.stale == 3 and copy.added == 21
+    assert copy.price_quantiles([0.5], "lyon") == sketches.price_quantiles([0.5], "lyon")
+    assert copy.price_quantiles([0.5], None)['count'] == 10
+    assert copy.distinct_reviewers("host-1") == 1
+    print("✅ Sketch store serializes and tracks drift")
+
+def _seed(facade, city):
+    """Create places and reviews for the sketches to see"""
+    host = facade.create_user(f"host.{city}@example.com", "Sketch", "Host")
+    places = [facade.create_place(
+        name=f"Sketch Place {i}", description="", address=f"{i} Digest Rd", city_id=city,
+        latitude=45.0, longitude=5.0, host_id=host.id, number_of_rooms=1,
+        number_of_bathrooms=1, price_per_night=price, max_guests=2
+    ) for i, price in enumerate((80, 100, 240))]
+    for i in range(4):
+        guest = facade.create_user(f"guest{i}.{city}@example.com", "Sketch", "Guest")
+        facade.create_review(places[i % 3].id, guest.id, 4, "Counted")
+    return host, places
+
+def test_facade_sketches_and_persistence():
+    """Test O(1) facade updates, drift rebuilds and SKETCH_FILE persistence"""
+    print("\nTesting facade sketches...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'sketches.bin')
+        repo = InMemoryRepository()
+        facade = HBnBFacade(repository=repo, user_repository=repo)
+        host, places = _seed(facade, "chambery")
+
+        report = facade.get_price_sketch()
+        assert report['overall']['count'] == 3
+        assert report['cities'] == [{'city_id': "chambery", 'count': 3,
+                                     'quantiles': {'p50': 100.0, 'p90': 240.0, 'p99': 240.0}}]
+        assert facade.get_reviewer_counts() == [{'host_id': host.id, 'distinct_reviewers': 4}]
+
+        # Incremental writes are reflected without a rebuild
+        _seed(facade, "albertville")
+        assert facade.get_price_sketch("albertville")['cities'][0]['count'] == 3
+        assert facade.get_price_sketch()['overall']['count'] == 6
+
+        # Changed prices drift until the store rebuilds itself
+        facade.update_place(places[2].id, price_per_night=90)
+        assert facade.sketches.stale == 1
+        for place in places[:2]:
+            facade.update_place(place.id, price_per_night=place.price_per_night + 1)
+        assert facade.get_price_sketch("chambery")['cities'][0]['count'] == 3
+        assert facade.sketches.stale == 0
+
+        assert facade.save_sketches(path) > 0
+        os.environ['SKETCH_FILE'] = path
+        try:
+            restarted = HBnBFacade(repository=InMemoryRepository(), user_repository=repo)
+        finally:
+            del os.environ['SKETCH_FILE']
+        assert restarted._sketches_ready
+        assert restarted.get_price_sketch() == facade.get_price_sketch()
+        assert restarted.get_reviewer_counts(host.id)[0]['distinct_reviewers'] == 4
+    try:
+        facade.save_sketches()
+        assert False, "Saving without SKETCH_FILE should fail"
+    except ValueError:
+        pass
+    print("✅ Facade sketches update, rebuild and persist")
+
+def test_sketch_endpoints():
+    """Test the /api/v1/admin/sketches endpoints"""
+    print("\nTesting sketch endpoints...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        db.create_all()
+        suffix = uuid.uuid4().hex[:8]
+        admin = facade.create_user(f"sketch.{suffix}@example.com", "Sketch", "Admin", is_admin=True)
+        host, _ = _seed(facade, f"city-{suffix}")
+        token = create_access_token(identity=admin.id, additional_claims={'is_admin': True})
+        headers = {'Authorization': f'Bearer {token}'}
+
+        response = client.get(f'/api/v1/admin/sketches/prices?city_id=city-{suffix}', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json()['cities'][0]['quantiles']['p50'] == 100.0
+        response = client.get(f'/api/v1/admin/sketches/reviewers?host_id={host.id}', headers=headers)
+        assert response.get_json() == [{'host_id': host.id, 'distinct_reviewers': 4}]
+        assert client.post('/api/v1/admin/sketches/rebuild', headers=headers).get_json()['rows'] >= 7
+        assert client.get('/api/v1/admin/sketches/prices?limit=0', headers=headers).status_code == 400
+        member = {'Authorization': f'Bearer {create_access_token(identity=host.id)}'}
+        assert client.get('/api/v1/admin/sketches/reviewers', headers=member).status_code == 403
+    print("✅ Sketch endpoints work")
+
+if __name__ == "__main__":
+    test_tdigest_accuracy()
+    test_hyperloglog_accuracy()
+    test_sketch_store_drift_and_round_trip()
+    test_facade_sketches_and_persistence()
+    test_sketch_endpoints()
+    print("\n🎉 All sketch tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming repository iteration and chunked JSON/NDJSON responses
+"""
+
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+from app.utils.streaming import NDJSON
+
+def _check_iteration(facade):
+    """Run the same iter_all checks against any facade"""
+    for i in range(7):
+        amenity = Amenity(f"Streamed {i}")
+        amenity.created_at = datetime(2024, 1, 1 + i // 3)
+        facade.repo.add(amenity)
+    expected = [a.id for a in sorted(facade.get_all_amenities(), key=lambda a: (a.created_at, a.id))]
+    for chunk_size in (1, 3, 7, 100):
+        assert [a.id for a in facade.iter_amenities(chunk_size)] == expected
+
+    facade.create_user("streamer@example.com", "Stream", "Er")
+    assert [user.email for user in facade.iter_users(chunk_size=1)] == ["streamer@example.com"]
+    assert list(facade.iter_places()) == [] and list(facade.iter_reviews()) == []
+
+def test_in_memory_iteration():
+    """Test keyset-chunked iteration on the in-memory repository"""
+    print("Testing in-memory iter_all...")
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    _check_iteration(facade)
+
+    # Objects added behind the current position are picked up exactly once
+    seen = []
+    for amenity in facade.iter_amenities(chunk_size=2):
+        seen.append(amenity.id)
+        if len(seen) == 1:
+            late = facade.create_amenity("Added while streaming")
+    assert seen.count(late.id) == 1 and len(seen) == len(set(seen)) == 8
+    print("✅ In-memory iter_all works")
+
+def test_sqlalchemy_iteration():
+    """Test yield_per iteration on the SQLAlchemy repositories"""
+    print("\nTesting SQLAlchemy iter_all...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        _check_iteration(HBnBFacade(repository=SQLAlchemyRepository(),
+                                    user_repository=UserRepository()))
+    print("✅ SQLAlchemy iter_all works")
+
+def test_streamed_endpoints():
+    """Test NDJSON and chunked JSON array listings"""
+    print("\nTesting streamed list endpoints...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        for i in range(3):
+            facade.create_amenity(f"Stream {uuid.uuid4().hex[:8]}")
+        total = facade.repo.count(Amenity)
+
+        response = client.get('/api/v1/amenities/', headers={'Accept': NDJSON})
+        assert response.status_code == 200 and response.mimetype == NDJSON
+        assert response.is_streamed
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert len(rows) == total and all('name' in row for row in rows)
+
+        response = client.get('/api/v1/amenities/?stream=true')
+        assert response.status_code == 200 and response.mimetype == 'application/json'
+        assert [row['id'] for row in response.get_json()] == [row['id'] for row in rows]
+
+        for path in ('/api/v1/users/', '/api/v1/places/', '/api/v1/reviews/'):
+            response = client.get(f'{path}?stream=true')
+            assert response.status_code == 200 and isinstance(response.get_json(), list)
+            response = client.get(path, headers={'Accept': NDJSON})
+            assert response.status_code == 200 and response.mimetype == NDJSON
+            assert all(json.loads(line) for line in response.get_data(as_text=True).splitlines())
+        assert client.get('/api/v1/places/?stream=true&min_price=10').status_code == 400
+    print("✅ Streamed list endpoints work")
+
+if __name__ == "__main__":
+    test_in_memory_iteration()
+    test_sqlalchemy_iteration()
+    test_streamed_endpoints()
+    print("\n🎉 All streaming tests passed!")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLAlchemy unit-of-work (deferred commit) mode
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence import unit_of_work
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+def _count_commits(counter):
+    """Attach a listener counting commits on the current session"""
+    def after_commit(session):
+        counter.append(1)
+    event.listen(db.session(), 'after_commit', after_commit)
+    return after_commit
+
+def test_unit_of_work_single_commit():
+    """Test that writes inside a unit of work are committed once"""
+    print("Testing unit of work commit...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        repo = SQLAlchemyRepository()
+        commits = []
+        _count_commits(commits)
+
+        with repo.unit_of_work():
+            repo.add(Amenity("UoW Sauna"))
+            repo.add(Amenity("UoW Gym"))
+            with repo.unit_of_work():
+                repo.add(Amenity("UoW Pool"))
+            assert commits == [], "Nothing should be committed inside the unit of work"
+            assert unit_of_work.in_unit_of_work()
+
+        assert len(commits) == 1, f"Expected one commit, got {len(commits)}"
+        assert not unit_of_work.in_unit_of_work()
+        assert len(repo.get_all(Amenity)) == 3
+
+        # Default behaviour is unchanged: one commit per write
+        repo.add(Amenity("UoW Spa"))
+        assert len(commits) == 2
+
+    print("✅ Unit of work commits once")
+
+def test_unit_of_work_rollback():
+    """Test that a failing unit of work rolls back every staged write"""
+    print("\nTesting unit of work rollback...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        repo = SQLAlchemyRepository()
+
+        try:
+            with repo.unit_of_work():
+                repo.add(Amenity("UoW Rollback"))
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert repo.get_by_attribute(Amenity, name="UoW Rollback") == []
+        assert not unit_of_work.in_unit_of_work()
+
+    print("✅ Unit of work rolls back on failure")
+
+def _side_index_sizes(facade):
+    """Sizes of the facade's in-process indexes"""
+    return (len(facade.amenity_index), len(facade.place_names), len(facade.amenity_names),
+            len(facade.place_columns), len(facade.review_columns), facade.sketches.added)
+
+def test_side_indexes_follow_outer_commit():
+    """Test that facade index updates wait for the outermost commit and vanish on rollback"""
+    print("\nTesting side indexes under a request-wide unit of work...")
+
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+        host = facade.create_user("uowhost@example.com", "Host", "User")
+        guest = facade.create_user("uowguest@example.com", "Guest", "User")
+        empty = _side_index_sizes(facade)
+
+        def write():
+            wifi = facade.create_amenity("UoW Wifi")
+            place = facade.create_place(
+                name="Rolled Back Loft", description="", address="1 Main St", city_id="c1",
+                latitude=1.0, longitude=2.0, host_id=host.id, number_of_rooms=1,
+                number_of_bathrooms=1, price_per_night=80, max_guests=2, amenity_ids=[wifi.id])
+            facade.create_review(place.id, guest.id, 4, "Nice")
+            # Nothing is applied before the request commits
+            assert _side_index_sizes(facade) == empty
+
+        # A request that fails after the facade calls returned
+        unit_of_work.begin()
+        write()
+        facade.get_user_cached(guest.id)
+        facade.update_user(guest.id, first_name="Renamed")
+        assert facade.user_cache.get(guest.id) is None
+        unit_of_work.end(commit=False)
+        assert _side_index_sizes(facade) == empty
+        assert facade.autocomplete_places("Rolled") == []
+        assert facade.get_user_cached(guest.id).first_name == "Guest"
+
+        # The same request committing applies every update once
+        unit_of_work.begin()
+        write()
+        unit_of_work.end(commit=True)
+        assert _side_index_sizes(facade) == (1, 1, 1, 1, 1, 2)
+        assert [match['name'] for match in facade.autocomplete_places("Rolled")] == ["Rolled Back Loft"]
+
+    print("✅ Side indexes only see committed rows")
+
+if __name__ == "__main__":
+    test_unit_of_work_single_commit()
+    test_unit_of_work_rollback()
+    test_side_indexes_follow_outer_commit()
+    print("\n🎉 All unit of work tests passed!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached JWT user lookup
+"""
+
+import os
+import sys
+import time
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import create_app, db
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+from app.utils.cache import TTLCache
+
+def test_ttl_cache_eviction_and_expiry():
+    """Test LRU eviction, TTL expiry and counters"""
+    print("Testing TTL cache...")
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)  # evicts 'b', the least recently used entry
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+
+    cache.configure(ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is None, "Expired entries should miss"
+
+    print("✅ TTL cache evicts and expires entries")
+
+def test_in_memory_user_cache_invalidation():
+    """Test cache hits and invalidation on user writes"""
+    print("\nTesting user cache invalidation...")
+
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    user = facade.create_user("cached@example.com", "Cached", "User", "secret123")
+
+    assert facade.get_user_cached(user.id) is user
+    assert facade.get_user_cached(user.id) is user
+    assert facade.user_cache.stats()['hits'] == 1
+
+    facade.update_user(user.id, first_name="Renamed")
+    assert facade.user_cache.stats()['size'] == 0
+    facade.get_user_cached(user.id)
+    facade.update_user_password(user.id, "newsecret123")
+    assert facade.user_cache.stats()['size'] == 0
+    facade.get_user_cached(user.id)
+    facade.delete_user(user.id)
+    try:
+        facade.get_user_cached(user.id)
+        assert False, "Deleted user should not be served from the cache"
+    except ValueError:
+        pass
+
+    print("✅ User writes invalidate the cache")
+
+def test_invalidation_wins_over_inflight_load():
+    """Test that a value loaded before an invalidation is not cached"""
+    print("\nTesting invalidation during a cache fill...")
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    generation = cache.generation()
+    cache.invalidate('a')
+    cache.set('a', 'stale', generation)
+    assert cache.get('a') is None
+    cache.set('a', 'fresh', cache.generation())
+    assert cache.get('a') == 'fresh'
+
+    # Keys pushed out of the invalidation record are still turned away
+    generation = cache.generation()
+    for key in ('a', 'b', 'c'):
+        cache.invalidate(key)
+    cache.set('a', 'stale', generation)
+    assert cache.get('a') is None
+
+    # The facade takes its token before loading the user
+    repo = InMemoryRepository()
+    facade = HBnBFacade(repository=repo, user_repository=repo)
+    user = facade.create_user("racing@example.com", "Racing", "User")
+    load = facade.get_user
+    def load_then_update(user_id):
+        loaded = load(user_id)
+        facade.user_cache.invalidate(user_id)  # an update_user() in another thread
+        return loaded
+    facade.get_user = load_then_update
+    facade.get_user_cached(user.id)
+    assert facade.user_cache.stats()['size'] == 0
+    del facade.get_user
+    facade.get_user_cached(user.id)
+    assert facade.user_cache.stats()['size'] == 1
+
+    print("✅ Invalidations are not undone by in-flight loads")
+
+def test_sqlalchemy_user_cache_across_requests():
+    """Test that cached users are served without a query in later sessions"""
+    print("\nTesting SQLAlchemy user cache...")
+
+    app = create_app('development')
+    facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=UserRepository())
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user_id = facade.create_user("sqlcached@example.com", "Sql", "Cached").id
+        facade.get_user_cached(user_id)
+
+    # A new app context gets a new session, as a new request would
+    with app.app_context():
+        from sqlalchemy import event
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            user = facade.get_user_cached(user_id)
+            assert user.email == "sqlcached@example.com"
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        assert statements == [], "Cache hit should not query the database"
+
+        facade.update_user(user_id, first_name="Changed")
+        assert facade.get_user_cached(user_id).first_name == "Changed"
+
+    print("✅ SQLAlchemy cache hits skip the database")
+
+if __name__ == "__main__":
+    test_ttl_cache_eviction_and_expiry()
+    test_in_memory_user_cache_invalidation()
+    test_invalidation_wins_over_inflight_load()
+    test_sqlalchemy_user_cache_across_requests()
+    print("\n🎉 All user cache tests passed!")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for trigram-indexed user name search
+"""
+
+import os
+import sys
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import uuid
+from sqlalchemy import text
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.persistence.fulltext import TrigramIndex, trigram_similarity, trigrams, word_trigrams
+from app.persistence.repository import InMemoryRepository
+from app.persistence import sqlalchemy_repository
+from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
+from app.persistence.user_repository import UserRepository
+from app.services.facade import HBnBFacade
+
+NAMES = [
+    ("Jonathan", "Smith"),
+    ("Joan", "Smythe"),
+    ("Maria", "Johnson"),
+    ("Peter", "Parker"),
+]
+
+def _populate(facade):
+    return {first: facade.create_user(f"{first.lower()}@example.com", first, last)
+            for first, last in NAMES}
+
+def _names(matches):
+    return [user.first_name for user, _ in matches]
+
+def _check_search(facade):
+    """Run the same name search checks against any facade"""
+    users = _populate(facade)
+
+    # Substring matches rank first, shorter names (higher similarity) before longer ones
+    matches, total = facade.search_users_by_name("john")
+    assert _names(matches) == ["Maria"] and total == 1
+    matches, total = facade.search_users_by_name("SMITH")
+    assert _names(matches)[0] == "Jonathan"
+    assert matches[0][1] > 1.0
+
+    # Typos still find close spellings
+    assert "Jonathan" in _names(facade.search_users_by_name("Jonatan")[0])
+    assert "Peter" in _names(facade.search_users_by_name("Peter Parkr")[0])
+    assert facade.search_users_by_name("zzzzzz")[1] == 0
+
+    # Pagination
+    matches, total = facade.search_users_by_name("smith", page=1, per_page=1)
+    assert len(matches) == 1 and total >= 1
+
+    # Updates keep the index in sync
+    facade.update_user(users["Peter"].id, last_name="Quill")
+    assert "Peter" not in _names(facade.search_users_by_name("parker")[0])
+    assert _names(facade.search_users_by_name("quill")[0]) == ["Peter"]
+
+    for bad in ("jo", "   "):
+        try:
+            facade.search_users_by_name(bad)
+            assert False, f"{bad!r} should be rejected"
+        except ValueError:
+            pass
+
+def test_trigram_helpers():
+    """Test trigram extraction, similarity and the in-memory trigram index"""
+    print("Testing trigram helpers...")
+    assert trigrams("Anna") == {"ann", "nna"}
+    assert word_trigrams("Anna") == {"  a", " an", "ann", "nna", "na "}
+    assert trigram_similarity(word_trigrams("smith"), word_trigrams("Smith")) == 1.0
+    assert 0.3 <= trigram_similarity(word_trigrams("smith"), word_trigrams("smyth")) < 0.5
+
+    index = TrigramIndex()
+    index.insert("a", ["Smith", "John"])
+    index.insert("b", ["Smyth", "Joan"])
+    assert index.candidates(trigrams("smi")) == {"a": 1}
+    assert set(index.candidates(trigrams("jo"))) == set()
+    index.remove("a")
+    assert index.candidates(trigrams("smith")) == {}
+    print("✅ Trigram helpers work")
+
+def test_in_memory_user_name_search():
+    """Test name search on the in-memory trigram index"""
+    print("\nTesting in-memory user name search...")
+    repo = InMemoryRepository()
+    _check_search(HBnBFacade(repository=repo, user_repository=repo))
+    print("✅ In-memory user name search works")
+
+def test_sqlalchemy_user_name_search():
+    """Test name search on the FTS5 trigram table"""
+    print("\nTesting SQLAlchemy user name search...")
+    app = create_app('development')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user_repo = UserRepository()
+        _check_search(HBnBFacade(repository=SQLAlchemyRepository(), user_repository=user_repo))
+
+        # The substring lookup used by get_users_by_name goes through FTS5
+        assert [u.first_name for u in user_repo.get_users_by_name(last_name="ohnso")] == ["Maria"]
+        assert [u.first_name for u in user_repo.get_users_by_name(first_name="jon", last_name="smi")] == ["Jonathan"]
+        assert len(user_repo.get_users_by_name(first_name="jo")) == 2
+        rows = db.session.execute(text("SELECT COUNT(*) FROM users_name_trgm")).scalar()
+        assert rows == len(NAMES)
+
+        # The candidate cap only applies to fuzzy matches: every substring match
+        # is counted and reachable, and close spellings still follow them
+        facade = HBnBFacade(repository=SQLAlchemyRepository(), user_repository=user_repo)
+        for i in range(5):
+            facade.create_user(f"smithson{i}@example.com", f"Ann{i}", "Smithson")
+        cap = sqlalchemy_repository.MAX_TRIGRAM_CANDIDATES
+        sqlalchemy_repository.MAX_TRIGRAM_CANDIDATES = 2
+        try:
+            matches, total = facade.search_users_by_name("smith", page=1, per_page=4)
+            assert _names(matches)[0] == "Jonathan" and total == 6
+            names = _names(matches) + _names(facade.search_users_by_name("smith", page=2, per_page=4)[0])
+            assert len(set(names)) == total and sum(1 for name in names if name.startswith("Ann")) == 5
+            assert all(score > 1.0 for _, score in facade.search_users_by_name("smith")[0])
+            assert _names(facade.search_users_by_name("Jonatan")[0]) == ["Jonathan"]
+            # A query spanning first and last name is still a substring match
+            matches, total = facade.search_users_by_name("jonathan smi")
+            assert _names(matches)[0] == "Jonathan" and matches[0][1] > 1.0
+        finally:
+            sqlalchemy_repository.MAX_TRIGRAM_CANDIDATES = cap
+    print("✅ SQLAlchemy user name search works")
+
+def test_user_search_endpoint():
+    """Test GET /api/v1/admin/users/search"""
+    print("\nTesting admin user search endpoint...")
+    app = create_app('development')
+    client = app.test_client()
+    with app.app_context():
+        from app.services import facade
+        db.create_all()
+        surname = "Zq" + uuid.uuid4().hex[:8]
+        admin = facade.create_user(f"{surname}.admin@example.com", "Search", surname, is_admin=True)
+        member = facade.create_user(f"{surname}.member@example.com", "Search", surname)
+        admin_token = create_access_token(identity=admin.id, additional_claims={'is_admin': True})
+        admin_headers = {'Authorization': f'Bearer {admin_token}'}
+        member_headers = {'Authorization': f'Bearer {create_access_token(identity=member.id)}'}
+
+        response = client.get(f'/api/v1/admin/users/search?q={surname}&per_page=1', headers=admin_headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['total'] == 2 and len(body['users']) == 1 and body['users'][0]['score'] > 1
+        assert client.get('/api/v1/admin/users/search?q=se', headers=admin_headers).status_code == 400
+        assert client.get(f'/api/v1/admin/users/search?q={surname}', headers=member_headers).status_code == 403
+    print("✅ Admin user search endpoint works")
+
+if __name__ == "__main__":
+    test_trigram_helpers()
+    test_in_memory_user_name_search()
+    test_sqlalchemy_user_name_search()
+    test_user_search_endpoint()
+    print("\n🎉 All user name search tests passed!")